@@ -0,0 +1,132 @@
+import os
+import sys
+import time
+import argparse
+import datetime
+from grafikler import GRAFIKLER, modul_adi, modul_yukle
+from veri_kapsami import kapsam_ayarla, kapsam_aciklamasi
+
+# === Ortak komut satırı ===
+# Her analiz aynı seçeneklerle çalıştırılır:
+#   python -m analiz status_code --baslangic 2025-07-01 --bitis 2025-07-07 --botsuz --durum 200 404
+#   python -m analiz hepsi --from 2025-07-05 --to 2025-07-05 --kaydet raporlar/2025-07-05
+# Tarih aralığı ve filtreler veri_kapsami üzerinden her sorgunun WHERE
+# koşuluna eklenir. Satırlar tarih sırasıyla yazıldığı ve date indeksli olduğu
+# için bir haftalık kapsam sadece o haftanın satırlarını okur; özet tabloları
+# kapsamı karşılayabiliyorsa (tarih, is_bot ve özetin kendi kolonları) yine kullanılır.
+# Tek analiz eskisi gibi pencerede ya da tarayıcıda açılır; --kaydet verilirse
+# veya birden fazla analiz seçilirse toplu_rapor.py ile ekransız dosyaya yazılır.
+HEPSI = "hepsi"
+# Seçenek adı -> grafik modülündeki değişken (modülde yoksa yok sayılır)
+AYARLAR = {
+    "gun": "karsilastirma_gunu",
+    "saat_araligi": "interval_hours",
+}
+
+
+def _sade(ad):
+    return modul_adi(ad).replace("ı", "i").lower()
+
+
+def analiz_bul(ad):
+    # Dosya adı, modül adı ya da tek bir analize uyan baş kısmı (ör. status_code)
+    if _sade(ad) == HEPSI:
+        return list(GRAFIKLER)
+    adaylar = [(f, label) for f, label in GRAFIKLER if _sade(f) == _sade(ad)]
+    if not adaylar:
+        adaylar = [(f, label) for f, label in GRAFIKLER if _sade(f).startswith(_sade(ad))]
+    if not adaylar:
+        raise SystemExit(f"'{ad}' adında bir analiz yok; liste için: python -m analiz --liste")
+    if len(adaylar) > 1:
+        secenekler = ", ".join(modul_adi(f) for f, _ in adaylar)
+        raise SystemExit(f"'{ad}' birden fazla analize uyuyor: {secenekler}")
+    return adaylar
+
+
+def tarih(deger):
+    try:
+        return datetime.date.fromisoformat(deger).isoformat()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"tarih YYYY-AA-GG biçiminde olmalı: {deger}")
+
+
+def kapsam_filtreleri(args):
+    filtreler = []
+    if args.botsuz:
+        filtreler.append(("is_bot", "==", 0))
+    if args.durum:
+        filtreler.append(("sc-status", "in", args.durum))
+    return filtreler
+
+
+def goster(filename, ayarlar, port):
+    m = modul_yukle(filename)
+    for key, value in ayarlar.items():
+        if hasattr(m, key):
+            setattr(m, key, value)
+
+    start = time.perf_counter()
+    sonuc = m.veri()
+    print(f"{modul_adi(filename)}: {time.perf_counter() - start:.2f} sn ({kapsam_aciklamasi()})")
+
+    if hasattr(m, "ciz"):
+        import matplotlib.pyplot as plt
+        m.ciz(sonuc)
+        plt.show()
+    else:
+        from dash_sunucu import tek_sayfa_calistir
+        tek_sayfa_calistir(m, port=port)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Analizleri tarih aralığı ve filtrelerle çalıştırır")
+    parser.add_argument("analizler", nargs="*", help=f"Analiz adları (ör. status_code, saat_tarih) ya da '{HEPSI}'")
+    parser.add_argument("--liste", action="store_true", help="Analizleri listeler")
+
+    kapsam_grubu = parser.add_argument_group("kapsam (SQL WHERE koşuluna eklenir)")
+    kapsam_grubu.add_argument("--baslangic", "--from", type=tarih, help="İlk gün, dahil (YYYY-AA-GG)")
+    kapsam_grubu.add_argument("--bitis", "--to", type=tarih, help="Son gün, dahil (YYYY-AA-GG)")
+    kapsam_grubu.add_argument("--botsuz", "--exclude-bots", action="store_true", help="Bot isteklerini hariç tutar")
+    kapsam_grubu.add_argument("--durum", "--status", type=int, nargs="+", help="Sadece bu HTTP durum kodları")
+
+    ayar_grubu = parser.add_argument_group("analiz ayarları")
+    ayar_grubu.add_argument("--gun", type=int, help="Karşılaştırma tablolarında ilk ve son kaç gün (varsayılan 15)")
+    ayar_grubu.add_argument("--saat-araligi", type=int, help="Saat-tarih-IP grafiğinde saat aralığı (varsayılan 1)")
+
+    cikti_grubu = parser.add_argument_group("çıktı")
+    cikti_grubu.add_argument("--kaydet", metavar="KLASOR", help="Ekran açmadan bu klasöre yazar (toplu_rapor.py)")
+    cikti_grubu.add_argument("--bicim", nargs="+", choices=("png", "svg"), default=["png"])
+    cikti_grubu.add_argument("--isci", type=int, help="Aynı anda çalışacak analiz sayısı")
+    cikti_grubu.add_argument("--port", type=int, default=9060, help="Dash analizleri için port")
+    args = parser.parse_args()
+
+    if args.liste or not args.analizler:
+        for filename, label in GRAFIKLER:
+            print(f"{modul_adi(filename):<40}{label}")
+        sys.exit(0)
+
+    if args.baslangic and args.bitis and args.baslangic > args.bitis:
+        parser.error("--baslangic, --bitis'ten sonra olamaz")
+
+    secilen = []
+    for ad in args.analizler:
+        secilen += [g for g in analiz_bul(ad) if g not in secilen]
+
+    ayarlar = {
+        degisken: getattr(args, secenek)
+        for secenek, degisken in AYARLAR.items()
+        if getattr(args, secenek) is not None
+    }
+    kapsam_ayarla(args.baslangic, args.bitis, kapsam_filtreleri(args))
+
+    if args.kaydet or len(secilen) > 1:
+        from toplu_rapor import RAPOR_KLASORU, rapor_uret
+
+        os.environ["MPLBACKEND"] = "Agg"
+        klasor = os.path.abspath(args.kaydet or os.path.join(RAPOR_KLASORU, f"{datetime.date.today():%Y-%m-%d}"))
+        kayitlar, toplam = rapor_uret(secilen, klasor, args.bicim, args.isci, ayarlar)
+        hatalar = [kayit for kayit in kayitlar if kayit["hata"]]
+        print(f"\nRapor: {os.path.join(klasor, 'index.html')} ({toplam:.1f} sn, {len(hatalar)} hata, {kapsam_aciklamasi()})")
+        sys.exit(1 if hatalar else 0)
+
+    goster(secilen[0][0], ayarlar, args.port)
@@ -0,0 +1,182 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import threading
+import subprocess
+from datetime import datetime
+import psutil
+from sentetik_veri import satir_sayisi_coz
+from grafikler import GRAFIKLER
+
+# === Uçtan uca ölçüm ===
+# Sentetik data.db üretilir, data_siralama.py ile işlenir ve her analiz
+# betiği pencere açmadan (Agg, Dash sunucusu başlatılmadan) çalıştırılır.
+# Her aşama ayrı süreçte koşar; süre, satır/sn ve tepe bellek (alt süreçler
+# dahil RSS) ölçülüp JSON olarak kaydedilir.
+BURADAKI_KLASOR = os.path.dirname(os.path.abspath(__file__))
+SONUC_KLASORU = "benchmark_sonuclari"
+KOPYALANACAKLAR = ["ip_konumlari_agent.csv", "data"]
+
+ANALIZ_BETIKLERI = [filename for filename, _ in GRAFIKLER]
+
+# Grafik modülleri import edilince iş yapmaz; veri() analizi, ciz() matplotlib
+# figürünü, Dash sayfalarında layout() sayfayı hazırlar (sunucu açılmaz)
+_BETIK_CALISTIRICI = (
+    "import os, sys, importlib\n"
+    "m = importlib.import_module(os.path.splitext(sys.argv[1])[0])\n"
+    "sonuc = m.veri()\n"
+    "m.ciz(sonuc) if hasattr(m, 'ciz') else m.layout()\n"
+)
+
+
+def _surec_agaci_rss(process):
+    total = 0
+    try:
+        for proc in [process] + process.children(recursive=True):
+            try:
+                total += proc.memory_info().rss
+            except psutil.Error:
+                pass
+    except psutil.Error:
+        pass
+    return total
+
+
+def asama_olc(ad, komut, cwd, satir, zaman_asimi=None, aralik=0.05):
+    # Komutu çalıştırır, bitene kadar süreç ağacının RSS toplamını izler
+    env = dict(os.environ, MPLBACKEND="Agg", PYTHONIOENCODING="utf-8")
+    start = time.perf_counter()
+    proc = subprocess.Popen(komut, cwd=cwd, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    ps_proc = psutil.Process(proc.pid)
+    peak = 0
+    output = []
+    reader = threading.Thread(target=lambda: output.append(proc.stdout.read()), daemon=True)
+    reader.start()
+
+    timed_out = False
+    while proc.poll() is None:
+        peak = max(peak, _surec_agaci_rss(ps_proc))
+        if zaman_asimi and time.perf_counter() - start > zaman_asimi:
+            proc.kill()
+            timed_out = True
+            break
+        time.sleep(aralik)
+    proc.wait()
+    elapsed = time.perf_counter() - start
+    reader.join()
+
+    tail = b"".join(output).decode("utf-8", errors="replace").strip().splitlines()[-5:]
+    status = "zaman_asimi" if timed_out else ("tamam" if proc.returncode == 0 else "hata")
+    result = {
+        "asama": ad,
+        "durum": status,
+        "sure_sn": round(elapsed, 3),
+        "satir_per_sn": round(satir / elapsed) if elapsed > 0 else None,
+        "tepe_rss_mb": round(peak / 1024 ** 2, 1),
+    }
+    if status != "tamam":
+        result["cikti_sonu"] = tail
+    print(f"  {ad:40s} {status:12s} {elapsed:9.2f} sn  {result['tepe_rss_mb']:8.1f} MB")
+    return result
+
+
+def calisma_klasoru_hazirla(klasor):
+    for name in os.listdir(BURADAKI_KLASOR):
+        if name.endswith(".py"):
+            shutil.copy2(os.path.join(BURADAKI_KLASOR, name), klasor)
+    for name in KOPYALANACAKLAR:
+        source = os.path.join(BURADAKI_KLASOR, name)
+        if os.path.isdir(source):
+            shutil.copytree(source, os.path.join(klasor, name))
+        elif os.path.exists(source):
+            shutil.copy2(source, klasor)
+
+
+def olcum_yap(satir, tohum=42, betikler=None, zaman_asimi=None, cikti_bicimi=None):
+    betikler = betikler or ANALIZ_BETIKLERI
+    python = sys.executable
+    stages = []
+    with tempfile.TemporaryDirectory(prefix="benchmark_") as klasor:
+        calisma_klasoru_hazirla(klasor)
+        veri_klasoru = os.path.join(klasor, "_veri")
+        os.makedirs(veri_klasoru)
+        kaynak = os.path.join(veri_klasoru, "data.db")
+
+        print(f"\n=== {satir} satır ===")
+        stages.append(asama_olc(
+            "uretim", [python, "sentetik_veri.py", "--satir", str(satir), "--tohum", str(tohum), "--cikti", kaynak],
+            klasor, satir, zaman_asimi,
+        ))
+
+        shutil.copy2(kaynak, os.path.join(klasor, "data.db"))
+        ingest_cmd = [python, "data_siralama.py", "data.db", "--tam"]
+        if cikti_bicimi:
+            ingest_cmd += ["--cikti", cikti_bicimi]
+        stages.append(asama_olc("data_siralama", ingest_cmd, klasor, satir, zaman_asimi))
+
+        for script in betikler:
+            stages.append(asama_olc(
+                script, [python, "-c", _BETIK_CALISTIRICI, script], klasor, satir, zaman_asimi,
+            ))
+    return {"satir": satir, "asamalar": stages}
+
+
+def karsilastir(eski_yol, yeni):
+    # Önceki bir sonuç dosyasıyla aşama aşama süre ve bellek oranları
+    with open(eski_yol, encoding="utf-8") as f:
+        eski = json.load(f)
+    eski_olcumler = {
+        (run["satir"], stage["asama"]): stage for run in eski["olcumler"] for stage in run["asamalar"]
+    }
+    print(f"\n=== Karşılaştırma: {eski_yol} ===")
+    for run in yeni["olcumler"]:
+        for stage in run["asamalar"]:
+            onceki = eski_olcumler.get((run["satir"], stage["asama"]))
+            if not onceki or onceki["durum"] != "tamam" or stage["durum"] != "tamam":
+                continue
+            sure_orani = stage["sure_sn"] / onceki["sure_sn"] if onceki["sure_sn"] else float("nan")
+            bellek_orani = stage["tepe_rss_mb"] / onceki["tepe_rss_mb"] if onceki["tepe_rss_mb"] else float("nan")
+            uyari = "  <-- yavaşladı" if sure_orani > 1.10 else ""
+            print(f"  {run['satir']:>10} {stage['asama']:40s} süre x{sure_orani:5.2f}  bellek x{bellek_orani:5.2f}{uyari}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sentetik veriyle ingest ve analiz betiklerinin ölçümü.")
+    parser.add_argument("--satir", nargs="+", default=["100k"], help="Ölçülecek boyutlar: 100k 1m 10m veya sayı")
+    parser.add_argument("--tohum", type=int, default=42)
+    parser.add_argument("--betik", nargs="+", default=None, help="Sadece bu analiz betikleri")
+    parser.add_argument("--zaman-asimi", type=float, default=None, help="Aşama başına en fazla saniye")
+    parser.add_argument("--cikti", choices=["sqlite", "parquet", "ikisi"], default=None,
+                        help="data_siralama.py çıktı biçimi")
+    parser.add_argument("--json", default=None, help="Sonuç dosyası (varsayılan: benchmark_sonuclari/<zaman>.json)")
+    parser.add_argument("--karsilastir", default=None, help="Önceki bir sonuç JSON dosyasıyla karşılaştır")
+    args = parser.parse_args()
+
+    sonuc = {
+        "zaman": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu": psutil.cpu_count(),
+        "bellek_gb": round(psutil.virtual_memory().total / 1024 ** 3, 1),
+        "tohum": args.tohum,
+        "olcumler": [],
+    }
+    for boyut in args.satir:
+        sonuc["olcumler"].append(olcum_yap(
+            satir_sayisi_coz(boyut), tohum=args.tohum, betikler=args.betik,
+            zaman_asimi=args.zaman_asimi, cikti_bicimi=args.cikti,
+        ))
+
+    json_path = args.json or os.path.join(SONUC_KLASORU, datetime.now().strftime("%Y%m%d_%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(json_path) or ".", exist_ok=True)
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(sonuc, f, ensure_ascii=False, indent=2)
+    print(f"\nSonuçlar kaydedildi: {json_path}")
+
+    if args.karsilastir:
+        karsilastir(args.karsilastir, sonuc)
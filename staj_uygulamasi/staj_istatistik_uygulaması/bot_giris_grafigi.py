@@ -1,53 +1,40 @@
 import pandas as pd
 import re
-import psutil
 from collections import Counter
-from sqlalchemy import create_engine, MetaData, Table, select, func
 from concurrent.futures import ProcessPoolExecutor
 import multiprocessing
-import matplotlib.pyplot as plt
+from veri_erisim import oku, ButceliOkuyucu
+from sonuc_onbellek import onbellekli
 
-# === Donanım bilgileri ===
-cpu_count = multiprocessing.cpu_count()
-num_workers = max(1, int(cpu_count * 0.9))  # %90 CPU
+BASLIK = "Bot Girişleri"
 
-# RAM bilgisi
-mem_available = psutil.virtual_memory().available  # bytes
-target_memory = int(mem_available * 0.9)  # %90 RAM
-
-# Ortalama satır başı boyut tahmini (1 KB)
-estimated_row_size = 1024  # bytes
-chunksize = max(1000, target_memory // estimated_row_size)
-
-# === Veritabanı bağlantısı ===
-engine = create_engine("sqlite:///duzenli_data.db")
-metadata = MetaData()
-metadata.reflect(bind=engine)
-logs_table = Table("logs", metadata, autoload_with=engine)
 column_name = "cs(User-Agent)"
 
 # === Chunk işleme fonksiyonu ===
-def process_chunk(offset):
-    with engine.connect() as conn:
-        query = select(logs_table.c[column_name]).limit(chunksize).offset(offset)
-        chunk = pd.read_sql(query, conn)
-        chunk.columns = ['user_agent']
-        chunk['user_agent'] = chunk['user_agent'].astype(str).str.lower()
-        df_bot = chunk[chunk['user_agent'].str.contains(r'bot')]
-        all_text = " ".join(df_bot['user_agent'].tolist())
-        bot_words = re.findall(r'\b[\w\-]*bot[\w\-]*\b', all_text)
-        return Counter(bot_words)
-
-# === Ana işlem ===
-if __name__ == "__main__":
-    with engine.connect() as conn:
-        total_rows = conn.execute(select(func.count()).select_from(logs_table)).scalar()
+# Her işçi ayrık bir rowid aralığını okur; UA anahtarları Categorical'a
+# çevrilir, metin işlemleri her farklı UA için bir kez yapılır
+def process_chunk(aralik):
+    chunk = oku([column_name], aralik=aralik)
+    # Her farklı UA bir kez taranır, bulunan kelimeler tekrar sayısı kadar sayılır
+    ua_counts = chunk[column_name].value_counts()
+    bot_counts = Counter()
+    for user_agent, count in ua_counts[ua_counts > 0].items():
+        user_agent = str(user_agent).lower()
+        if 'bot' in user_agent:
+            for word in re.findall(r'\b[\w\-]*bot[\w\-]*\b', user_agent):
+                bot_counts[word] += count
+    return bot_counts
 
-    offsets = list(range(0, total_rows, chunksize))
+# === Sayım ===
+def bot_sayimlari():
+    # Aralıklar, aynı anda çalışan işçilerin partileri bellek bütçesine sığacak genişlikte
+    num_workers = max(1, int(multiprocessing.cpu_count() * 0.9))  # %90 CPU
+    okuyucu = ButceliOkuyucu([column_name])
+    araliklar = okuyucu.araliklar(num_workers)
     bot_counts = Counter()
 
     with ProcessPoolExecutor(max_workers=num_workers) as executor:
-        for partial_count in executor.map(process_chunk, offsets):
+        for partial_count in executor.map(process_chunk, araliklar):
             bot_counts.update(partial_count)
 
     # === Verileri toparla ve temizle ===
@@ -62,9 +49,23 @@ if __name__ == "__main__":
     other_count = bot_df["count"].sum() - top10["count"].sum()
     other_row = pd.DataFrame([{"bot_name": "OtherBots", "count": other_count}])
     final_df = pd.concat([top10, other_row], ignore_index=True)
+    return final_df
+
+def veri():
+    return onbellekli("bot_giris", bot_sayimlari)
+
+# === Grafik ===
+def ciz(final_df):
+    import matplotlib.pyplot as plt
 
     # Yüzdelik
     total = final_df["count"].sum()
+    if total == 0:
+        # Seçilen kapsamda (ör. analiz.py --botsuz) hiç bot isteği yok
+        plt.figure(figsize=(12, 6))
+        plt.text(0.5, 0.5, "Bu kapsamda bot isteği yok", ha='center', va='center', fontsize=14)
+        plt.axis("off")
+        return plt.gcf()
     percentages = 100 * final_df["count"] / total
 
     # Grafik
@@ -80,4 +81,10 @@ if __name__ == "__main__":
     plt.ylabel("Yüzde (%)")
     plt.xticks(rotation=45)
     plt.tight_layout()
+    return plt.gcf()
+
+# === Ana işlem ===
+if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+    ciz(veri())
     plt.show()
@@ -0,0 +1,150 @@
+import os
+import numpy as np
+import pandas as pd
+from sqlalchemy import inspect, text
+
+# === Boyut (sözlük) tabloları ===
+# Tekrar eden metin kolonları logs_kodlu tablosunda küçük tam sayı
+# anahtarlarla tutulur, metinler boyut_* tablolarında bir kez saklanır.
+# Eski sorguların çalışmaya devam etmesi için "logs" aynı kolon adlarıyla
+# boyutları birleştiren bir görünümdür (view).
+KODLU_TABLO = "logs_kodlu"
+GORUNUM = "logs"
+
+BOYUT_KOLONLARI = {
+    # kolon: (boyut tablosu, logs_kodlu içindeki anahtar kolonu)
+    "cs(User-Agent)": ("boyut_user_agent", "user_agent_id"),
+    "browser": ("boyut_browser", "browser_id"),
+    "browser_version": ("boyut_browser_version", "browser_version_id"),
+    "os": ("boyut_os", "os_id"),
+    "os_version": ("boyut_os_version", "os_version_id"),
+    "device": ("boyut_device", "device_id"),
+    "city": ("boyut_city", "city_id"),
+    "country": ("boyut_country", "country_id"),
+}
+_ANAHTARDAN_KOLONA = {key: col for col, (_, key) in BOYUT_KOLONLARI.items()}
+
+
+def kimlik_kolonu(kolon):
+    # Boyut kolonu ise logs_kodlu içindeki anahtar adını, değilse kendisini döndürür
+    return BOYUT_KOLONLARI[kolon][1] if kolon in BOYUT_KOLONLARI else kolon
+
+
+def kodlu_mu(bind):
+    return inspect(bind).has_table(KODLU_TABLO)
+
+
+def kaynak_kolon(table, kolon):
+    # logs_kodlu için anahtar kolonu, düz logs tablosu için metin kolonu seçilir
+    key = kimlik_kolonu(kolon)
+    return table.c[key] if key in table.c else table.c[kolon]
+
+
+# === Ingest tarafı ===
+class BoyutKodlayici:
+    def __init__(self):
+        self.sozlukler = None
+
+    def _yukle(self, conn):
+        self.sozlukler = {}
+        for col, (table, _) in BOYUT_KOLONLARI.items():
+            conn.execute(text(f"CREATE TABLE IF NOT EXISTS {table} (id INTEGER PRIMARY KEY, deger TEXT NOT NULL UNIQUE)"))
+            rows = conn.execute(text(f"SELECT deger, id FROM {table}")).all()
+            self.sozlukler[col] = dict(rows)
+
+    def kodla(self, conn, chunk):
+        # Metin kolonlarını anahtarlara çevirir, yeni değerleri boyut tablolarına ekler
+        if self.sozlukler is None:
+            self._yukle(conn)
+        chunk = chunk.copy()
+        renames = {}
+        for col, (table, key) in BOYUT_KOLONLARI.items():
+            if col not in chunk.columns:
+                continue
+            codes, uniques = pd.factorize(chunk[col].astype(object))
+            sozluk = self.sozlukler[col]
+            new_values = [str(v) for v in uniques if str(v) not in sozluk]
+            if new_values:
+                next_id = max(sozluk.values(), default=0) + 1
+                new_rows = list(zip(range(next_id, next_id + len(new_values)), new_values))
+                conn.exec_driver_sql(f"INSERT INTO {table} (id, deger) VALUES (?, ?)", new_rows)
+                sozluk.update((value, id_) for id_, value in new_rows)
+            unique_ids = np.array([sozluk[str(v)] for v in uniques], dtype=np.int64)
+            ids = pd.array(np.where(codes >= 0, unique_ids[codes] if len(unique_ids) else 0, 0), dtype="Int64")
+            ids[codes < 0] = pd.NA
+            chunk[col] = ids
+            renames[col] = key
+        return chunk.rename(columns=renames, copy=False)
+
+
+def logs_gorunumu_olustur(conn):
+    # logs_kodlu'daki kolon sırasıyla, anahtarlar yerine metin değerleri veren görünüm
+    if not inspect(conn).has_table(KODLU_TABLO):
+        return
+    select_parts, joins = [], []
+    for i, col in enumerate(c["name"] for c in inspect(conn).get_columns(KODLU_TABLO)):
+        if col in _ANAHTARDAN_KOLONA:
+            original = _ANAHTARDAN_KOLONA[col]
+            table = BOYUT_KOLONLARI[original][0]
+            select_parts.append(f'b{i}.deger AS "{original}"')
+            joins.append(f'LEFT JOIN {table} AS b{i} ON b{i}.id = l."{col}"')
+        else:
+            select_parts.append(f'l."{col}" AS "{col}"')
+    conn.execute(text(f"DROP VIEW IF EXISTS {GORUNUM}"))
+    conn.execute(text(
+        f"CREATE VIEW {GORUNUM} AS SELECT {', '.join(select_parts)} "
+        f"FROM {KODLU_TABLO} AS l {' '.join(joins)}"
+    ))
+
+
+# === Okuma tarafı: anahtarları pandas Categorical'a çevirme ===
+_boyut_onbellek = {}
+
+
+def dosya_kimligi(path):
+    # Veritabanı yeniden oluşturulup os.replace ile yerine konduysa inode/mtime değişir
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns)
+
+
+def boyut_onbellegini_temizle(path=None):
+    for key in [k for k in _boyut_onbellek if path is None or k[0] == path]:
+        _boyut_onbellek.pop(key, None)
+
+
+def boyut_oku(conn, kolon, en_buyuk_id=0):
+    # Boyut tabloları sadece büyür; bilinmeyen bir anahtar gelirse yeniden okunur.
+    # Dosya değiştiyse (yeniden ingest) aynı anahtar başka bir değere karşılık
+    # gelebileceği için önbellek dosya kimliğiyle birlikte tutulur.
+    table = BOYUT_KOLONLARI[kolon][0]
+    path = conn.engine.url.database
+    key = (path, table)
+    kimlik = dosya_kimligi(path)
+    cached = _boyut_onbellek.get(key)
+    if (cached is None or cached[0] != kimlik
+            or en_buyuk_id > (cached[1][-1] if len(cached[1]) else 0)):
+        df = pd.read_sql(text(f"SELECT id, deger FROM {table} ORDER BY id"), con=conn)
+        cached = (kimlik, df["id"].to_numpy(dtype=np.int64), pd.Index(df["deger"]))
+        _boyut_onbellek[key] = cached
+    return cached[1], cached[2]
+
+
+def kategorik_coz(df, conn):
+    # DataFrame'deki *_id kolonlarını asıl adlarıyla Categorical kolonlara çevirir
+    for key, col in _ANAHTARDAN_KOLONA.items():
+        if key not in df.columns:
+            continue
+        values = pd.to_numeric(df[key], errors="coerce").to_numpy(dtype=np.float64)
+        ids, categories = boyut_oku(conn, col, np.nanmax(values) if np.isfinite(values).any() else 0)
+        pos = np.searchsorted(ids, np.nan_to_num(values, nan=-1).astype(np.int64))
+        pos = np.minimum(pos, max(len(ids) - 1, 0))
+        found = ~np.isnan(values) & (len(ids) > 0)
+        if len(ids):
+            found &= ids[pos] == values
+        codes = np.where(found, pos, -1)
+        df[key] = pd.Categorical.from_codes(codes, categories=categories)
+        df = df.rename(columns={key: col})
+    return df
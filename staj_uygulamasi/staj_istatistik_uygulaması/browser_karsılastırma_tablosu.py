@@ -1,148 +1,118 @@
+import sys
 import pandas as pd
-from sqlalchemy import create_engine, MetaData, Table, select
-import dash
-from dash import dcc, html
-from dash.dash_table import DataTable
-from flask import Flask, request
-import webbrowser
-import threading
-import os
-import signal
+from veri_erisim import oku, ozet
+from tablo_figur import karsilastirma_tablosu
+from sonuc_onbellek import bellekte
 
-# --- 1. VERİYİ DB'DEN OKU VE İŞLE ---
-
-engine = create_engine("sqlite:///duzenli_data.db")
-metadata = MetaData()
-metadata.reflect(bind=engine)
-logs_table = Table("logs", metadata, autoload_with=engine)
-
-stmt = select(
-    logs_table.c["browser"],
-    logs_table.c["date"],
-    logs_table.c["is_bot"]
-)
-
-df = pd.read_sql(stmt, con=engine)
-
-# Bot olmayanları filtrele
-df = df[df["is_bot"] == 0].copy()
-df["date"] = pd.to_datetime(df["date"])
-df = df.sort_values("date").reset_index(drop=True)
+BASLIK = "Tarayıcı Karşılaştırması"
 
-unique_dates = df["date"].dt.date.unique()
-first_15_days = unique_dates[:15]
-last_15_days = unique_dates[-15:]
+# Karşılaştırılan dönemler: ilk ve son karsilastirma_gunu gün (analiz.py --gun)
+karsilastirma_gunu = 15
 
-df_ilk_15 = df[df["date"].dt.date.isin(first_15_days)]
-df_son_15 = df[df["date"].dt.date.isin(last_15_days)]
-
-browser_counts_ilk_15 = df_ilk_15["browser"].value_counts()
-browser_counts_son_15 = df_son_15["browser"].value_counts()
-
-all_browsers = sorted(set(browser_counts_ilk_15.index).union(browser_counts_son_15.index))
-
-comparison_rows = []
-for b in all_browsers:
-    ilk_adet = browser_counts_ilk_15.get(b, 0)
-    son_adet = browser_counts_son_15.get(b, 0)
+# --- 1. VERİYİ DB'DEN OKU VE İŞLE ---
 
-    if ilk_adet == 0:
-        artis_yuzdesi_str = "∞" if son_adet > 0 else "0"
+def tarayici_karsilastirmasi():
+    df = ozet("ozet_tarayici", is_bot=0)
+    if df is not None:
+        # Günlük tarayıcı özeti: her satır (tarih, tarayıcı) için istek sayısı
+        df = df.rename(columns={"hits": "adet"})[["browser", "date", "adet"]]
     else:
-        artis = ((son_adet - ilk_adet) / ilk_adet) * 100
-        artis_yuzdesi_str = f"{artis:+.2f}"
-
-    comparison_rows.append({
-        "Tarayıcı": b,
-        "İlk 15 Gün (Adet)": ilk_adet,
-        "Son 15 Gün (Adet)": son_adet,
-        "Yüzde Artış (%)": artis_yuzdesi_str
-    })
-
-comparison_df = pd.DataFrame(comparison_rows)
-
-# --- 2. FLASK SERVER VE DASH UYGULAMASI ---
-
-server = Flask(__name__)
-
-@server.route('/shutdown', methods=['POST'])
-def shutdown():
-    # Ctrl+C sinyali gönderelim
-    pid = os.getpid()
-    os.kill(pid, signal.SIGINT)
-    return 'Server shutting down...', 200
-
-app = dash.Dash(__name__, server=server)
-app.title = "Tarayıcı Kullanım Karşılaştırması"
-
-app.layout = html.Div([
-    html.H2("📊 Tarayıcı Kullanım Karşılaştırması (İnteraktif)", style={"textAlign": "center"}),
-
-    DataTable(
-        id='browser-table',
-        columns=[
-            {"name": "Tarayıcı", "id": "Tarayıcı", "type": "text"},
-            {"name": "İlk 15 Gün (Adet)", "id": "İlk 15 Gün (Adet)", "type": "numeric"},
-            {"name": "Son 15 Gün (Adet)", "id": "Son 15 Gün (Adet)", "type": "numeric"},
-            {"name": "Yüzde Artış (%)", "id": "Yüzde Artış (%)", "type": "text"},
-        ],
-        data=comparison_df.to_dict("records"),
-        style_cell={'textAlign': 'center', 'fontFamily': 'Arial', 'padding': '8px'},
-        style_header={'backgroundColor': '#f4f4f4', 'fontWeight': 'bold'},
-        style_data_conditional=[
-            {
-                'if': {
-                    'column_id': 'Yüzde Artış (%)',
-                    'filter_query': '{Yüzde Artış (%)} < 0'
-                },
-                'backgroundColor': '#f2dede',
-                'color': '#a10000',
-                'fontWeight': 'bold'
-            },
-            {
-                'if': {
-                    'column_id': 'Yüzde Artış (%)',
-                    'filter_query': '{Yüzde Artış (%)} >= 0'
+        # Bot olmayanlar SQLite tarafında filtrelenir
+        df = oku(["browser", "date"], filtreler=[("is_bot", "==", 0)])
+        df["adet"] = 1
+
+    df["date"] = pd.to_datetime(df["date"])
+    df = df.sort_values("date").reset_index(drop=True)
+
+    unique_dates = df["date"].dt.date.unique()
+    first_days = unique_dates[:karsilastirma_gunu]
+    last_days = unique_dates[-karsilastirma_gunu:]
+
+    df_ilk = df[df["date"].dt.date.isin(first_days)]
+    df_son = df[df["date"].dt.date.isin(last_days)]
+
+    browser_counts_ilk = df_ilk.groupby("browser")["adet"].sum()
+    browser_counts_son = df_son.groupby("browser")["adet"].sum()
+
+    all_browsers = sorted(set(browser_counts_ilk.index).union(browser_counts_son.index))
+
+    comparison_rows = []
+    for b in all_browsers:
+        ilk_adet = browser_counts_ilk.get(b, 0)
+        son_adet = browser_counts_son.get(b, 0)
+
+        if ilk_adet == 0:
+            artis_yuzdesi_str = "∞" if son_adet > 0 else "0"
+        else:
+            artis = ((son_adet - ilk_adet) / ilk_adet) * 100
+            artis_yuzdesi_str = f"{artis:+.2f}"
+
+        comparison_rows.append({
+            "Tarayıcı": b,
+            f"İlk {karsilastirma_gunu} Gün (Adet)": ilk_adet,
+            f"Son {karsilastirma_gunu} Gün (Adet)": son_adet,
+            "Yüzde Artış (%)": artis_yuzdesi_str
+        })
+
+    comparison_df = pd.DataFrame(comparison_rows)
+    return comparison_df
+
+def veri():
+    return bellekte("browser_karsilastirma", tarayici_karsilastirmasi, {"gun": karsilastirma_gunu})
+
+# --- 2. DASH SAYFASI ---
+
+def layout():
+    from dash import html
+    from dash.dash_table import DataTable
+
+    comparison_df = veri()
+    return html.Div([
+        html.H2("📊 Tarayıcı Kullanım Karşılaştırması (İnteraktif)", style={"textAlign": "center"}),
+
+        DataTable(
+            id='browser-table',
+            columns=[
+                {"name": col, "id": col, "type": "text" if col in ["Tarayıcı", "Yüzde Artış (%)"] else "numeric"}
+                for col in comparison_df.columns
+            ],
+            data=comparison_df.to_dict("records"),
+            style_cell={'textAlign': 'center', 'fontFamily': 'Arial', 'padding': '8px'},
+            style_header={'backgroundColor': '#f4f4f4', 'fontWeight': 'bold'},
+            style_data_conditional=[
+                {
+                    'if': {
+                        'column_id': 'Yüzde Artış (%)',
+                        'filter_query': '{Yüzde Artış (%)} < 0'
+                    },
+                    'backgroundColor': '#f2dede',
+                    'color': '#a10000',
+                    'fontWeight': 'bold'
                 },
-                'backgroundColor': '#dff0d8',
-                'color': '#006400',
-                'fontWeight': 'bold'
-            }
-        ],
-        sort_action="native",
-        filter_action="native",
-        page_size=10
-    ),
-
-    html.Button("Sayfayı Durdur", id="shutdown-btn", style={"marginTop": "20px"}),
-
-    # Sayfa kapanınca shutdown isteği gönder
-    html.Script('''
-        window.addEventListener("beforeunload", function (e) {
-            navigator.sendBeacon("/shutdown");
-        });
-    ''')
-])
-
-from dash.dependencies import Input, Output
-
-@app.callback(
-    Output('shutdown-btn', 'children'),
-    Input('shutdown-btn', 'n_clicks')
-)
-def shutdown_app(n_clicks):
-    if n_clicks:
-        import requests
-        try:
-            requests.post("http://127.0.0.1:9000/shutdown")
-        except:
-            pass
-        return "Uygulama Kapatılıyor..."
-    return "Sayfayı Kapat"
-
-def open_browser():
-    webbrowser.open_new("http://127.0.0.1:9000")
+                {
+                    'if': {
+                        'column_id': 'Yüzde Artış (%)',
+                        'filter_query': '{Yüzde Artış (%)} >= 0'
+                    },
+                    'backgroundColor': '#dff0d8',
+                    'color': '#006400',
+                    'fontWeight': 'bold'
+                }
+            ],
+            sort_action="native",
+            filter_action="native",
+            page_size=10
+        )
+    ])
+
+def figurler(df):
+    # Statik rapor (toplu_rapor.py): DataTable yerine aynı renklendirmeyle Plotly tablosu
+    return [karsilastirma_tablosu(df, "Yüzde Artış (%)", BASLIK)]
+
+def kaydet(app):
+    # Tablo sıralama ve filtrelemeyi tarayıcıda yapar, callback yok
+    pass
 
 if __name__ == '__main__':
-    threading.Timer(1, open_browser).start()
-    app.run(debug=False, port=9000)
+    from dash_sunucu import tek_sayfa_calistir
+    tek_sayfa_calistir(sys.modules[__name__], port=9000)
@@ -1,52 +1,36 @@
 import pandas as pd
-import matplotlib.pyplot as plt
-import psutil
 import multiprocessing
 from collections import Counter
-from sqlalchemy import create_engine, MetaData, Table, select, func
-from concurrent.futures import ProcessPoolExecutor
-
-# === Donanım ayarları ===
-cpu_count = multiprocessing.cpu_count()
-num_workers = max(1, int(cpu_count * 0.9))  # %90 CPU
-mem_available = psutil.virtual_memory().available
-target_memory = int(mem_available * 0.9)  # %90 RAM
-estimated_row_size = 512  # Tarayıcı bilgisi genellikle hafif
-chunksize = max(1000, target_memory // estimated_row_size)
-
-# === Veritabanı bağlantısı ===
-engine = create_engine("sqlite:///duzenli_data.db")
-metadata = MetaData()
-metadata.reflect(bind=engine)
-logs_table = Table("logs", metadata, autoload_with=engine)
-
-# === Filtreli toplam satır sayısını bul (is_bot = 0) ===
-with engine.connect() as conn:
-    total_rows = conn.execute(
-        select(func.count()).select_from(logs_table).where(logs_table.c["is_bot"] == 0)
-    ).scalar()
-
-# === Chunk işleme fonksiyonu ===
-def process_chunk(offset):
-    with engine.connect() as conn:
-        query = (
-            select(logs_table.c["browser"])
-            .where(logs_table.c["is_bot"] == 0)
-            .limit(chunksize)
-            .offset(offset)
-        )
-        chunk = pd.read_sql(query, conn)
-        chunk = chunk.dropna()
-        return Counter(chunk["browser"])
-
-# === Ana işlem ===
-if __name__ == "__main__":
-    offsets = list(range(0, total_rows, chunksize))
-    browser_counts = Counter()
-
-    with ProcessPoolExecutor(max_workers=num_workers) as executor:
-        for partial_count in executor.map(process_chunk, offsets):
-            browser_counts.update(partial_count)
+from parquet_depo import parquet_var_mi, parquet_oku
+from veri_erisim import grupla, ozet
+from sonuc_onbellek import onbellekli
+
+BASLIK = "Tarayıcı Kullanımı"
+
+# === Sayım ===
+def tarayici_sayimlari():
+    ozet_df = ozet("ozet_tarayici", is_bot=0)
+    if ozet_df is not None:
+        # Ingest sırasında hazırlanan günlük özet tablosu
+        ozet_df = ozet_df.dropna(subset=["browser"])
+        browser_counts = Counter(ozet_df.groupby("browser")["hits"].sum().to_dict())
+    elif parquet_var_mi():
+        # Parquet varsa sadece browser ve is_bot kolonları okunur
+        browsers = parquet_oku(["browser"], filtreler=[("is_bot", "==", 0)])["browser"]
+        browser_counts = Counter(browsers.dropna().astype(str).value_counts().to_dict())
+    else:
+        # Sayım SQLite'ta GROUP BY ile yapılır; rowid aralıkları paralel sayılıp toplanır
+        num_workers = max(1, int(multiprocessing.cpu_count() * 0.9))  # %90 CPU
+        counts = grupla(["browser"], filtreler=[("is_bot", "==", 0)], isci=num_workers).dropna(subset=["browser"])
+        browser_counts = Counter(dict(zip(counts["browser"].astype(str), counts["adet"].astype(int))))
+    return browser_counts
+
+def veri():
+    return onbellekli("browser_kullanim", tarayici_sayimlari)
+
+# === Grafik ===
+def ciz(browser_counts):
+    import matplotlib.pyplot as plt
 
     # === Sonuçları işle ===
     browser_df = pd.DataFrame(browser_counts.items(), columns=["browser", "count"])
@@ -69,4 +53,10 @@ if __name__ == "__main__":
     plt.ylabel("Yüzde (%)")
     plt.xticks(rotation=45)
     plt.tight_layout()
+    return plt.gcf()
+
+# === Ana işlem ===
+if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+    ciz(veri())
     plt.show()
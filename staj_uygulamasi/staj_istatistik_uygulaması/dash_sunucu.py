@@ -0,0 +1,132 @@
+import os
+import signal
+import argparse
+import threading
+import webbrowser
+
+# === Çok sayfalı Dash sunucusu ===
+# Etkileşimli grafikler ayrı ayrı süreç ve port açmak yerine tek bir uzun
+# ömürlü Dash/Flask uygulamasında sayfa olarak sunulur. Her sayfa modülü
+# BASLIK, veri(), layout() ve kaydet(app) tanımlar; veri ilk ziyarette
+# hesaplanır ve veritabanı değişene kadar bellekte kalır (sonuc_onbellek.bellekte),
+# bu yüzden sayfalar arası geçiş sadece çizim süresi kadardır.
+# Kivy başlatıcısı bu dosyadan sadece sayfa listesini okur; dash ve sayfa
+# modülleri bu yüzden fonksiyonların içinde yüklenir.
+SUNUCU_PORTU = 9010
+SAYFALAR = [
+    ("browser_karsılastırma_tablosu.py", "/tarayici-karsilastirma"),
+    ("hata_veren_sayfalar_istatistigi.py", "/hata-veren-sayfalar"),
+    ("ip_konum_karsilastirma_tablosu.py", "/ip-konum-karsilastirma"),
+    ("saat_tarih_ip_grafik.py", "/saat-tarih-ip"),
+    ("sayfa_sonrası_ziyaret_grafigi.py", "/sayfa-sonrasi-ziyaret"),
+    ("trafik_yogunluk_grafigi.py", "/trafik-yogunluk"),
+]
+
+
+def sayfa_yolu(filename):
+    for dosya, yol in SAYFALAR:
+        if dosya == filename:
+            return yol
+    return None
+
+
+def sayfa_adresi(yol="", port=SUNUCU_PORTU):
+    return f"http://127.0.0.1:{port}{yol}"
+
+
+def _kapat():
+    # Yanıt tarayıcıya ulaşsın diye Ctrl+C sinyali kısa bir gecikmeyle gönderilir
+    threading.Timer(0.5, lambda: os.kill(os.getpid(), signal.SIGINT)).start()
+
+
+def _durdurma(app, metin):
+    from dash import html, Input, Output
+
+    @app.callback(
+        Output('shutdown-message', 'children'),
+        Input('shutdown-btn', 'n_clicks'),
+        prevent_initial_call=True
+    )
+    def shutdown_app(n_clicks):
+        if n_clicks:
+            _kapat()
+            return "Uygulama durduruluyor..."
+
+    return [
+        html.Button(metin, id='shutdown-btn', style={'margin': '20px'}),
+        html.Div(id='shutdown-message', style={"color": "red", "fontWeight": "bold"}),
+    ]
+
+
+def tek_sayfa_calistir(modul, port):
+    # Sayfa modülü doğrudan çalıştırıldığında eskisi gibi kendi portunda açılır
+    from dash import Dash, html
+
+    modul.veri()
+    app = Dash(__name__, title=modul.BASLIK)
+    modul.kaydet(app)
+    app.layout = html.Div([modul.layout()] + _durdurma(app, "Sayfayı Durdur"))
+
+    threading.Timer(1.0, lambda: webbrowser.open(sayfa_adresi(port=port))).start()
+    app.run(debug=False, port=port)
+
+
+def uygulama_olustur():
+    from dash import Dash, dcc, html, Input, Output
+    from grafikler import modul_yukle
+
+    sayfalar = [(yol, modul_yukle(dosya)) for dosya, yol in SAYFALAR]
+
+    # Sayfaların bileşenleri sadece o sayfa açıkken var olduğu için
+    # callback'ler başlangıçta bulunamayan id'lere bağlanabilmeli
+    app = Dash(__name__, title="Platin360 Grafikleri", suppress_callback_exceptions=True)
+    for _, modul in sayfalar:
+        modul.kaydet(app)
+
+    menu = [
+        dcc.Link(modul.BASLIK, href=yol, style={"marginRight": "20px"})
+        for yol, modul in sayfalar
+    ]
+    app.layout = html.Div([
+        dcc.Location(id="adres"),
+        html.Div(menu, style={"padding": "10px", "borderBottom": "1px solid #ccc", "fontFamily": "Arial"}),
+        html.Div(id="sayfa-icerigi"),
+        *_durdurma(app, "Sunucuyu Durdur"),
+    ])
+
+    @app.callback(
+        Output("sayfa-icerigi", "children"),
+        Input("adres", "pathname")
+    )
+    def sayfa_goster(pathname):
+        for yol, modul in sayfalar:
+            if pathname == yol:
+                return modul.layout()
+        return html.H3("Yukarıdan bir grafik seçin.", style={"fontFamily": "Arial"})
+
+    return app, sayfalar
+
+
+def isit(sayfalar):
+    # Sunucu açılırken tüm sayfaların verisi arka planda hazırlanır
+    for yol, modul in sayfalar:
+        try:
+            modul.veri()
+        except Exception as e:
+            print(f"{yol}: veri hazırlanamadı: {e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Etkileşimli grafikleri tek bir Dash sunucusunda açar")
+    parser.add_argument("--port", type=int, default=SUNUCU_PORTU)
+    parser.add_argument("--sayfa", default="", help="Açılışta tarayıcıda gösterilecek sayfa (ör. /saat-tarih-ip)")
+    parser.add_argument("--sessiz", action="store_true", help="Tarayıcı otomatik açılmaz")
+    parser.add_argument("--soguk", action="store_true", help="Sayfa verileri açılışta hazırlanmaz, ilk ziyarette hesaplanır")
+    args = parser.parse_args()
+
+    app, sayfalar = uygulama_olustur()
+    if not args.soguk:
+        threading.Thread(target=isit, args=(sayfalar,), daemon=True).start()
+    if not args.sessiz:
+        threading.Timer(1.0, lambda: webbrowser.open(sayfa_adresi(args.sayfa, args.port))).start()
+    app.run(debug=False, port=args.port)
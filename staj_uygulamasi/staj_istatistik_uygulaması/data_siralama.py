@@ -1,9 +1,36 @@
 import os
+import sys
+import argparse
+import gzip
+import hashlib
+import json
+import queue
+import shutil
+import threading
+import time
 import pandas as pd
-from sqlalchemy import create_engine, MetaData
+from collections import OrderedDict
+from sqlalchemy import create_engine, event, inspect, text
 from user_agents import parse
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor
 import multiprocessing
+from ip_konum import indeks_yukle, IP_KONUM_DOSYASI, KONUM_KOLONLARI
+from parquet_depo import ParquetYazici, parquet_destekleniyor, parquet_sil, parquet_yarim_sil, PARQUET_KLASORU
+from ozet_tablolar import ozetleri_guncelle
+from dis_siralama import DisSiralayici
+from ilerleme import IlerlemeBildirici
+from ua_siniflandirici import UA_KOLONLARI, toplu_siniflandir
+from boyut_tablolari import BoyutKodlayici, KODLU_TABLO, kimlik_kolonu, logs_gorunumu_olustur
+
+# === UA önbelleği ===
+# Aynı UA metni milyonlarca satırda tekrarlandığı için her farklı UA bir kez
+# çözümlenir; sonuçlar chunk'lar arasında sınırlı boyutlu bir LRU önbellekte tutulur.
+UA_ONBELLEK_BOYUTU = 200_000
+_ua_onbellek = OrderedDict()
+
+# Bu sayının altındaki yeni UA'lar ana süreçte çözümlenir
+UA_PARALEL_ESIGI = 2_000
+UA_MIN_DILIM = 500
 
 def detect_browser(ua_string):
     ua_lower = ua_string.lower()
@@ -38,105 +65,796 @@ def parse_user_agent(ua_string):
         "is_bot": parsed.is_bot,
     }
 
-def parallel_parse_user_agents(ua_list, max_workers=None):
+def parse_user_agent_batch(ua_batch):
+    return [parse_user_agent(ua) for ua in ua_batch]
+
+def default_worker_count():
+    # cpu_count() - 2 tek/çift çekirdekli makinelerde 0 veya negatif olabiliyor
+    return max(1, multiprocessing.cpu_count() - 2)
+
+def parallel_parse_user_agents(ua_list, executor=None, max_workers=None):
+    if not ua_list:
+        return {}
     if max_workers is None:
-        max_workers = multiprocessing.cpu_count() - 2
-    print(f"🧠 {max_workers} thread kullanılacak...")
-
-    with ProcessPoolExecutor(max_workers=max_workers) as executor:
-        futures = [executor.submit(parse_user_agent, ua) for ua in ua_list]
-        results = []
-        for i, future in enumerate(as_completed(futures), 1):
-            results.append(future.result())
-            if i % 1000 == 0 or i == len(ua_list):
-                percent = (i / len(ua_list)) * 100
-                print(f"%{percent:.2f} işlendi.")
-    return results
-
-def process_db(input_db_path):
-    print(f"\n İşleme alınıyor: {input_db_path}")
+        max_workers = default_worker_count()
+    max_workers = max(1, max_workers)
+
+    # Az sayıda UA için süreç havuzuna gönderme maliyeti çözümlemeden pahalı
+    if max_workers == 1 or len(ua_list) < UA_PARALEL_ESIGI:
+        return dict(zip(ua_list, parse_user_agent_batch(ua_list)))
+
+    # Büyük dilimler halinde gönder, sonuçlar executor.map ile sırayla döner
+    batch_size = max(UA_MIN_DILIM, -(-len(ua_list) // (max_workers * 4)))
+    batches = [ua_list[i:i + batch_size] for i in range(0, len(ua_list), batch_size)]
+    print(f"🧠 {max_workers} işlemci, {len(batches)} dilim kullanılacak...")
+
+    results = []
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=max_workers)
     try:
-        engine = create_engine(f"sqlite:///{input_db_path}")
-        metadata = MetaData()
-        metadata.reflect(bind=engine)
+        for batch_result in executor.map(parse_user_agent_batch, batches):
+            results.extend(batch_result)
+            percent = (len(results) / len(ua_list)) * 100
+            print(f"%{percent:.2f} işlendi.")
+    finally:
+        if own_executor:
+            executor.shutdown()
+    return dict(zip(ua_list, results))
+
+def cached_parse_user_agents(ua_series, executor=None, max_workers=None):
+    ua_series = ua_series.fillna("")
+    unique_uas = ua_series.unique()
+
+    chunk_results = {}
+    missing = []
+    for ua in unique_uas:
+        if ua in _ua_onbellek:
+            _ua_onbellek.move_to_end(ua)
+            chunk_results[ua] = _ua_onbellek[ua]
+        else:
+            missing.append(ua)
+
+    # Sık görülen kalıplar hızlı sınıflandırıcıyla, kalanlar user_agents ile çözümlenir
+    parsed, missing = toplu_siniflandir(missing)
+    print(
+        f"🔍 {len(ua_series)} satırda {len(unique_uas)} farklı UA var, {len(parsed) + len(missing)} tanesi "
+        f"çözümlenecek ({len(parsed)} hızlı yoldan)..."
+    )
+    parsed.update(parallel_parse_user_agents(missing, executor=executor, max_workers=max_workers))
+    if parsed:
+        chunk_results.update(parsed)
+        _ua_onbellek.update(parsed)
+        while len(_ua_onbellek) > UA_ONBELLEK_BOYUTU:
+            _ua_onbellek.popitem(last=False)
+
+    # Farklı UA'lar için tablo oluştur, satırlara vektörel olarak yay
+    ua_df = pd.DataFrame.from_dict(chunk_results, orient="index", columns=UA_KOLONLARI)
+    return ua_df.reindex(ua_series.values).reset_index(drop=True)
+
+# === Artımlı işleme bilgisi ===
+# duzenli_data.db içindeki ingest_meta tablosu son işlenen kaynak satırını
+# (rowid), en büyük tarih-saati ve kaynağın parmak izini tutar.
+#
+# Çalışma sürerken aynı tabloda devam_* anahtarları bulunur: okunup diske
+# sıralı koşular olarak yazılan kaynak aralığı (okunan_rowid + koşu listesi) ve
+# birleştirmede son yazılan zaman (birlestirme_siniri). Her ikisi de ilgili
+# veriyle aynı işlemde kaydedilir; çalışma kesilirse sonraki çalıştırma kalan
+# yerden devam eder. Parquet yazıcısı satırları tamponda biriktirdiği için
+# kendi sınırını (parquet_siniri: diske yazılmış son zaman) ayrıca tutar.
+# Başarıyla bitince bu anahtarlar silinir.
+OUTPUT_PATH = "duzenli_data.db"
+# Tam oluşturma bu dosyaya yapılır, bitince duzenli_data.db'nin yerine geçer
+GECICI_UZANTI = ".tmp"
+SIRALAMA_UZANTI = ".siralama"
+DEVAM_ANAHTARLARI = (
+    "devam_kaynak", "devam_baslangic_zamani", "okunan_rowid", "siralama_kosulari",
+    "okuma_tamam", "birlestirme_siniri", "parquet_calisma", "parquet_dosya_no", "parquet_siniri",
+)
+META_TABLOSU = "ingest_meta"
+PARMAK_IZI_SATIR = 1000
+PARMAK_IZI_BAYT = 64 * 1024
+# Çıktı tablolarının düzeni değişince artırılır; eski dosyalar baştan oluşturulur
+# 2: logs_kodlu + boyut_* tabloları, logs bir görünüm
+SEMA_SURUMU = "2"
+
+def meta_oku(conn):
+    if not inspect(conn).has_table(META_TABLOSU):
+        return {}
+    rows = conn.execute(text(f"SELECT anahtar, deger FROM {META_TABLOSU}")).all()
+    return dict(rows)
+
+def meta_yaz(conn, **values):
+    conn.execute(text(f"CREATE TABLE IF NOT EXISTS {META_TABLOSU} (anahtar TEXT PRIMARY KEY, deger TEXT)"))
+    conn.execute(
+        text(f"INSERT OR REPLACE INTO {META_TABLOSU} (anahtar, deger) VALUES (:anahtar, :deger)"),
+        [{"anahtar": k, "deger": str(v)} for k, v in values.items()]
+    )
+
+def meta_sil(conn, anahtarlar):
+    if inspect(conn).has_table(META_TABLOSU):
+        conn.execute(
+            text(f"DELETE FROM {META_TABLOSU} WHERE anahtar = :anahtar"),
+            [{"anahtar": key} for key in anahtarlar]
+        )
+
+def meta_dosyadan_oku(path):
+    if not os.path.exists(path):
+        return {}
+    engine = create_engine(f"sqlite:///{path}")
+    try:
+        with engine.connect() as conn:
+            return meta_oku(conn)
+    finally:
+        engine.dispose()
+
+def sqlite_sil(path):
+    for p in (path, path + "-wal", path + "-shm"):
+        if os.path.exists(p):
+            os.remove(p)
+
+def calisma_dosyasi_sec(output_path, parquet_path, fingerprint, incremental):
+    # Yazılacak SQLite dosyasını, Parquet klasörünü ve meta bilgisini seçer.
+    # Tam oluşturma geçici dosyaya yapılır; artımlı ekleme yerinde, chunk chunk işlemlerle.
+    tmp_path = output_path + GECICI_UZANTI
+    tmp_parquet = parquet_path + GECICI_UZANTI
+    tmp_meta = meta_dosyadan_oku(tmp_path)
+    if tmp_meta.get("sema_surumu") == SEMA_SURUMU and fingerprint in (
+        tmp_meta.get("devam_kaynak"), tmp_meta.get("kaynak_parmak_izi")
+    ):
+        print(f"Yarım kalan tam oluşturma bulundu, {tmp_path} üzerinden devam ediliyor.")
+        return tmp_path, tmp_parquet, tmp_meta
+
+    # Başka bir kaynağa ait eski geçici dosyalar
+    sqlite_sil(tmp_path)
+    shutil.rmtree(tmp_path + SIRALAMA_UZANTI, ignore_errors=True)
+    parquet_sil(tmp_parquet)
 
-        output_path = "duzenli_data.db"
-        if os.path.exists(output_path):
-            os.remove(output_path)
-            print("Eski duzenli_data.db silindi.")
+    if incremental and os.path.exists(output_path):
+        meta = meta_dosyadan_oku(output_path)
+        if meta and meta.get("sema_surumu") == SEMA_SURUMU:
+            return output_path, parquet_path, meta
+        if meta:
+            print("duzenli_data.db eski şemada, tam yeniden oluşturulacak.")
+        else:
+            print("Önceki işleme bilgisi yok, tam yeniden oluşturulacak.")
+    return tmp_path, tmp_parquet, {}
 
-        out_engine = create_engine(f"sqlite:///{output_path}")
-        first_chunk = True
+def yerine_koy(work_path, output_path, parquet_work, parquet_path):
+    # Tamamlanan geçici dosya tek adımda (os.replace) eskisinin yerine geçer;
+    # eski dosyaya ait WAL kalıntıları yeni dosyaya uygulanmasın diye silinir
+    for suffix in ("-wal", "-shm"):
+        if os.path.exists(output_path + suffix):
+            os.remove(output_path + suffix)
+    os.replace(work_path, output_path)
+    parquet_sil(parquet_path)
+    if os.path.isdir(parquet_work):
+        os.replace(parquet_work, parquet_path)
+    print(f"{work_path} -> {output_path}")
+
+def kaynak_parmak_izi(input_path):
+    # Kaynağın başı değişmediyse aynı dosyanın büyümüş hali kabul edilir
+    if is_log_file(input_path):
+        opener = gzip.open if input_path.endswith(".gz") else open
+        with opener(input_path, "rb") as f:
+            return hashlib.sha1(f.read(PARMAK_IZI_BAYT)).hexdigest()
+
+    engine = create_engine(f"sqlite:///{input_path}")
+    try:
+        with engine.connect() as conn:
+            head = pd.read_sql(text(f"SELECT * FROM logs ORDER BY rowid LIMIT {PARMAK_IZI_SATIR}"), con=conn)
+    finally:
+        engine.dispose()
+    digest = hashlib.sha1(",".join(head.columns).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(head, index=False).values.tobytes())
+    return digest.hexdigest()
+
+def tahmini_satir_sayisi(input_path, after_rowid=0):
+    # İlerleme yüzdesi için yaklaşık satır sayısı; log dosyalarında boyuttan tahmin edilir
+    try:
+        if is_log_file(input_path):
+            size = os.path.getsize(input_path)
+            if input_path.endswith(".gz"):
+                # gzip sonundaki ISIZE açılmış boyutun 2^32 modudur
+                with open(input_path, "rb") as f:
+                    f.seek(-4, os.SEEK_END)
+                    compressed, size = size, int.from_bytes(f.read(4), "little")
+                while size < compressed:
+                    size += 2 ** 32
+            opener = gzip.open if input_path.endswith(".gz") else open
+            with opener(input_path, "rb") as f:
+                sample = f.read(PARMAK_IZI_BAYT)
+            lines = sample.count(b"\n")
+            if not lines:
+                return None
+            return max(0, int(size / (len(sample) / lines)) - after_rowid)
+
+        engine = create_engine(f"sqlite:///{input_path}")
+        try:
+            with engine.connect() as conn:
+                max_rowid = conn.execute(text("SELECT MAX(rowid) FROM logs")).scalar() or 0
+        finally:
+            engine.dispose()
+        return max(0, max_rowid - after_rowid)
+    except Exception:
+        return None
+
+# === Ham W3C / IIS log okuma ===
+LOG_UZANTILARI = (".log", ".log.gz")
+W3C_SAYISAL_KOLONLAR = ["s-port", "sc-status", "sc-substatus", "sc-win32-status", "sc-bytes", "cs-bytes", "time-taken"]
+
+def is_log_file(path):
+    return path.lower().endswith(LOG_UZANTILARI)
+
+def _w3c_frame(rows, fields, first_line_no):
+    df = pd.DataFrame(rows, columns=fields)
+    for col in W3C_SAYISAL_KOLONLAR:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
+    df.insert(0, "_kaynak_rowid", range(first_line_no, first_line_no + len(df)))
+    return df
+
+def read_w3c_log(path, batch_size=100_000, skip_records=0):
+    # Dosya satır satır okunur, bellekte en fazla bir grup kayıt tutulur.
+    # "#Fields:" başlığı dosya ortasında değişirse yeni kolonlarla devam edilir.
+    opener = gzip.open if path.endswith(".gz") else open
+    fields = None
+    rows = []
+    record_no = 0
+    skipped_lines = 0
+    with opener(path, "rt", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            if line.startswith("#"):
+                if line.startswith("#Fields:"):
+                    if rows:
+                        yield _w3c_frame(rows, fields, record_no - len(rows) + 1)
+                        rows = []
+                    fields = line[len("#Fields:"):].split()
+                continue
+            if fields is None:
+                continue
+            values = line.rstrip("\r\n").split(" ")
+            if len(values) != len(fields):
+                skipped_lines += 1
+                continue
+            record_no += 1
+            if record_no <= skip_records:
+                continue
+            rows.append(values)
+            if len(rows) >= batch_size:
+                yield _w3c_frame(rows, fields, record_no - len(rows) + 1)
+                rows = []
+    if rows:
+        yield _w3c_frame(rows, fields, record_no - len(rows) + 1)
+    if skipped_lines:
+        print(f"{skipped_lines} hatalı log satırı atlandı.")
+
+def read_source_chunks(input_path, after_rowid=0, after_datetime=None, chunk_size=100_000):
+    # Her chunk kaynaktaki sırasını gösteren _kaynak_rowid kolonunu taşır
+    if is_log_file(input_path):
+        for chunk in read_w3c_log(input_path, batch_size=chunk_size, skip_records=after_rowid):
+            if after_datetime:
+                chunk = chunk[(chunk["date"] + " " + chunk["time"]) > after_datetime]
+            if not chunk.empty:
+                yield chunk.reset_index(drop=True)
+        return
+
+    where, params = "rowid > :rowid", {"rowid": after_rowid}
+    if after_datetime:
+        where += " AND (date || ' ' || time) > :zaman"
+        params["zaman"] = after_datetime
+    query = text(f"SELECT rowid AS _kaynak_rowid, * FROM logs WHERE {where} ORDER BY rowid")
+    engine = create_engine(f"sqlite:///{input_path}")
+    try:
+        with engine.connect() as conn:
+            for chunk in pd.read_sql(query, con=conn, params=params, chunksize=chunk_size):
+                if not chunk.empty:
+                    yield chunk
+    finally:
+        engine.dispose()
+
+def add_missing_columns(conn, chunk, table="logs"):
+    # "#Fields:" başlığı değişen log dosyalarında tabloya yeni kolonlar eklenir
+    if not inspect(conn).has_table(table):
+        return
+    existing = {col["name"] for col in inspect(conn).get_columns(table)}
+    for col in chunk.columns:
+        if col not in existing:
+            conn.execute(text(f'ALTER TABLE {table} ADD COLUMN "{col}"'))
+
+def toplu_yaz(conn, table, df):
+    # Tablo yoksa şeması pandas ile oluşturulur; satırlar SQLAlchemy'nin satır
+    # başı parametre hazırlığı yerine doğrudan sqlite3 executemany ile yazılır
+    if not inspect(conn).has_table(table):
+        df.head(0).to_sql(table, con=conn, index=False)
+    cols = ", ".join(f'"{col}"' for col in df.columns)
+    params = ", ".join("?" for _ in df.columns)
+    values = df.astype(object).where(df.notna(), None)
+    conn.exec_driver_sql(
+        f'INSERT INTO {table} ({cols}) VALUES ({params})',
+        list(values.itertuples(index=False, name=None)),
+    )
+
+def enrich_chunk(chunk, executor, max_workers, ip_index):
+    # Zamana göre sıralama process_db'deki dış sıralamada yapılır
+    chunk["datetime"] = pd.to_datetime(chunk["date"] + " " + chunk["time"])
+
+    ua_df = cached_parse_user_agents(chunk["cs(User-Agent)"], executor=executor, max_workers=max_workers)
+    chunk = pd.concat([chunk, ua_df], axis=1)
+
+    # Konum sütunlarını ekle (botlar için konum aranmaz)
+    if ip_index is not None:
+        non_bot_ips = chunk["c-ip"].where(~chunk["is_bot"].astype(bool))
+        chunk = pd.concat([chunk, ip_index.bul(non_bot_ips)], axis=1)
+    else:
+        for col in KONUM_KOLONLARI:
+            chunk[col] = None
+    return chunk
+
+# === SQLite yazma ayarları ve indeksler ===
+# Yükleme sırasında indeks yoktur; indeksler analiz betiklerinin sorgularına
+# göre yükleme bittikten sonra tek seferde oluşturulur.
+LOGS_INDEKSLERI = {
+    # sayfa_sonrası / trafik_yogunluk / girilen_sayfa: is_bot = 0 AND sc-status = 200
+    "idx_logs_gezinme": ["is_bot", "sc-status", "date", "c-ip", "time", "cs-uri-stem"],
+    # browser_kullanim / browser_karsılastırma: is_bot = 0, browser (+ date)
+    "idx_logs_tarayici": ["is_bot", "date", "browser"],
+    # hata_veren_sayfalar: sc-status >= 400; status_code: sc-status sayımı
+    "idx_logs_durum": ["sc-status", "cs-uri-stem"],
+    # ip_world_location: is_bot = 0 GROUP BY c-ip, lat, lon, city, country
+    "idx_logs_konum": ["is_bot", "c-ip", "lat", "lon", "city", "country"],
+    # cohort / geri dönüş / saat-tarih: günlük ve saatlik IP'ler
+    "idx_logs_ziyaret": ["is_bot", "date", "time", "c-ip"],
+    # os_mobile_pc: is_mobile / is_pc kırılımında os
+    "idx_logs_os": ["is_mobile", "is_pc", "os"],
+    # tarih aralığı sorguları
+    "idx_logs_tarih": ["date", "time"],
+}
+
+def apply_bulk_pragmas(engine):
+    @event.listens_for(engine, "connect")
+    def _pragmas(dbapi_conn, _record):
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        # Geçici dosyada da kaldığı yerden devam edilebildiği için NORMAL (OFF değil)
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA cache_size=-262144")  # ~256 MB
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.close()
+
+def create_indexes(conn, table=KODLU_TABLO):
+    if not inspect(conn).has_table(table):
+        return
+    existing_columns = {col["name"] for col in inspect(conn).get_columns(table)}
+    for name, columns in LOGS_INDEKSLERI.items():
+        # Boyut kolonları logs_kodlu'da tam sayı anahtarlarıyla indekslenir
+        columns = [kimlik_kolonu(col) for col in columns]
+        if not set(columns) <= existing_columns:
+            continue
+        column_sql = ", ".join(f'"{col}"' for col in columns)
+        conn.execute(text(f'CREATE INDEX IF NOT EXISTS {name} ON {table} ({column_sql})'))
+    print("İndeksler oluşturuldu.")
+    conn.execute(text("PRAGMA analysis_limit=1000"))
+    conn.execute(text("ANALYZE"))
+
+# === Boru hattı (pipeline) ===
+# Okuma, zenginleştirme (UA + konum) ve yazma ayrı iş parçacıklarında çalışır.
+# Aşamalar arasındaki kuyruklar sınırlıdır: yazıcı geride kalırsa önceki
+# aşamalar bekler, bellekte aynı anda en fazla birkaç chunk bulunur.
+KUYRUK_BOYUTU = 2
+_BITTI = object()
+
+class _AsamaHatasi:
+    def __init__(self, hata):
+        self.hata = hata
+
+def _kuyruga_koy(q, item, stop):
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+def asama(iterable, fonksiyon, ad, sureler):
+    # Her elemana fonksiyonu uygular; sadece fonksiyonun süresi aşamaya yazılır
+    for item in iterable:
+        start = time.perf_counter()
+        result = fonksiyon(item)
+        sureler[ad] = sureler.get(ad, 0.0) + time.perf_counter() - start
+        yield result
+
+def arka_planda(iterable, ad, sureler=None, maxsize=KUYRUK_BOYUTU):
+    # iterable ayrı bir iş parçacığında tüketilir, elemanlar sınırlı kuyruktan
+    # sırayla verilir; aşamadaki hata tüketen tarafta tekrar yükseltilir.
+    # sureler verilirse eleman üretmek için geçen süre aşamaya yazılır.
+    q = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+
+    def producer():
+        iterator = iter(iterable)
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                finally:
+                    if sureler is not None:
+                        sureler[ad] = sureler.get(ad, 0.0) + time.perf_counter() - start
+                if not _kuyruga_koy(q, item, stop):
+                    return
+            _kuyruga_koy(q, _BITTI, stop)
+        except BaseException as e:
+            _kuyruga_koy(q, _AsamaHatasi(e), stop)
+        finally:
+            if hasattr(iterator, "close"):
+                iterator.close()
+
+    thread = threading.Thread(target=producer, name=f"ingest-{ad}", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = q.get()
+            if item is _BITTI:
+                return
+            if isinstance(item, _AsamaHatasi):
+                raise item.hata
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+def _okuyucu_sureci(q, args):
+    try:
+        iterator = iter(read_source_chunks(*args))
+        while True:
+            start = time.perf_counter()
+            chunk = next(iterator, None)
+            if chunk is None:
+                break
+            q.put((chunk, time.perf_counter() - start))
+        q.put(_BITTI_ISARETI)
+    except BaseException as e:
+        q.put(_AsamaHatasi(RuntimeError(f"Okuma hatası: {type(e).__name__}: {e}")))
+
+_BITTI_ISARETI = "bitti"
+
+def surecte_oku(args, sureler, maxsize=KUYRUK_BOYUTU):
+    # Okuma (SQLite -> DataFrame) GIL'i yazıcıyla paylaşmasın diye ayrı süreçte yapılır
+    ctx = multiprocessing.get_context()
+    q = ctx.Queue(maxsize=maxsize)
+    proc = ctx.Process(target=_okuyucu_sureci, args=(q, args), name="ingest-okuma", daemon=True)
+    proc.start()
+    try:
+        while True:
+            try:
+                item = q.get(timeout=1)
+            except queue.Empty:
+                if not proc.is_alive():
+                    raise RuntimeError("Okuma süreci beklenmedik şekilde sonlandı.")
+                continue
+            if isinstance(item, str) and item == _BITTI_ISARETI:
+                return
+            if isinstance(item, _AsamaHatasi):
+                raise item.hata
+            chunk, elapsed = item
+            sureler["okuma"] = sureler.get("okuma", 0.0) + elapsed
+            yield chunk
+    finally:
+        if proc.is_alive():
+            proc.terminate()
+        proc.join()
+
+# === Çıktı biçimleri ===
+# "sqlite": duzenli_data.db içindeki logs tablosu
+# "parquet": tarihe göre bölümlenmiş duzenli_parquet klasörü
+# "ikisi": her ikisi (pyarrow kuruluysa varsayılan)
+CIKTI_BICIMLERI = ("sqlite", "parquet", "ikisi")
+
+def default_output_format():
+    return "ikisi" if parquet_destekleniyor() else "sqlite"
+
+def process_db(input_path, max_workers=None, incremental=True, output_path=OUTPUT_PATH,
+               cikti=None, parquet_path=PARQUET_KLASORU, ilerleme=None):
+    print(f"\n İşleme alınıyor: {input_path}")
+    cikti = cikti or default_output_format()
+    if cikti not in CIKTI_BICIMLERI:
+        raise ValueError(f"Geçersiz çıktı biçimi: {cikti}")
+    write_sqlite = cikti in ("sqlite", "ikisi")
+    write_parquet = cikti in ("parquet", "ikisi")
+    max_workers = max(1, max_workers or default_worker_count())
+    ilerleme = ilerleme or IlerlemeBildirici()
+    executor = ProcessPoolExecutor(max_workers=max_workers)
+    try:
+        fingerprint = kaynak_parmak_izi(input_path)
+        work_path, parquet_work, meta = calisma_dosyasi_sec(
+            output_path, parquet_path, fingerprint, incremental
+        )
+        out_engine = create_engine(f"sqlite:///{work_path}")
+        apply_bulk_pragmas(out_engine)
+
+        # Eski biçimdeki yarım birleştirme bilgisi
+        if meta.get("birlestirme_yarim") == "1" and "devam_kaynak" not in meta:
+            meta.update(devam_kaynak=meta["kaynak_parmak_izi"], birlestirme_siniri=meta["max_datetime"])
+        resuming = meta.get("devam_kaynak") == fingerprint
+
+        after_rowid, after_datetime = 0, None
+        if meta.get("kaynak_parmak_izi") == fingerprint:
+            # Aynı kaynak büyümüş: sadece yeni satırlar
+            after_rowid = int(meta["kaynak_rowid"])
+            print(f"Artımlı mod: {after_rowid}. kayıttan sonrası işlenecek.")
+        elif meta.get("max_datetime"):
+            # Yeni bir günlük dosyası: son işlenen zamandan sonraki satırlar
+            after_datetime = meta["max_datetime"]
+            print(f"Artımlı mod: {after_datetime} sonrası satırlar işlenecek.")
+        if resuming:
+            # Kesilen çalışmanın başlangıçtaki zaman sınırı (max_datetime o zamandan beri ilerlemiş olabilir)
+            after_datetime = meta.get("devam_baslangic_zamani") or None
+
+        max_rowid = after_rowid
+        max_datetime = meta.get("max_datetime", "")
+        total_written = int(meta.get("satir_sayisi", 0))
+        zaman_sirali = meta.get("zaman_sirali", "1")
+        new_rows = 0
+
+        # Diske yazılan sıralı koşular çalışma dosyasının yanında tutulur
+        sorter = DisSiralayici("datetime", kosu_klasoru=work_path + SIRALAMA_UZANTI)
+        saved_runs = json.loads(meta.get("siralama_kosulari", "[]")) if resuming else []
+        merge_boundary = meta.get("birlestirme_siniri", "") if resuming else ""
+        # Eski çalışmalarda Parquet her chunk'ta yazılırdı, sınırı birleştirmeninkiyle aynıdır
+        parquet_siniri = meta.get("parquet_siniri", merge_boundary) if resuming else ""
+        reading_done = False
+        if sorter.geri_yukle(saved_runs) and saved_runs:
+            max_rowid = int(meta["okunan_rowid"])
+            reading_done = meta.get("okuma_tamam") == "1"
+            print(f"Kesilen çalışmadan devam: {sorter.satir_sayisi} satır kayıtlı koşulardan alındı, "
+                  f"kaynakta {max_rowid}. kayıttan sonrası okunacak.")
+        elif resuming:
+            print("Kesilen çalışmanın kayıtlı koşusu yok, kaynak yeniden okunacak.")
+
+        parquet_writer = None
+        if write_parquet:
+            if resuming and meta.get("parquet_calisma"):
+                parquet_dosya_no = int(meta.get("parquet_dosya_no", 0))
+                parquet_yarim_sil(parquet_work, meta["parquet_calisma"], parquet_dosya_no)
+                parquet_writer = ParquetYazici(
+                    parquet_work, calisma_id=meta["parquet_calisma"], dosya_no=parquet_dosya_no
+                )
+            else:
+                parquet_writer = ParquetYazici(parquet_work)
+        encoder = BoyutKodlayici()
+
+        if not resuming:
+            with out_engine.begin() as out_conn:
+                meta_sil(out_conn, DEVAM_ANAHTARLARI)
+                meta_yaz(
+                    out_conn,
+                    sema_surumu=SEMA_SURUMU,
+                    devam_kaynak=fingerprint,
+                    devam_baslangic_zamani=after_datetime or "",
+                    okunan_rowid=after_rowid,
+                    parquet_calisma=parquet_writer.calisma_id if parquet_writer else "",
+                    parquet_dosya_no=0,
+                    parquet_siniri="",
+                )
+
+        def kosulari_kaydet(okuma_tamam):
+            # Diske yazılmış koşular ve kapsadıkları kaynak aralığı
+            with out_engine.begin() as out_conn:
+                meta_yaz(
+                    out_conn,
+                    okunan_rowid=max_rowid,
+                    siralama_kosulari=json.dumps(sorter.durum()),
+                    okuma_tamam=int(okuma_tamam),
+                )
+
+        ilerleme.basladi(input_path, tahmini_satir_sayisi(input_path, after_rowid))
 
         chunk_size = 100_000
-        for chunk in pd.read_sql_table("logs", con=engine, chunksize=chunk_size):
-            chunk["datetime"] = pd.to_datetime(chunk["date"] + " " + chunk["time"])
-            chunk = chunk.sort_values("datetime").reset_index(drop=True)
-
-            ua_list = chunk["cs(User-Agent)"].fillna("").tolist()
-            print(f"🔍 {len(chunk)} satır UA çözümlemesi başlıyor...")
-            parsed_data = parallel_parse_user_agents(ua_list)
-
-            ua_df = pd.DataFrame(parsed_data)
-            chunk.reset_index(drop=True, inplace=True)
-            ua_df.reset_index(drop=True, inplace=True)
-            chunk = pd.concat([chunk, ua_df], axis=1)
-
-            # Konum sütunlarını ekle
-            chunk["lat"] = None
-            chunk["lon"] = None
-            chunk["city"] = None
-            chunk["country"] = None
-
-            ip_file = "ip_konumlari_agent.csv"
-            if os.path.exists(ip_file):
-                ip_df = pd.read_csv(ip_file)
-                if "c-ip" in chunk.columns and "ip" in ip_df.columns:
-                    non_bot_mask = chunk["is_bot"] == 0
-                    df_chunk = chunk[non_bot_mask].copy()
-                    ip_filtered = ip_df[ip_df["ip"].isin(df_chunk["c-ip"])]
-                    merged = pd.merge(
-                        df_chunk,
-                        ip_filtered,
-                        left_on="c-ip",
-                        right_on="ip",
-                        how="left",
-                        suffixes=("", "_ip")
-                    )
-                    for col in ["lat", "lon", "city", "country"]:
-                        if col + "_ip" in merged.columns:
-                            chunk.loc[merged.index, col] = merged[col + "_ip"].values
-                else:
-                    print("'c-ip' veya 'ip' sütunu eksik.")
+        sureler = {}
+        pipeline_start = time.perf_counter()
+        # Tablonun zamana göre sıralı olduğu bilgisi; eskiden küçük zamanlı satır eklenirse bozulur
+        previous_max_datetime = max_datetime if total_written else ""
+
+        # 1) Zenginleştirilen chunk'lar zamana göre sıralı koşular halinde diske yazılır
+        ilerleme.asama_basladi("okuma")
+        if not reading_done:
+            # IP konum indeksi çalışma başına bir kez yüklenir
+            ip_index = indeks_yukle(IP_KONUM_DOSYASI)
+            if ip_index is None:
+                print(f"{IP_KONUM_DOSYASI} bulunamadı.")
+
+            read_args = (input_path, max_rowid, after_datetime, chunk_size)
+            if multiprocessing.cpu_count() > 2:
+                chunks = surecte_oku(read_args, sureler)
             else:
-                print("ip_konumlari_agent.csv bulunamadı.")
+                # Az çekirdekte ayrı süreç paralellik getirmez, sadece taşıma maliyeti ekler
+                chunks = arka_planda(read_source_chunks(*read_args), "okuma", sureler)
+            enriched = arka_planda(asama(
+                chunks, lambda chunk: enrich_chunk(chunk, executor, max_workers, ip_index), "zenginlestirme", sureler
+            ), "zenginlestirme")
+            for chunk in enriched:
+                spill_start = time.perf_counter()
+                max_rowid = max(max_rowid, int(chunk["_kaynak_rowid"].max()))
+                if sorter.ekle(chunk.drop(columns=["_kaynak_rowid"])):
+                    kosulari_kaydet(okuma_tamam=False)
+                sureler["siralama"] = sureler.get("siralama", 0.0) + time.perf_counter() - spill_start
+                ilerleme.ilerleme("okuma", sorter.satir_sayisi, sureler)
+            if sorter.kosu_sayisi():
+                # Kalan satırlar da diske yazılır ki birleştirme kesilirse okuma tekrarlanmasın.
+                # Hiç koşu yazılmadıysa (küçük kaynak) sıralama bellekte yapılır.
+                sorter.bosalt()
+                kosulari_kaydet(okuma_tamam=True)
+        if sorter.satir_sayisi:
+            print(f"{sorter.satir_sayisi} satır zamana göre sıralanıyor ({sorter.kosu_sayisi()} koşu diske yazıldı)...")
+
+        # 2) Koşular birleştirilir; bu döngü tek yazıcıdır ve satırları zaman sırasıyla yazar.
+        # Kaynak su seviyesi (kaynak_rowid) ancak bütün koşular yazılınca ilerler.
+        ilerleme.asama_basladi("yazma", toplam=sorter.satir_sayisi)
+        sqlite_boundary = pd.Timestamp(merge_boundary) if merge_boundary else None
+        parquet_boundary = pd.Timestamp(parquet_siniri) if parquet_siniri else None
+        # Parquet sınırı hiçbir zaman SQLite sınırının ilerisinde değildir
+        boundary = sqlite_boundary if parquet_writer is None else parquet_boundary
+        for chunk in arka_planda(sorter.birlestir(chunk_size), "birlestirme", sureler):
+            if boundary is not None:
+                # Kesilen çalışmada bu zamana kadarki bütün satırlar zaten yazılmış
+                chunk = chunk[chunk["datetime"] > boundary].reset_index(drop=True)
+                if chunk.empty:
+                    continue
+            write_start = time.perf_counter()
+
+            if parquet_writer is not None:
+                # Parquet yazıcısı tampon dolunca (tampon_satir) her tarih için tek dosya
+                # yazar. Dosyalar işlemden önce yazılır; işlem kaydedilmeden kesilirse devam
+                # ederken parquet_dosya_no ve sonrası silinir, parquet_siniri'nden sonrası
+                # yeniden yazılır.
+                parquet_chunk = chunk
+                if parquet_boundary is not None:
+                    parquet_chunk = chunk[chunk["datetime"] > parquet_boundary]
+                if not parquet_chunk.empty:
+                    parquet_writer.ekle(parquet_chunk.drop(columns=["datetime"]))
+                if parquet_writer.tampon_boyu == 0:
+                    parquet_siniri = chunk["datetime"].iloc[-1].strftime("%Y-%m-%d %H:%M:%S")
 
+            if sqlite_boundary is not None:
+                # Parquet için geri sarıldıysa SQLite'a yazılmış satırlar atlanır
+                chunk = chunk[chunk["datetime"] > sqlite_boundary].reset_index(drop=True)
+                if chunk.empty:
+                    if parquet_writer is not None:
+                        with out_engine.begin() as out_conn:
+                            meta_yaz(out_conn, parquet_dosya_no=parquet_writer.dosya_no, parquet_siniri=parquet_siniri)
+                    continue
+            first_datetime = chunk["datetime"].iloc[0].strftime("%Y-%m-%d %H:%M:%S")
+            last_datetime = chunk["datetime"].iloc[-1].strftime("%Y-%m-%d %H:%M:%S")
+            if new_rows == 0 and not merge_boundary and first_datetime < previous_max_datetime:
+                zaman_sirali = "0"
+            max_datetime = max(max_datetime, last_datetime)
             chunk = chunk.drop(columns=["datetime"])
 
-            chunk.to_sql("logs", con=out_engine, index=False, if_exists="append", chunksize=10_000)
+            # Chunk, özet tabloları ve yeni zaman sınırı aynı işlemde yazılır
+            with out_engine.begin() as out_conn:
+                if write_sqlite:
+                    encoded = encoder.kodla(out_conn, chunk)
+                    add_missing_columns(out_conn, encoded, table=KODLU_TABLO)
+                    toplu_yaz(out_conn, KODLU_TABLO, encoded)
+                ozetleri_guncelle(out_conn, chunk)
+                total_written += len(chunk)
+                meta_yaz(
+                    out_conn,
+                    max_datetime=max_datetime,
+                    satir_sayisi=total_written,
+                    zaman_sirali=zaman_sirali,
+                    birlestirme_siniri=last_datetime,
+                    parquet_dosya_no=parquet_writer.dosya_no if parquet_writer else 0,
+                    parquet_siniri=parquet_siniri,
+                )
+            new_rows += len(chunk)
+            sureler["yazma"] = sureler.get("yazma", 0.0) + time.perf_counter() - write_start
             print(f"Chunk yazıldı ({len(chunk)} satır)")
+            ilerleme.ilerleme("yazma", new_rows, sureler)
 
-        # Bağlantı kapat
+        if parquet_writer is not None:
+            parquet_writer.kapat()
+        print(
+            "Aşama süreleri: " + ", ".join(f"{ad} {sure:.1f} sn" for ad, sure in sureler.items())
+            + f" | toplam {time.perf_counter() - pipeline_start:.1f} sn"
+        )
+
+        # Görünüm, indeksler ve bitiş bilgisi tek işlemde: bu işlemden önce kesilen
+        # bir çalışma devam ederken indeksler yeniden kurulur
+        with out_engine.begin() as out_conn:
+            if new_rows == 0 and not resuming:
+                print("Yeni satır bulunamadı, duzenli_data.db güncel.")
+            elif write_sqlite:
+                ilerleme.olay("asama", ad="indeksler")
+                index_start = time.perf_counter()
+                # Yeni kolon eklenmiş olabileceği için görünüm her seferinde yeniden kurulur
+                logs_gorunumu_olustur(out_conn)
+                create_indexes(out_conn)
+                sureler["indeksler"] = time.perf_counter() - index_start
+            meta_yaz(
+                out_conn,
+                sema_surumu=SEMA_SURUMU,
+                kaynak_parmak_izi=fingerprint,
+                kaynak_rowid=max_rowid,
+                max_datetime=max_datetime,
+                satir_sayisi=total_written,
+                zaman_sirali=zaman_sirali,
+            )
+            meta_sil(out_conn, DEVAM_ANAHTARLARI + ("birlestirme_yarim",))
+
+        # WAL dosyasını ana dosyaya aktar, bağlantı kapat
+        with out_engine.connect() as out_conn:
+            out_conn.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
         out_engine.dispose()
-        engine.dispose()
-        print(f"Yeni dosya tamamlandı: {output_path}")
+        sorter.kapat()
+        if work_path != output_path:
+            yerine_koy(work_path, output_path, parquet_work, parquet_path)
+        print(f"Yeni dosya tamamlandı: {output_path} (+{new_rows} satır, toplam {total_written})")
+        ilerleme.olay(
+            "bitti", basarili=True, satir=new_rows, toplam_satir=total_written,
+            sureler={ad: round(sure, 2) for ad, sure in sureler.items()},
+        )
+        return True
 
     except Exception as e:
         print(f"Hata oluştu: {e}")
+        ilerleme.olay("bitti", basarili=False, hata=str(e))
+        return False
+    finally:
+        executor.shutdown()
 
 if __name__ == "__main__":
-    all_db_files = [f for f in os.listdir(".") if f.endswith(".db") and f != "duzenli_data.db"]
+    parser = argparse.ArgumentParser(description="data.db veya ham W3C log dosyasını düzenleyip duzenli_data.db oluşturur.")
+    parser.add_argument("kaynak", nargs="?", help="İşlenecek .db / .log / .log.gz dosyası (verilmezse klasördeki en yeni)")
+    parser.add_argument("--tam", action="store_true", help="Artımlı mod yerine duzenli_data.db'yi baştan oluştur")
+    parser.add_argument("--isci", type=int, default=None, help="UA çözümlemesi için işlemci sayısı")
+    parser.add_argument("--cikti", choices=CIKTI_BICIMLERI, default=None,
+                        help="sqlite, parquet veya ikisi (varsayılan: pyarrow kuruluysa ikisi)")
+    parser.add_argument("--olaylar", action="store_true",
+                        help="İlerleme olaylarını stdout'a JSON satırları olarak yaz (diğer çıktılar stderr'e gider)")
+    parser.add_argument("--sil", action="store_true",
+                        help="Başarıyla bitince klasördeki ara .db dosyalarını sil (kaynak verildiyse hiçbir şey silinmez)")
+    args = parser.parse_args()
+
+    ilerleme = None
+    if args.olaylar:
+        # Olay kanalı asıl stdout'un kopyasıdır; fd 1 stderr'e yönlendirilir ki
+        # alt süreçler dahil bütün print çıktıları olay satırlarına karışmasın
+        sys.stdout.flush()
+        event_channel = os.fdopen(os.dup(1), "w", encoding="utf-8", buffering=1)
+        os.dup2(2, 1)
+        sys.stdout = sys.stderr
+        ilerleme = IlerlemeBildirici(event_channel)
+
+    all_db_files = [
+        f for f in os.listdir(".")
+        if (f.endswith(".db") or is_log_file(f)) and f != OUTPUT_PATH
+    ]
 
-    if all_db_files:
-        latest_db = max(all_db_files, key=os.path.getctime)
-        process_db(latest_db)
+    if args.kaynak or all_db_files:
+        latest_db = args.kaynak or max(all_db_files, key=os.path.getctime)
+        basarili = process_db(
+            latest_db, max_workers=args.isci, incremental=not args.tam, cikti=args.cikti, ilerleme=ilerleme
+        )
+        if not basarili:
+            # Kaynaklar silinmez; tekrar çalıştırınca kaldığı yerden devam edilir
+            print("İşlem tamamlanamadı, kaynak dosyalar silinmedi.")
+            sys.exit(1)
 
-        # Eski db dosyalarını sil
-        for f in all_db_files:
+        # İstenirse klasördeki ara .db dosyaları silinir. Ham .log/.log.gz dosyaları
+        # asıl kaynaktır, artımlı mod da onları tekrar okuyabilir: hiç silinmez.
+        # Kaynak açıkça verildiyse (klasör dışında olabilir) hiçbir dosyaya dokunulmaz.
+        silinecekler = [f for f in all_db_files if f.endswith(".db")] if args.sil and not args.kaynak else []
+        for f in silinecekler:
             try:
                 os.remove(f)
                 print(f"Silindi: {f}")
             except Exception as e:
                 print(f"Silinemedi: {f}, {e}")
     else:
-        print("İşlenecek .db dosyası bulunamadı.")
+        print("İşlenecek .db veya .log dosyası bulunamadı.")
@@ -0,0 +1,167 @@
+import os
+import shutil
+import tempfile
+import pandas as pd
+
+# === Dış birleştirmeli sıralama (external merge sort) ===
+# Chunk'lar bellekte KOSU_SATIR satıra kadar biriktirilip sıralanır ve diske
+# BLOK_SATIR'lık bloklar halinde yazılır (sıralı koşular). Birleştirmede her
+# koşudan sadece bir blok bellekte tutulur; böylece bellek kullanımı toplam
+# satır sayısından bağımsızdır.
+#
+# kosu_klasoru verilirse koşular o sabit klasöre yazılır; durum() ile alınan
+# liste kaydedilip kesilen bir çalışmada geri_yukle() ile devam edilebilir.
+KOSU_SATIR = 500_000
+BLOK_SATIR = 10_000
+
+
+class DisSiralayici:
+    def __init__(self, anahtar, klasor=None, kosu_satir=KOSU_SATIR, blok_satir=BLOK_SATIR, kosu_klasoru=None):
+        self.anahtar = anahtar
+        if kosu_klasoru:
+            os.makedirs(kosu_klasoru, exist_ok=True)
+            self.klasor = kosu_klasoru
+        else:
+            self.klasor = tempfile.mkdtemp(prefix="siralama_", dir=klasor)
+        self.kosu_satir = kosu_satir
+        self.blok_satir = blok_satir
+        self.tampon = []
+        self.tampon_boyu = 0
+        self.kosular = []  # her koşu: (blok dosyaları, en küçük anahtar, en büyük anahtar, satır sayısı)
+        self.satir_sayisi = 0
+
+    def ekle(self, chunk):
+        # Tampon dolup yeni bir koşu diske yazıldıysa True döner
+        if chunk.empty:
+            return False
+        self.tampon.append(chunk)
+        self.tampon_boyu += len(chunk)
+        self.satir_sayisi += len(chunk)
+        if self.tampon_boyu >= self.kosu_satir:
+            self.bosalt()
+            return True
+        return False
+
+    def _sirali_tampon(self):
+        run = pd.concat(self.tampon, ignore_index=True)
+        self.tampon, self.tampon_boyu = [], 0
+        return run.sort_values(self.anahtar, kind="stable", ignore_index=True)
+
+    def bosalt(self):
+        # Tampondaki satırları (az da olsa) yeni bir koşu olarak diske yazar
+        if not self.tampon:
+            return
+        run = self._sirali_tampon()
+        run_no = len(self.kosular)
+        blocks = []
+        for start in range(0, len(run), self.blok_satir):
+            path = os.path.join(self.klasor, f"kosu{run_no:05d}_{len(blocks):05d}.pkl")
+            run.iloc[start:start + self.blok_satir].to_pickle(path)
+            blocks.append(path)
+        self.kosular.append((blocks, run[self.anahtar].iloc[0], run[self.anahtar].iloc[-1], len(run)))
+
+    def kosu_sayisi(self):
+        return len(self.kosular)
+
+    def durum(self):
+        # Diske yazılmış koşular; JSON'a çevrilebilir
+        return [
+            {"bloklar": [os.path.basename(path) for path in blocks], "satir": rows}
+            for blocks, _, _, rows in self.kosular
+        ]
+
+    def geri_yukle(self, durum):
+        # Kaydedilmiş koşuları yükler, listede olmayan (yarım yazılmış) dosyaları siler.
+        # Bir blok bile eksikse hiçbir koşu yüklenmez ve False döner.
+        runs = []
+        for run in durum:
+            blocks = [os.path.join(self.klasor, name) for name in run["bloklar"]]
+            if not blocks or not all(os.path.exists(path) for path in blocks):
+                runs = None
+                break
+            first = pd.read_pickle(blocks[0])[self.anahtar].iloc[0]
+            last = pd.read_pickle(blocks[-1])[self.anahtar].iloc[-1]
+            runs.append((blocks, first, last, run["satir"]))
+
+        keep = {path for blocks, _, _, _ in runs or [] for path in blocks}
+        for name in os.listdir(self.klasor):
+            path = os.path.join(self.klasor, name)
+            if path not in keep:
+                os.remove(path)
+        if runs is None:
+            return False
+        self.kosular = runs
+        self.satir_sayisi = sum(rows for _, _, _, rows in runs)
+        return True
+
+    def birlestir(self, cikti_satir=100_000):
+        # Anahtara göre sıralı chunk'lar üretir. Chunk sınırları hep farklı iki
+        # anahtar arasına düşer: bir chunk yazıldıysa o anahtara kadarki her satır yazılmıştır.
+        if self.kosular:
+            self.bosalt()
+            parts = self._parcalar()
+        elif self.tampon:
+            # Hepsi tek koşuya sığdı: diske yazmadan bellekte sıralanır
+            run = self._sirali_tampon()
+            parts = (run.iloc[start:start + self.blok_satir] for start in range(0, len(run), self.blok_satir))
+        else:
+            return
+        pending = []
+        pending_rows = 0
+        for part in parts:
+            pending.append(part)
+            pending_rows += len(part)
+            if pending_rows >= cikti_satir:
+                merged = pd.concat(pending, ignore_index=True)
+                keys = merged[self.anahtar]
+                # Son anahtarla aynı satırlar sonraki chunk'a bırakılır
+                cut = int(keys.searchsorted(keys.iloc[-1], side="left"))
+                if cut == 0:
+                    pending, pending_rows = [merged], len(merged)
+                    continue
+                yield merged.iloc[:cut].reset_index(drop=True)
+                rest = merged.iloc[cut:]
+                pending, pending_rows = [rest], len(rest)
+        if pending_rows:
+            yield pd.concat(pending, ignore_index=True)
+
+    def _parcalar(self):
+        # Koşular birbiriyle çakışmıyorsa (kaynak zaten sıralıysa) bloklar sırayla okunur
+        ordered = all(
+            self.kosular[i][2] <= self.kosular[i + 1][1] for i in range(len(self.kosular) - 1)
+        )
+        if ordered:
+            for blocks, _, _, _ in self.kosular:
+                for path in blocks:
+                    yield pd.read_pickle(path)
+            return
+
+        # Her koşunun o anki bloğu bellekte; tüm blokların son anahtarlarının en
+        # küçüğüne (ufuk) kadar olan satırlar güvenle yazılabilir
+        iterators = {}
+        buffers = {}
+        for run_no, (blocks, _, _, _) in enumerate(self.kosular):
+            iterators[run_no] = iter(blocks)
+            buffers[run_no] = pd.read_pickle(next(iterators[run_no]))
+
+        while buffers:
+            horizon = min(buf[self.anahtar].iloc[-1] for buf in buffers.values())
+            parts = []
+            for run_no in sorted(buffers):
+                buf = buffers[run_no]
+                cut = int(buf[self.anahtar].searchsorted(horizon, side="right"))
+                if cut:
+                    parts.append(buf.iloc[:cut])
+                if cut < len(buf):
+                    buffers[run_no] = buf.iloc[cut:]
+                    continue
+                next_block = next(iterators[run_no], None)
+                if next_block is None:
+                    del buffers[run_no]
+                else:
+                    buffers[run_no] = pd.read_pickle(next_block)
+            if parts:
+                yield pd.concat(parts, ignore_index=True).sort_values(self.anahtar, kind="stable", ignore_index=True)
+
+    def kapat(self):
+        shutil.rmtree(self.klasor, ignore_errors=True)
@@ -0,0 +1,35 @@
+import os
+import importlib
+
+# === Grafik listesi ===
+# Kivy başlatıcısı, Dash sunucusu ve araçlar (ithalat_profili.py,
+# toplu_rapor.py) aynı listeyi kullanır. Her grafik modülü import edildiğinde
+# hiçbir iş yapmaz; veri()
+# analizi hesaplar (önbellekli), ciz(sonuc) matplotlib figürünü döndürür.
+# Dash sayfaları ise ciz yerine layout() ve kaydet(app), statik rapor
+# (toplu_rapor.py) için de Plotly figürleri döndüren figurler(sonuc) tanımlar.
+GRAFIKLER = [
+    ("bot_giris_grafigi.py", "Bot Giriş Grafiği"),
+    ("browser_karsılastırma_tablosu.py", "Tarayıcı Karşılaştırma Tablosu"),
+    ("browser_kullanim_grafigi.py", "Tarayıcı Kullanım Grafiği"),
+    ("cohort_analiz_grafigi.py", "Cohort Analiz Grafiği"),
+    ("girilen_sayfa_grafigi.py", "Girilen Sayfa Grafiği"),
+    ("hata_veren_sayfalar_istatistigi.py", "Hata Veren Sayfa İstatistiği"),
+    ("ip_konum_karsilastirma_tablosu.py", "IP Konum Karşılaştırması"),
+    ("ip_world_location_haritage.py", "Dünya IP Konum Haritası"),
+    ("kullanici_geri_donus_istatistigi.py", "Kullanıcı Geri Dönüş İstatistiği"),
+    ("os_mobile_pc_istatistigi.py", "Mobil / PC İşletim Sistemi"),
+    ("referer_istatistigi.py", "Referer İstatistiği"),
+    ("saat_tarih_ip_grafik.py", "Saat-Tarih-IP Grafiği"),
+    ("sayfa_sonrası_ziyaret_grafigi.py", "Sayfa Sonrası Ziyaret"),
+    ("status_code_grafigi.py", "HTTP Durum Kodları"),
+    ("trafik_yogunluk_grafigi.py", "Trafik Yoğunluğu Grafiği"),
+]
+
+
+def modul_adi(filename):
+    return os.path.splitext(os.path.basename(filename))[0]
+
+
+def modul_yukle(filename):
+    return importlib.import_module(modul_adi(filename))
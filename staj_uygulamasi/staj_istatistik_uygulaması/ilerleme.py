@@ -0,0 +1,80 @@
+import json
+import time
+
+# === Ingest ilerleme olayları ===
+# data_siralama.py --olaylar ile çalışınca her satırı bir JSON nesnesi olan
+# olaylar stdout'a yazılır (insan için mesajlar stderr'e gider). kivy_app.py
+# bu satırları ayrı bir iş parçacığında okuyup ilerleme çubuğunu günceller.
+#
+#   {"olay": "basladi", "kaynak": ..., "toplam_satir": ...}
+#   {"olay": "ilerleme", "asama": "okuma"|"yazma", "islenen": ..., "toplam": ...,
+#    "oran": 0..1, "satir_per_sn": ..., "kalan_sn": ..., "sureler": {...}}
+#   {"olay": "asama", "ad": "indeksler"}
+#   {"olay": "bitti", "basarili": true|false, ...}
+#
+# Satırlar önce okunup sıralanır, sonra yazılır; toplam ilerleme bu iki aşamanın ortalamasıdır.
+ASAMALAR = ("okuma", "yazma")
+
+
+class IlerlemeBildirici:
+    def __init__(self, kanal=None, aralik=0.25):
+        self.kanal = kanal
+        self.aralik = aralik
+        self.baslangic = time.perf_counter()
+        self.son_gonderim = 0.0
+        self.toplam = None
+        self.asama_baslangici = {}
+
+    def olay(self, tur, **alanlar):
+        if self.kanal is None:
+            return
+        event = {"olay": tur, "gecen_sn": round(time.perf_counter() - self.baslangic, 2)}
+        event.update(alanlar)
+        self.kanal.write(json.dumps(event, ensure_ascii=False) + "\n")
+        self.kanal.flush()
+
+    def basladi(self, kaynak, toplam):
+        self.toplam = toplam
+        self.olay("basladi", kaynak=kaynak, toplam_satir=toplam)
+
+    def asama_basladi(self, asama, toplam=None):
+        self.asama_baslangici[asama] = time.perf_counter()
+        if toplam is not None:
+            self.toplam = toplam
+
+    def ilerleme(self, asama, islenen, sureler, zorla=False):
+        now = time.perf_counter()
+        if not zorla and now - self.son_gonderim < self.aralik:
+            return
+        self.son_gonderim = now
+        phase_start = self.asama_baslangici.setdefault(asama, now)
+        rate = islenen / (now - phase_start) if now > phase_start else None
+
+        oran = kalan = None
+        if self.toplam:
+            # Tahmini toplam aşılabilir (log dosyaları); bitiş olayı gelene kadar %100 gösterilmez
+            phase_ratio = min(islenen / self.toplam, 0.99)
+            oran = (ASAMALAR.index(asama) + phase_ratio) / len(ASAMALAR)
+            elapsed = now - self.baslangic
+            kalan = round(elapsed * (1 - oran) / oran, 1) if oran > 0 else None
+        self.olay(
+            "ilerleme",
+            asama=asama,
+            islenen=int(islenen),
+            toplam=self.toplam,
+            oran=None if oran is None else round(oran, 4),
+            satir_per_sn=None if rate is None else round(rate),
+            kalan_sn=kalan,
+            sureler={ad: round(sure, 2) for ad, sure in dict(sureler).items()},
+        )
+
+
+def olay_coz(satir):
+    # Olay olmayan satırlar için None döner
+    satir = satir.strip()
+    if not satir.startswith("{"):
+        return None
+    try:
+        return json.loads(satir)
+    except ValueError:
+        return None
@@ -0,0 +1,86 @@
+import os
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+
+IP_KONUM_DOSYASI = "ip_konumlari_agent.csv"
+KONUM_KOLONLARI = ["lat", "lon", "city", "country"]
+
+_IPV4_DESENI = r"^(\d{1,3})\.(\d{1,3})\.(\d{1,3})\.(\d{1,3})$"
+
+# === IPv4 -> tam sayı (vektörel) ===
+def ipv4_to_int(ips):
+    ips = pd.Series(ips, dtype="object").astype(str).str.strip()
+    octets = ips.str.extract(_IPV4_DESENI).astype(float)
+    valid = octets.notna().all(axis=1) & (octets <= 255).all(axis=1)
+    values = octets.fillna(0).to_numpy(dtype=np.int64)
+    result = (values[:, 0] << 24) | (values[:, 1] << 16) | (values[:, 2] << 8) | values[:, 3]
+    # Geçersiz / IPv6 adresler -1 olur ve hiçbir kayıtla eşleşmez
+    return np.where(valid.to_numpy(), result, -1)
+
+
+class IpKonumIndeksi:
+    def __init__(self, ip_df):
+        keys = ipv4_to_int(ip_df["ip"])
+        ip_df = ip_df.assign(_key=keys)
+        ip_df = ip_df[ip_df["_key"] >= 0].drop_duplicates("_key").sort_values("_key")
+
+        # Sıralı anahtar dizisi + sıkıştırılmış kolonlar
+        self.keys = ip_df["_key"].to_numpy(dtype=np.int64)
+        self.lat = ip_df["lat"].to_numpy(dtype=np.float64)
+        self.lon = ip_df["lon"].to_numpy(dtype=np.float64)
+        self.city = pd.Categorical(ip_df["city"])
+        self.country = pd.Categorical(ip_df["country"])
+
+    @classmethod
+    def csv_oku(cls, path=IP_KONUM_DOSYASI):
+        ip_df = pd.read_csv(path, dtype={"ip": str, "city": str, "country": str}, keep_default_na=False)
+        return cls(ip_df)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def bul(self, ips):
+        ips = pd.Series(ips)
+        # Chunk içinde tekrar eden IP'ler bir kez aranır
+        codes, uniques = pd.factorize(ips)
+        unique_keys = ipv4_to_int(uniques)
+
+        unique_pos = np.full(len(uniques), -1, dtype=np.int64)
+        if len(self.keys):
+            pos = np.minimum(np.searchsorted(self.keys, unique_keys), len(self.keys) - 1)
+            found = self.keys[pos] == unique_keys
+            unique_pos[found] = pos[found]
+
+        # Her satır için eşleşen kaydın konumu (eşleşme yoksa veya IP boşsa -1)
+        row_pos = np.where(codes >= 0, unique_pos[codes], -1)
+        matched = row_pos >= 0
+        safe_pos = np.where(matched, row_pos, 0)
+
+        def take(values, fill):
+            if not len(values):
+                return np.full(len(row_pos), fill)
+            return np.where(matched, values[safe_pos], fill)
+
+        return pd.DataFrame({
+            "lat": take(self.lat, np.nan),
+            "lon": take(self.lon, np.nan),
+            "city": pd.Categorical.from_codes(take(self.city.codes, -1), self.city.categories),
+            "country": pd.Categorical.from_codes(take(self.country.codes, -1), self.country.categories),
+        }, index=ips.index)
+
+
+def indeks_yukle(path=IP_KONUM_DOSYASI):
+    # Dosya değişmedikçe aynı indeks döner; CSV güncellenince (boyut veya
+    # değişiklik zamanı farklıysa) uzun ömürlü süreçlerde de yeniden okunur
+    path = os.path.abspath(path)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return _indeks_oku(path, (st.st_size, st.st_mtime_ns))
+
+
+@lru_cache(maxsize=4)
+def _indeks_oku(path, _iz):
+    return IpKonumIndeksi.csv_oku(path)
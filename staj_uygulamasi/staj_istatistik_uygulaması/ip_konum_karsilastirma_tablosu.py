@@ -1,23 +1,26 @@
+import sys
 import pandas as pd
-from sqlalchemy import create_engine, MetaData, Table, select
-from dash import Dash, dcc, html, Input, Output, dash_table
 import concurrent.futures
-import threading
-import requests
-import webbrowser
-import os
-import signal
-import pycountry
+from ip_konum import indeks_yukle, IP_KONUM_DOSYASI
+from veri_erisim import oku, ozet
+from tablo_figur import karsilastirma_tablosu
+from sonuc_onbellek import bellekte, dosya_izi
+
+BASLIK = "IP Konum Karşılaştırması"
+
+# Karşılaştırılan dönemler: ilk ve son karsilastirma_gunu gün (analiz.py --gun)
+karsilastirma_gunu = 15
 
 # === Ülke kodunu tam isme çevir (önbellekli) ===
 _country_cache = {}
 def get_country_name(code):
-    if not code:
+    if not isinstance(code, str) or not code:
         return "Bilinmiyor"
     code = code.upper()
     if code in _country_cache:
         return _country_cache[code]
     try:
+        import pycountry
         country = pycountry.countries.get(alpha_2=code)
         name = country.name if country else code
     except:
@@ -25,118 +28,113 @@ def get_country_name(code):
     _country_cache[code] = name
     return name
 
-# === DB bağlantısı ===
-engine = create_engine("sqlite:///duzenli_data.db")
-metadata = MetaData()
-metadata.reflect(bind=engine)
-logs_table = Table("logs", metadata, autoload_with=engine)
-
-# === logs tablosundan gerekli verileri çek ===
-with engine.connect() as conn:
-    stmt = select(
-        logs_table.c["date"],
-        logs_table.c["c-ip"],
-        logs_table.c["country"],
-        logs_table.c["city"],
-        logs_table.c["lat"],
-        logs_table.c["lon"]
-    )
-    df = pd.read_sql(stmt, conn)
-
-# === Tarih düzenle ===
-df["date"] = pd.to_datetime(df["date"], errors="coerce")
-df = df.dropna(subset=["date"])
-df = df.sort_values("date").reset_index(drop=True)
-
-# === Ülke kodlarını ülke ismine çevir (paralel) ===
-with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
-    df["country_full"] = list(executor.map(get_country_name, df["country"]))
-
-# === İlk ve son 15 gün ===
-unique_dates = df["date"].dt.date.unique()
-first_15 = unique_dates[:15]
-last_15 = unique_dates[-15:]
-
-df_first = df[df["date"].dt.date.isin(first_15)]
-df_last = df[df["date"].dt.date.isin(last_15)]
-
-# === Ülke bazlı sayımlar ===
-first_counts = df_first["country_full"].value_counts()
-last_counts = df_last["country_full"].value_counts()
-all_countries = sorted(set(first_counts.index).union(last_counts.index))
-
-rows = []
-for country in all_countries:
-    c1 = first_counts.get(country, 0)
-    c2 = last_counts.get(country, 0)
-    if c1 == 0:
-        change_str = "N/A"
+def ulke_karsilastirmasi():
+    df = ozet("ozet_ulke")
+    if df is not None:
+        # Günlük ülke özeti: her satır (tarih, ülke) için istek sayısı
+        df = df.rename(columns={"hits": "adet"})[["date", "country", "adet"]]
     else:
-        change = ((c2 - c1) / c1) * 100
-        change_str = f"{change:+.2f}%"
-    rows.append({
-        "Ülke": country,
-        "İlk 15 Gün Ziyaretçi": c1,
-        "Son 15 Gün Ziyaretçi": c2,
-        "Yüzde Artış(%)": change_str
-    })
-
-df_result = pd.DataFrame(rows)
-
-# === Dash Arayüzü ===
-app = Dash(__name__)
-app.title = "Ülke Bazlı Ziyaretçi Karşılaştırması"
-
-app.layout = html.Div([
-    html.H2("🌍 Ülke Bazlı Ziyaretçi Karşılaştırması (İnteraktif)", style={"textAlign": "center"}),
-
-    dash_table.DataTable(
-        id='country-table',
-        columns=[
-            {"name": col, "id": col, "type": "text" if col in ["Ülke", "Yüzde Artış(%)"] else "numeric"}
-            for col in df_result.columns
-        ],
-        data=df_result.to_dict("records"),
-        style_table={'height': '600px', 'overflowY': 'auto'},
-        fixed_rows={'headers': True},
-        style_cell={'textAlign': 'center', 'fontFamily': 'Arial', 'padding': '8px', 'minWidth': '120px'},
-        style_header={'backgroundColor': '#f4f4f4', 'fontWeight': 'bold'},
-        style_data_conditional=[
-            {
-                'if': {'column_id': 'Yüzde Artış(%)', 'filter_query': '{Yüzde Artış(%)} contains "-"'},
-                'backgroundColor': '#f2dede', 'color': '#a10000', 'fontWeight': 'bold'
-            },
-            {
-                'if': {'column_id': 'Yüzde Artış(%)', 'filter_query': '{Yüzde Artış(%)} contains "+"'},
-                'backgroundColor': '#dff0d8', 'color': '#006400', 'fontWeight': 'bold'
-            }
-        ],
-        sort_action="native",
-        filter_action="native",
-        page_action='none'
-    ),
-
-    html.Button('Sayfayı Durdur', id='shutdown-btn', style={'margin': '20px'}),
-    html.Div(id='shutdown-message', style={"color": "red", "fontWeight": "bold"})
-])
-
-# === Dash uygulamasını durdurma ===
-@app.callback(
-    Output('shutdown-message', 'children'),
-    Input('shutdown-btn', 'n_clicks'),
-    prevent_initial_call=True
-)
-def shutdown_app(n_clicks):
-    if n_clicks:
-        threading.Thread(target=lambda: requests.post("http://127.0.0.1:9050/shutdown")).start()
-        return "Uygulama durduruluyor..."
-
-@app.server.route('/shutdown', methods=['POST'])
-def shutdown():
-    os.kill(os.getpid(), signal.SIGINT)
-    return "Sunucu kapatılıyor..."
+        # === logs tablosundan gerekli verileri çek ===
+        df = oku(["date", "c-ip", "country", "city", "lat", "lon", "is_bot"])
+
+        # === Ülkesi eksik gerçek kullanıcıları ortak IP konum indeksinden tamamla ===
+        ip_index = indeks_yukle()
+        if ip_index is not None:
+            eksik = df["country"].isna() & (df["is_bot"] == 0)
+            if eksik.any():
+                konum = ip_index.bul(df.loc[eksik, "c-ip"])
+                df.loc[eksik, "country"] = konum["country"].astype(object)
+                df.loc[eksik, "city"] = konum["city"].astype(object)
+        df["adet"] = 1
+
+    # === Tarih düzenle ===
+    df["date"] = pd.to_datetime(df["date"], errors="coerce")
+    df = df.dropna(subset=["date"])
+    df = df.sort_values("date").reset_index(drop=True)
+
+    # === Ülke kodlarını ülke ismine çevir (paralel) ===
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        df["country_full"] = list(executor.map(get_country_name, df["country"]))
+
+    # === İlk ve son karsilastirma_gunu gün ===
+    unique_dates = df["date"].dt.date.unique()
+    first_days = unique_dates[:karsilastirma_gunu]
+    last_days = unique_dates[-karsilastirma_gunu:]
+
+    df_first = df[df["date"].dt.date.isin(first_days)]
+    df_last = df[df["date"].dt.date.isin(last_days)]
+
+    # === Ülke bazlı sayımlar ===
+    first_counts = df_first.groupby("country_full")["adet"].sum()
+    last_counts = df_last.groupby("country_full")["adet"].sum()
+    all_countries = sorted(set(first_counts.index).union(last_counts.index))
+
+    rows = []
+    for country in all_countries:
+        c1 = first_counts.get(country, 0)
+        c2 = last_counts.get(country, 0)
+        if c1 == 0:
+            change_str = "N/A"
+        else:
+            change = ((c2 - c1) / c1) * 100
+            change_str = f"{change:+.2f}%"
+        rows.append({
+            "Ülke": country,
+            f"İlk {karsilastirma_gunu} Gün Ziyaretçi": c1,
+            f"Son {karsilastirma_gunu} Gün Ziyaretçi": c2,
+            "Yüzde Artış(%)": change_str
+        })
+
+    df_result = pd.DataFrame(rows)
+    return df_result
+
+def veri():
+    return bellekte("ip_konum_karsilastirma", ulke_karsilastirmasi, {"ip_konum": dosya_izi(IP_KONUM_DOSYASI), "gun": karsilastirma_gunu})
+
+# === Dash sayfası ===
+def layout():
+    from dash import html, dash_table
+
+    df_result = veri()
+    return html.Div([
+        html.H2("🌍 Ülke Bazlı Ziyaretçi Karşılaştırması (İnteraktif)", style={"textAlign": "center"}),
+
+        dash_table.DataTable(
+            id='country-table',
+            columns=[
+                {"name": col, "id": col, "type": "text" if col in ["Ülke", "Yüzde Artış(%)"] else "numeric"}
+                for col in df_result.columns
+            ],
+            data=df_result.to_dict("records"),
+            style_table={'height': '600px', 'overflowY': 'auto'},
+            fixed_rows={'headers': True},
+            style_cell={'textAlign': 'center', 'fontFamily': 'Arial', 'padding': '8px', 'minWidth': '120px'},
+            style_header={'backgroundColor': '#f4f4f4', 'fontWeight': 'bold'},
+            style_data_conditional=[
+                {
+                    'if': {'column_id': 'Yüzde Artış(%)', 'filter_query': '{Yüzde Artış(%)} contains "-"'},
+                    'backgroundColor': '#f2dede', 'color': '#a10000', 'fontWeight': 'bold'
+                },
+                {
+                    'if': {'column_id': 'Yüzde Artış(%)', 'filter_query': '{Yüzde Artış(%)} contains "+"'},
+                    'backgroundColor': '#dff0d8', 'color': '#006400', 'fontWeight': 'bold'
+                }
+            ],
+            sort_action="native",
+            filter_action="native",
+            page_action='none'
+        )
+    ])
+
+def figurler(df):
+    # Statik rapor (toplu_rapor.py): DataTable yerine aynı renklendirmeyle Plotly tablosu
+    return [karsilastirma_tablosu(df, "Yüzde Artış(%)", BASLIK)]
+
+def kaydet(app):
+    # Tablo sıralama ve filtrelemeyi tarayıcıda yapar, callback yok
+    pass
 
 # === Uygulama Başlat ===
 if __name__ == "__main__":
-    threading.Timer(1.0, lambda: webbrowser.open("http://127.0.0.1:9050")).start()
-    app.run(debug=False, port=9050)
+    from dash_sunucu import tek_sayfa_calistir
+    tek_sayfa_calistir(sys.modules[__name__], port=9050)
@@ -0,0 +1,231 @@
+import os
+import sys
+import json
+import time
+import runpy
+import argparse
+import threading
+import subprocess
+import multiprocessing
+from ilerleme import olay_coz
+
+# === Sıcak grafik işçileri ===
+# Kivy başlatıcısı her tıklamada yeni bir python yorumlayıcısı açınca
+# pandas/SQLAlchemy/matplotlib importları her seferinde baştan ödeniyordu.
+# Başlatıcı açılırken bu dosya --sunucu ile ayrı bir süreç olarak başlar ve
+# ağır kütüphaneleri bir kez yükleyen bir forkserver hazırlar; her grafik bu
+# süreçten çatallanan (fork) yeni bir süreçte __main__ olarak çalışır. Böylece
+# tıklamadan sonraki süre neredeyse tamamen analizin kendisidir ve birden fazla
+# grafik yan yana açık kalabilir.
+#
+# Başlatıcı komutları stdin'den, bu süreç olayları stdout'tan JSON satırları
+# olarak gönderir (bkz. ilerleme.py):
+#   {"komut": "calistir"|"durdur", "dosya": ...}
+#   {"olay": "hazir", "sicak": true|false}
+#   {"olay": "basladi"|"bitti", "dosya": ..., "kod": ...}
+#
+# forkserver olmayan sistemlerde (Windows) her grafik eskisi gibi ayrı bir
+# python sürecinde açılır.
+ON_YUKLENECEKLER = [
+    "numpy",
+    "pandas",
+    "sqlalchemy",
+    "matplotlib.pyplot",
+    "seaborn",
+    "plotly.express",
+    "plotly.graph_objects",
+    "geopandas",
+    "pycountry",
+    "veri_erisim",
+    "sonuc_onbellek",
+    "parquet_depo",
+    "ip_konum",
+]
+
+
+def _calistir(filename):
+    # Çatallanan süreçte grafik betiği doğrudan çalıştırılmış gibi davranır;
+    # forkserver çocuğunda varsayılan başlatma yöntemi forkserver olur, grafiklerin
+    # kendi işlem havuzları ise platform varsayılanını kullanmalı
+    multiprocessing.set_start_method(None, force=True)
+    sys.argv = [filename]
+    runpy.run_path(filename, run_name="__main__")
+
+
+def _bos():
+    pass
+
+
+class IsciHavuzu:
+    def __init__(self, on_yuklenecekler=ON_YUKLENECEKLER):
+        self.isler = {}
+        self.ctx = None
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            self.ctx = multiprocessing.get_context("forkserver")
+            # Kurulu olmayan modüller (ör. geopandas) forkserver tarafından atlanır
+            self.ctx.set_forkserver_preload(list(on_yuklenecekler))
+
+    @property
+    def sicak(self):
+        return self.ctx is not None
+
+    def isit(self):
+        # Boş bir iş, forkserver'ın ön yüklemeyi bitirmesini bekler
+        if self.ctx is not None:
+            process = self.ctx.Process(target=_bos)
+            process.start()
+            process.join()
+
+    def calistir(self, filename):
+        # Aynı grafik zaten açıksa yeniden başlatılır, diğerleri açık kalır
+        self.durdur(filename)
+        if self.ctx is not None:
+            process = self.ctx.Process(target=_calistir, args=(filename,), name=filename)
+            process.start()
+        else:
+            process = subprocess.Popen([sys.executable, filename])
+        self.isler[filename] = process
+        return process
+
+    def _cikis_kodu(self, process):
+        # Süreç hâlâ çalışıyorsa None döner
+        if isinstance(process, subprocess.Popen):
+            return process.poll()
+        return process.exitcode
+
+    def bitenler(self):
+        done = []
+        for filename, process in list(self.isler.items()):
+            code = self._cikis_kodu(process)
+            if code is not None:
+                del self.isler[filename]
+                done.append((filename, code))
+        return done
+
+    def durdur(self, filename):
+        process = self.isler.pop(filename, None)
+        if process is None or self._cikis_kodu(process) is not None:
+            return
+        try:
+            process.terminate()
+            if isinstance(process, subprocess.Popen):
+                process.wait(timeout=2)
+            else:
+                process.join(timeout=2)
+        except Exception as e:
+            print(f"İşlem sonlandırılamadı: {e}", file=sys.stderr)
+
+
+def sunucu(kanal):
+    havuz = IsciHavuzu()
+    havuz.isit()
+    lock = threading.Lock()
+
+    def olay(tur, **alanlar):
+        with lock:
+            kanal.write(json.dumps(dict(olay=tur, **alanlar), ensure_ascii=False) + "\n")
+            kanal.flush()
+
+    def izle():
+        while True:
+            time.sleep(0.5)
+            with lock:
+                done = havuz.bitenler()
+            for filename, code in done:
+                olay("bitti", dosya=filename, kod=code)
+
+    threading.Thread(target=izle, daemon=True).start()
+    olay("hazir", sicak=havuz.sicak)
+
+    for line in sys.stdin:
+        command = olay_coz(line)
+        if not command:
+            continue
+        filename = command.get("dosya")
+        try:
+            if command.get("komut") == "calistir":
+                with lock:
+                    process = havuz.calistir(filename)
+                olay("basladi", dosya=filename, pid=process.pid)
+            elif command.get("komut") == "durdur":
+                with lock:
+                    havuz.durdur(filename)
+                olay("bitti", dosya=filename, kod=None)
+        except Exception as e:
+            olay("hata", dosya=filename, hata=str(e))
+    # Başlatıcı kapandı; açık grafikler kullanıcı kapatana kadar çalışmaya devam eder
+
+
+class IsciIstemcisi:
+    # Kivy tarafı: işçi sunucusunu başlatır, komut gönderir, olayları geri çağırır
+    def __init__(self, olay_geldi):
+        self.olay_geldi = olay_geldi
+        self.process = None
+
+    def baslat(self):
+        # Grafiklerin çıktıları başlatıcının konsoluna (stderr) gider
+        self.process = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "--sunucu"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            bufsize=1,
+            env=dict(os.environ, PYTHONIOENCODING="utf-8"),
+        )
+        threading.Thread(target=self._oku, daemon=True).start()
+
+    def _oku(self):
+        for line in self.process.stdout:
+            event = olay_coz(line)
+            if event:
+                self.olay_geldi(event)
+
+    def _gonder(self, komut, filename):
+        if self.process is None or self.process.poll() is not None:
+            self.baslat()
+        self.process.stdin.write(json.dumps({"komut": komut, "dosya": filename}, ensure_ascii=False) + "\n")
+        self.process.stdin.flush()
+
+    def calistir(self, filename):
+        self._gonder("calistir", filename)
+
+    def durdur(self, filename):
+        self._gonder("durdur", filename)
+
+    def kapat(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.stdin.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Grafikleri önceden yüklenmiş işçilerden çalıştırır")
+    parser.add_argument("grafikler", nargs="*", help="Ölçüm için yan yana çalıştırılacak grafik dosyaları")
+    parser.add_argument("--sunucu", action="store_true", help="Başlatıcı için komutları stdin'den okur")
+    args = parser.parse_args()
+
+    if args.sunucu:
+        # Olay kanalı asıl stdout'un kopyasıdır; fd 1 stderr'e yönlendirilir ki
+        # grafiklerin print çıktıları olay satırlarına karışmasın
+        sys.stdout.flush()
+        event_channel = os.fdopen(os.dup(1), "w", encoding="utf-8", buffering=1)
+        os.dup2(2, 1)
+        sys.stdout = sys.stderr
+        sunucu(event_channel)
+    else:
+        os.environ.setdefault("MPLBACKEND", "Agg")
+        havuz = IsciHavuzu()
+
+        start = time.perf_counter()
+        havuz.isit()
+        print(f"Isınma: {time.perf_counter() - start:.2f} sn ({'forkserver' if havuz.sicak else 'ayrı süreç'})")
+
+        start = time.perf_counter()
+        processes = [havuz.calistir(filename) for filename in args.grafikler]
+        for filename, process in zip(args.grafikler, processes):
+            if isinstance(process, subprocess.Popen):
+                process.wait()
+            else:
+                process.join()
+            print(f"{filename}: {time.perf_counter() - start:.2f} sn")
@@ -0,0 +1,95 @@
+import os
+import sys
+import argparse
+import subprocess
+from collections import defaultdict
+from grafikler import GRAFIKLER, modul_adi
+
+# === Grafik başına import süresi raporu ===
+# Her grafik ayrı bir python sürecinde `-X importtime` ile açılır ve çıktı
+# üst paket bazında toplanır (ör. matplotlib.* satırlarının kendi süreleri
+# "matplotlib" altında). "import" kipi sadece modülün import maliyetini,
+# "calistir" kipi veri() ve çizimi de (Agg backend, pencere açılmaz) ölçer;
+# böylece fonksiyon içinde geç yüklenen kütüphaneler de rapora girer.
+BASLANGIC_ISARETI = "# ithalat_profili basladi"
+KIPLER = ("import", "calistir")
+
+
+def _olc(modul, kip):
+    # Alt süreçte çalışır; işaretten önceki importlar (bu dosyanınkiler) sayılmaz
+    import importlib
+    print(BASLANGIC_ISARETI, file=sys.stderr, flush=True)
+    m = importlib.import_module(modul)
+    if kip == "calistir":
+        sonuc = m.veri()
+        if hasattr(m, "ciz"):
+            m.ciz(sonuc)
+        elif hasattr(m, "layout"):
+            m.layout()
+
+
+def importtime_coz(satirlar):
+    # "import time: self [us] | cumulative | imported package" satırlarını okur
+    paketler = defaultdict(int)
+    basladi = False
+    for line in satirlar:
+        if line.startswith(BASLANGIC_ISARETI):
+            basladi = True
+            continue
+        if not basladi or not line.startswith("import time:") or "self [us]" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        paketler[parts[2].strip().split(".")[0]] += int(parts[0])
+    return paketler
+
+
+def profil_cikar(filename, kip="import"):
+    env = dict(os.environ, MPLBACKEND="Agg", PYTHONIOENCODING="utf-8")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", os.path.abspath(__file__), "--olc", modul_adi(filename), kip],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+        env=env,
+    )
+    if result.returncode != 0:
+        hata = [line for line in result.stderr.splitlines() if line and not line.startswith("import time:")]
+        return None, hata[-1] if hata else f"çıkış kodu {result.returncode}"
+    return importtime_coz(result.stderr.splitlines()), None
+
+
+def rapor(grafikler, kip="import", ilk=5):
+    rows = []
+    for filename, label in grafikler:
+        paketler, hata = profil_cikar(filename, kip)
+        if paketler is None:
+            print(f"{label}: ölçülemedi ({hata})")
+            continue
+        total = sum(paketler.values()) / 1000
+        enler = sorted(paketler.items(), key=lambda kv: kv[1], reverse=True)[:ilk]
+        rows.append((total, label))
+        print(f"{label}: {total:.0f} ms")
+        for paket, us in enler:
+            print(f"    {paket:<24}{us / 1000:8.0f} ms")
+    if rows:
+        print(f"\nToplam ({kip}): {sum(t for t, _ in rows):.0f} ms, en yavaş: {max(rows)[1]}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Grafiklerin import sürelerini üst paket bazında raporlar")
+    parser.add_argument("grafikler", nargs="*", help="Sadece bu dosyalar (varsayılan: tüm grafikler)")
+    parser.add_argument("--kip", choices=KIPLER, default="import",
+                        help="import: sadece modül importu, calistir: veri() ve çizim dahil")
+    parser.add_argument("--ilk", type=int, default=5, help="Grafik başına gösterilecek paket sayısı")
+    parser.add_argument("--olc", nargs=2, metavar=("MODUL", "KIP"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.olc:
+        _olc(*args.olc)
+    else:
+        secilen = [(f, label) for f, label in GRAFIKLER if not args.grafikler or f in args.grafikler]
+        rapor(secilen, args.kip, args.ilk)
@@ -3,12 +3,32 @@ from kivy.uix.gridlayout import GridLayout
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.button import Button
 from kivy.uix.label import Label
+from kivy.uix.progressbar import ProgressBar
 from kivy.core.window import Window
 from kivy.clock import Clock
 from kivy.animation import Animation
 import subprocess
 import os
 import shutil
+import threading
+import webbrowser
+import urllib.request
+from collections import deque
+from functools import partial
+from ilerleme import olay_coz
+from dash_sunucu import sayfa_yolu, sayfa_adresi
+from isci_havuzu import IsciIstemcisi
+from grafikler import GRAFIKLER
+
+ASAMA_ADLARI = {"okuma": "Okuma", "yazma": "Yazma"}
+
+
+def sayi_bicimle(n):
+    return f"{int(n):,}".replace(",", ".")
+
+
+def sureleri_bicimle(sureler):
+    return " | ".join(f"{ad} {sure:.1f} sn" for ad, sure in sureler.items())
 
 
 class ButtonGrid(GridLayout):
@@ -19,28 +39,18 @@ class ButtonGrid(GridLayout):
         self.spacing = 10
         self.padding = [10, 10, 10, 10]
         self.size_hint_y = 0.75
-        self.active_process = None
+        self.running_charts = set()
+        self.dash_process = None
         self.db_exists = os.path.exists("duzenli_data.db")
         self.status_label = status_label
         self.current_file_label = current_file_label
 
-        self.commands = [
-            ("bot_giris_grafigi.py", "Bot Giriş Grafiği"),
-            ("browser_karsılastırma_tablosu.py", "Tarayıcı Karşılaştırma Tablosu"),
-            ("browser_kullanim_grafigi.py", "Tarayıcı Kullanım Grafiği"),
-            ("cohort_analiz_grafigi.py", "Cohort Analiz Grafiği"),
-            ("girilen_sayfa_grafigi.py", "Girilen Sayfa Grafiği"),
-            ("hata_veren_sayfalar_istatistigi.py", "Hata Veren Sayfa İstatistiği"),
-            ("ip_konum_karsilastirma_tablosu.py", "IP Konum Karşılaştırması"),
-            ("ip_world_location_haritage.py", "Dünya IP Konum Haritası"),
-            ("kullanici_geri_donus_istatistigi.py", "Kullanıcı Geri Dönüş İstatistiği"),
-            ("os_mobile_pc_istatistigi.py", "Mobil / PC İşletim Sistemi"),
-            ("referer_istatistigi.py", "Referer İstatistiği"),
-            ("saat_tarih_ip_grafik.py", "Saat-Tarih-IP Grafiği"),
-            ("sayfa_sonrası_ziyaret_grafigi.py", "Sayfa Sonrası Ziyaret"),
-            ("status_code_grafigi.py", "HTTP Durum Kodları"),
-            ("trafik_yogunluk_grafigi.py", "Trafik Yoğunluğu Grafiği"),
-        ]
+        self.commands = GRAFIKLER
+        self.labels = dict(self.commands)
+
+        # Ağır kütüphaneler grafik tıklanmadan önce işçi sunucusunda yüklenir
+        self.workers = IsciIstemcisi(lambda event: Clock.schedule_once(partial(self.handle_worker_event, event)))
+        self.workers.baslat()
 
         colors = [
             "#FFCDD2", "#F8BBD0", "#E1BEE7", "#D1C4E9", "#C5CAE9",
@@ -60,8 +70,6 @@ class ButtonGrid(GridLayout):
             btn.bind(on_press=self.animate_button)
             self.add_widget(btn)
 
-        # İşlem durumunu her saniye kontrol et
-        Clock.schedule_interval(self.check_process_status, 1)
 
     def create_callback(self, filename, label=None):
         def callback(instance):
@@ -70,27 +78,69 @@ class ButtonGrid(GridLayout):
                 self.status_label.text = "Veri dosyası bulunamadı!"
                 return
 
-            if self.active_process and self.active_process.poll() is None:
-                try:
-                    self.active_process.terminate()
-                    self.active_process.wait(timeout=2)
-                except Exception as e:
-                    print(f"İşlem sonlandırılamadı: {e}")
+            if sayfa_yolu(filename):
+                # Etkileşimli grafikler tek Dash sunucusunda sayfa olarak açılır
+                self.open_dash_page(sayfa_yolu(filename), label)
+                return
 
             try:
+                # Grafik sıcak işçiden çatallanır; açık olan diğer grafikler kapanmaz
                 self.status_label.text = ""
-                self.active_process = subprocess.Popen(
-                    ["python", filename],
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL
-                )
+                self.workers.calistir(filename)
                 print(f"{filename} çalıştırılıyor...")
-                if label:
-                    self.current_file_label.text = f"Çalışan grafik: {label}"
             except Exception as e:
                 self.status_label.text = f"Hata: {e}"
         return callback
 
+    def handle_worker_event(self, event, dt):
+        kind = event.get("olay")
+        filename = event.get("dosya")
+        if kind == "basladi":
+            self.running_charts.add(filename)
+        elif kind == "bitti":
+            self.running_charts.discard(filename)
+        elif kind == "hata":
+            self.status_label.text = f"Hata: {event.get('hata')}"
+        self.update_running_label()
+
+    def update_running_label(self):
+        names = [self.labels.get(f, f) for f in sorted(self.running_charts)]
+        self.current_file_label.text = "Çalışan grafik: " + (", ".join(names) if names else "Yok")
+
+    def dash_running(self):
+        if self.dash_process is None or self.dash_process.poll() is not None:
+            return False
+        try:
+            urllib.request.urlopen(sayfa_adresi("/_dash-layout"), timeout=0.5)
+            return True
+        except Exception:
+            # Süreç var ama henüz dinlemiyor
+            return None
+
+    def open_dash_page(self, path, label):
+        running = self.dash_running()
+        try:
+            self.status_label.text = ""
+            if running:
+                # Sunucu zaten açık; veri bellekte olduğu için sayfa hemen gelir
+                webbrowser.open(sayfa_adresi(path))
+            elif running is None:
+                Clock.schedule_once(lambda dt: self.open_dash_page(path, label), 1)
+            else:
+                self.dash_process = subprocess.Popen(
+                    ["python", "dash_sunucu.py", "--sayfa", path],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL
+                )
+                print("dash_sunucu.py çalıştırılıyor...")
+            self.current_file_label.text = f"Çalışan grafik: {label}"
+        except Exception as e:
+            self.status_label.text = f"Hata: {e}"
+
+    def stop_dash(self):
+        if self.dash_process and self.dash_process.poll() is None:
+            self.dash_process.terminate()
+
     def animate_button(self, instance):
         original_width, original_height = instance.size
 
@@ -111,11 +161,6 @@ class ButtonGrid(GridLayout):
         r, g, b = [int(hex_color[i:i+2], 16)/255. for i in (0, 2, 4)]
         return (r, g, b, alpha)
 
-    def check_process_status(self, dt):
-        if self.active_process:
-            if self.active_process.poll() is not None:  # işlem sona ermiş
-                self.active_process = None
-                self.current_file_label.text = "Çalışan grafik: Yok"
 
 
 class DragDropArea(BoxLayout):
@@ -123,11 +168,15 @@ class DragDropArea(BoxLayout):
         super().__init__(**kwargs)
         self.orientation = "vertical"
         self.size_hint_y = 0.15
-        self.label = Label(text="db uzantılı dosyayı buraya sürükleyin", font_size=16, size_hint_y=None, height=40)
+        self.label = Label(text="db veya log uzantılı dosyayı buraya sürükleyin", font_size=16, size_hint_y=None, height=40)
         self.add_widget(self.label)
+        self.progress_bar = ProgressBar(max=1000, value=0, size_hint_y=None, height=20)
+        self.add_widget(self.progress_bar)
         self.button_grid = button_grid
         self.output_label = output_label
         self.process = None
+        self.finished_event = None
+        self.stderr_lines = deque(maxlen=20)
 
         Window.bind(on_dropfile=self.on_file_drop)
 
@@ -138,8 +187,8 @@ class DragDropArea(BoxLayout):
         file_path = file_path.decode("utf-8")
         print(f"Sürüklenen dosya: {file_path}")
 
-        if not file_path.endswith(".db"):
-            self.label.text = "Sadece .db dosyaları kabul edilir."
+        if not file_path.lower().endswith((".db", ".log", ".log.gz")):
+            self.label.text = "Sadece .db, .log ve .log.gz dosyaları kabul edilir."
             return
 
         try:
@@ -156,13 +205,23 @@ class DragDropArea(BoxLayout):
             self.label.text = f"{filename} yüklendi\n{filename} -> duzenli_data.db"
             self.output_label.text = "Data düzenleniyor ..."
 
+            # İlerleme olayları stdout'tan JSON satırları olarak, diğer çıktılar stderr'den gelir;
+            # ikisi de arka plan iş parçacıklarında okunur, arayüz hiç beklemez
+            self.progress_bar.value = 0
+            self.finished_event = None
+            self.stderr_lines.clear()
             self.process = subprocess.Popen(
-                ["python", "data_siralama.py", destination_path],
+                ["python", "data_siralama.py", destination_path, "--olaylar"],
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                text=True
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+                bufsize=1,
+                env=dict(os.environ, PYTHONIOENCODING="utf-8"),
             )
-            Clock.schedule_interval(self.read_output, 0.5)
+            threading.Thread(target=self.read_events, args=(self.process,), daemon=True).start()
+            threading.Thread(target=self.read_stderr, args=(self.process,), daemon=True).start()
 
             self.button_grid.db_exists = True
             self.button_grid.status_label.text = ""
@@ -171,20 +230,59 @@ class DragDropArea(BoxLayout):
             self.label.text = f"Hata: {e}"
             print(f"Hata oluştu: {e}")
 
-    def read_output(self, dt):
-        if self.process:
-            output = self.process.stdout.readline()
-            if output:
-                self.output_label.text = output.strip()
-            elif self.process.poll() is not None:
-                err_output = self.process.stderr.read()
-                if err_output:
-                    self.output_label.text = err_output.strip()
-                else:
-                    self.output_label.text = "Data düzenlendi!"
-                self.process = None
-                return False
-        return True
+    def read_events(self, process):
+        for line in process.stdout:
+            event = olay_coz(line)
+            if event:
+                # Widget'lar sadece ana iş parçacığında güncellenebilir
+                Clock.schedule_once(partial(self.handle_event, event))
+        process.wait()
+        Clock.schedule_once(partial(self.process_finished, process))
+
+    def read_stderr(self, process):
+        for line in process.stderr:
+            if line.strip():
+                self.stderr_lines.append(line.strip())
+
+    def handle_event(self, event, dt):
+        kind = event.get("olay")
+        if kind == "basladi":
+            self.output_label.text = "Data düzenleniyor ..."
+        elif kind == "ilerleme":
+            if event.get("oran") is not None:
+                self.progress_bar.value = event["oran"] * self.progress_bar.max
+            text = f"{ASAMA_ADLARI.get(event['asama'], event['asama'])}: {sayi_bicimle(event['islenen'])}"
+            if event.get("toplam"):
+                text += f" / {sayi_bicimle(event['toplam'])}"
+            text += " satır"
+            if event.get("satir_per_sn"):
+                text += f" • {sayi_bicimle(event['satir_per_sn'])} satır/sn"
+            if event.get("kalan_sn") is not None:
+                text += f" • kalan ~{event['kalan_sn']:.0f} sn"
+            self.output_label.text = text + "\n" + sureleri_bicimle(event.get("sureler", {}))
+        elif kind == "asama" and event.get("ad") == "indeksler":
+            self.output_label.text = "İndeksler oluşturuluyor ..."
+        elif kind == "bitti":
+            self.finished_event = event
+            if event.get("basarili"):
+                self.progress_bar.value = self.progress_bar.max
+                self.output_label.text = (
+                    f"Data düzenlendi! (+{sayi_bicimle(event['satir'])} satır, {event['gecen_sn']:.0f} sn)\n"
+                    + sureleri_bicimle(event.get("sureler", {}))
+                )
+            else:
+                self.output_label.text = f"Hata: {event.get('hata')}"
+
+    def process_finished(self, process, dt):
+        if process is not self.process:
+            return
+        if self.finished_event is None:
+            # Süreç bitiş olayı göndermeden kapandı (ör. beklenmeyen hata)
+            if process.returncode == 0:
+                self.output_label.text = self.stderr_lines[-1] if self.stderr_lines else "Data düzenlendi!"
+            else:
+                self.output_label.text = self.stderr_lines[-1] if self.stderr_lines else "Data düzenlenemedi."
+        self.process = None
 
 
 class GrafikUygulamasi(App):
@@ -192,10 +290,11 @@ class GrafikUygulamasi(App):
         ana_layout = BoxLayout(orientation='vertical')
 
         status_label = Label(text="", size_hint_y=None, height=40)
-        output_label = Label(text="", size_hint_y=None, height=40, font_size=14)
+        output_label = Label(text="", size_hint_y=None, height=60, font_size=14)
         current_file_label = Label(text="Çalışan grafik: Yok", size_hint_y=None, height=40, font_size=14)
 
         btn_grid = ButtonGrid(status_label=status_label, current_file_label=current_file_label)
+        self.btn_grid = btn_grid
         drag_area = DragDropArea(button_grid=btn_grid, output_label=output_label)
 
         ana_layout.add_widget(status_label)
@@ -206,6 +305,10 @@ class GrafikUygulamasi(App):
 
         return ana_layout
 
+    def on_stop(self):
+        self.btn_grid.stop_dash()
+        self.btn_grid.workers.kapat()
+
 
 if __name__ == "__main__":
     GrafikUygulamasi().run()
@@ -0,0 +1,143 @@
+import pandas as pd
+from sqlalchemy import inspect, text
+
+# === Özet (rollup) tabloları ===
+# Her özet tablosu date + is_bot + boyut kolonları ile anahtarlanır ve
+# hits (istek sayısı) ile ips (farklı IP sayısı) tutar. Farklı IP sayısı
+# chunk'lar arasında toplanamadığı için her özetin yanında görülen
+# (anahtar, IP) çiftlerini tutan bir <özet>_ip tablosu vardır.
+OZETLER = {
+    "ozet_tarayici": ["browser"],
+    "ozet_ulke": ["country"],
+    "ozet_durum": ["sc-status"],
+    "ozet_isletim_sistemi": ["os", "is_mobile", "is_pc"],
+    "ozet_saatlik": ["hour"],
+}
+ANAHTAR_ON_KOLONLAR = ["date", "is_bot"]
+
+# UNIQUE kısıtlarında NULL değerler birbirine eşit sayılmadığı için boş
+# boyut değerleri "" olarak saklanır, okurken tekrar boş değere çevrilir.
+BOS_DEGER = ""
+
+
+def _q(col):
+    return '"' + col + '"'
+
+
+def _anahtar_kolonlari(ad):
+    return ANAHTAR_ON_KOLONLAR + OZETLER[ad]
+
+
+def ozet_tablolarini_olustur(conn):
+    for ad in OZETLER:
+        keys = _anahtar_kolonlari(ad)
+        key_sql = ", ".join(_q(c) for c in keys)
+        conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {ad} ("
+            + ", ".join(f"{_q(c)} NOT NULL" for c in keys)
+            + f", hits INTEGER NOT NULL, ips INTEGER NOT NULL, PRIMARY KEY ({key_sql}))"
+        ))
+        conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {ad}_ip ("
+            + ", ".join(f"{_q(c)} NOT NULL" for c in keys + ["c-ip"])
+            + f", PRIMARY KEY ({key_sql}, \"c-ip\")) WITHOUT ROWID"
+        ))
+
+
+def _ozet_cercevesi(chunk):
+    df = pd.DataFrame({
+        "date": chunk["date"].astype(str),
+        "is_bot": chunk["is_bot"].fillna(0).astype(int),
+        "c-ip": chunk["c-ip"].fillna(BOS_DEGER).astype(str),
+        "browser": chunk["browser"].astype(object).fillna(BOS_DEGER),
+        "country": chunk["country"].astype(object).fillna(BOS_DEGER),
+        "sc-status": pd.to_numeric(chunk["sc-status"], errors="coerce").fillna(0).astype(int),
+        "os": chunk["os"].astype(object).fillna(BOS_DEGER),
+        "is_mobile": chunk["is_mobile"].fillna(0).astype(int),
+        "is_pc": chunk["is_pc"].fillna(0).astype(int),
+        "hour": pd.to_numeric(chunk["time"].astype(str).str[:2], errors="coerce").fillna(0).astype(int),
+    })
+    return df
+
+
+def ozetleri_guncelle(conn, chunk):
+    # Chunk'ın katkısını özetlere ekler; chunk'ı yazan işlemin içinde çağrılır
+    ozet_tablolarini_olustur(conn)
+    df = _ozet_cercevesi(chunk)
+
+    for ad in OZETLER:
+        keys = _anahtar_kolonlari(ad)
+        key_sql = ", ".join(_q(c) for c in keys)
+        match_sql = " AND ".join(f"t.{_q(c)} = n.{_q(c)}" for c in keys)
+        hits = df.groupby(keys, sort=False).size().reset_index(name="hits")
+        pairs = df[keys + ["c-ip"]].drop_duplicates()
+
+        # 1) istek sayıları: upsert ile eklenir
+        conn.execute(text("DROP TABLE IF EXISTS temp._ozet_hits"))
+        conn.execute(text(f"CREATE TEMP TABLE _ozet_hits AS SELECT {key_sql}, hits FROM {ad} WHERE 0"))
+        _toplu_ekle(conn, "temp._ozet_hits", hits)
+        conn.execute(text(
+            f"INSERT INTO {ad} ({key_sql}, hits, ips) SELECT {key_sql}, hits, 0 FROM temp._ozet_hits WHERE 1 "
+            f"ON CONFLICT ({key_sql}) DO UPDATE SET hits = {ad}.hits + excluded.hits"
+        ))
+
+        # 2) farklı IP'ler: sadece daha önce görülmemiş (anahtar, IP) çiftleri sayılır
+        conn.execute(text("DROP TABLE IF EXISTS temp._ozet_ip"))
+        conn.execute(text(f"CREATE TEMP TABLE _ozet_ip AS SELECT {key_sql}, \"c-ip\" FROM {ad}_ip WHERE 0"))
+        _toplu_ekle(conn, "temp._ozet_ip", pairs)
+        conn.execute(text(
+            f"DELETE FROM temp._ozet_ip AS n WHERE EXISTS "
+            f"(SELECT 1 FROM {ad}_ip AS t WHERE {match_sql} AND t.\"c-ip\" = n.\"c-ip\")"
+        ))
+        conn.execute(text(f"INSERT INTO {ad}_ip SELECT * FROM temp._ozet_ip"))
+
+        # Yeni IP sayıları anahtar başına toplanıp indeksli geçici tablodan eklenir
+        conn.execute(text("DROP TABLE IF EXISTS temp._ozet_yeni"))
+        conn.execute(text(
+            f"CREATE TEMP TABLE _ozet_yeni ({key_sql}, n INTEGER, PRIMARY KEY ({key_sql}))"
+        ))
+        conn.execute(text(
+            f"INSERT INTO temp._ozet_yeni SELECT {key_sql}, COUNT(*) FROM temp._ozet_ip GROUP BY {key_sql}"
+        ))
+        conn.execute(text(
+            f"UPDATE {ad} AS t SET ips = ips + (SELECT n.n FROM temp._ozet_yeni AS n WHERE {match_sql}) "
+            f"WHERE EXISTS (SELECT 1 FROM temp._ozet_yeni AS n WHERE {match_sql})"
+        ))
+
+    for temp_table in ("_ozet_hits", "_ozet_ip", "_ozet_yeni"):
+        conn.execute(text(f"DROP TABLE IF EXISTS temp.{temp_table}"))
+
+
+def _toplu_ekle(conn, table, df):
+    if df.empty:
+        return
+    cols = ", ".join(_q(c) for c in df.columns)
+    params = ", ".join("?" for _ in df.columns)
+    # astype(object) numpy tiplerini sqlite3'ün kabul ettiği Python tiplerine çevirir
+    rows = list(df.astype(object).itertuples(index=False, name=None))
+    conn.exec_driver_sql(f"INSERT INTO {table} ({cols}) VALUES ({params})", rows)
+
+
+# === Okuma ===
+def ozet_var_mi(engine, ad):
+    return inspect(engine).has_table(ad)
+
+
+def ozet_oku(engine, ad, is_bot=None, tarih_baslangic=None, tarih_bitis=None):
+    where, params = ["1 = 1"], {}
+    if is_bot is not None:
+        where.append("is_bot = :is_bot")
+        params["is_bot"] = int(is_bot)
+    if tarih_baslangic:
+        where.append("date >= :baslangic")
+        params["baslangic"] = str(tarih_baslangic)
+    if tarih_bitis:
+        where.append("date <= :bitis")
+        params["bitis"] = str(tarih_bitis)
+    query = text(f"SELECT * FROM {ad} WHERE {' AND '.join(where)}")
+    with engine.connect() as conn:
+        df = pd.read_sql(query, con=conn, params=params)
+    for col in OZETLER[ad]:
+        if df[col].dtype == object:
+            df[col] = df[col].replace(BOS_DEGER, None)
+    return df
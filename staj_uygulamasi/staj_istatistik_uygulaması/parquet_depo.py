@@ -0,0 +1,156 @@
+import os
+import shutil
+import uuid
+import importlib.util
+from veri_kapsami import kapsam
+
+# pyarrow ağır bir import; grafikler parquet okumadıkça yüklenmez.
+# Kurulu değilse sadece SQLite çıktısı kullanılır.
+pa = ds = pq = None
+
+
+def _pyarrow_yukle():
+    global pa, ds, pq
+    if pa is None and parquet_destekleniyor():
+        import pyarrow
+        import pyarrow.dataset
+        import pyarrow.parquet
+        pa, ds, pq = pyarrow, pyarrow.dataset, pyarrow.parquet
+    return pa is not None
+
+PARQUET_KLASORU = "duzenli_parquet"
+BOLUM_KOLONU = "date"
+
+
+def parquet_destekleniyor():
+    return pa is not None or importlib.util.find_spec("pyarrow") is not None
+
+
+def parquet_var_mi(klasor=PARQUET_KLASORU):
+    return parquet_destekleniyor() and os.path.isdir(klasor) and any(
+        name.startswith(f"{BOLUM_KOLONU}=") for name in os.listdir(klasor)
+    )
+
+
+def parquet_sil(klasor=PARQUET_KLASORU):
+    if os.path.isdir(klasor):
+        shutil.rmtree(klasor)
+
+
+def parquet_yarim_sil(klasor, calisma_id, dosya_no):
+    # Kesilen bir çalışmanın dosya_no ve sonrasındaki (kaydı tutulmamış) dosyalarını siler
+    if not os.path.isdir(klasor):
+        return
+    prefix = f"part-{calisma_id}-"
+    for root, _, files in os.walk(klasor):
+        for name in files:
+            if name.startswith(prefix) and int(name[len(prefix):].split("-")[0]) >= dosya_no:
+                os.remove(os.path.join(root, name))
+
+
+def _metin_mi(tip):
+    return (
+        pa.types.is_string(tip) or pa.types.is_large_string(tip)
+        or pa.types.is_null(tip) or pa.types.is_dictionary(tip)
+    )
+
+
+def _bolumleme():
+    return ds.partitioning(pa.schema([(BOLUM_KOLONU, pa.string())]), flavor="hive")
+
+
+# === Tarihe göre bölümlenmiş Parquet yazıcı ===
+# Satırlar bellekte sınırlı bir tamponda biriktirilir, dolunca her tarih için
+# tek dosya yazılır. Metin kolonları sözlük kodlamalı, sıkıştırma zstd.
+# Dosya adları çalışma kimliği ve sıra numarası taşır; kesilen bir çalışma
+# aynı kimlik ve kayıtlı son numarayla devam ettirilebilir.
+class ParquetYazici:
+    def __init__(self, klasor=PARQUET_KLASORU, tampon_satir=500_000, calisma_id=None, dosya_no=0):
+        if not _pyarrow_yukle():
+            raise RuntimeError("Parquet çıktısı için pyarrow kurulu olmalı.")
+        self.klasor = klasor
+        self.tampon_satir = tampon_satir
+        self.tampon = []
+        self.tampon_boyu = 0
+        self.schema = None
+        self.calisma_id = calisma_id or uuid.uuid4().hex[:8]
+        self.dosya_no = dosya_no
+
+    def _tabloya_cevir(self, chunk):
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        if self.schema is None:
+            fields = []
+            for field in table.schema:
+                if field.name == BOLUM_KOLONU:
+                    fields.append(pa.field(field.name, pa.string()))
+                elif _metin_mi(field.type):
+                    fields.append(pa.field(field.name, pa.dictionary(pa.int32(), pa.string())))
+                elif pa.types.is_boolean(field.type):
+                    # SQLite'taki gibi 0/1 saklanır, is_bot == 0 filtreleri aynen çalışır
+                    fields.append(pa.field(field.name, pa.int8()))
+                else:
+                    fields.append(field)
+            self.schema = pa.schema(fields)
+
+        # Sonraki chunk'larda eksik kolonlar boş, tipler ilk şemaya göre
+        columns = []
+        for field in self.schema:
+            if field.name in table.column_names:
+                column = table[field.name]
+                if pa.types.is_dictionary(field.type) and not pa.types.is_dictionary(column.type):
+                    column = column.cast(pa.string()).dictionary_encode()
+                columns.append(column.cast(field.type))
+            else:
+                columns.append(pa.nulls(len(table), field.type))
+        return pa.Table.from_arrays(columns, schema=self.schema)
+
+    def ekle(self, chunk):
+        chunk = chunk.copy()
+        chunk[BOLUM_KOLONU] = chunk[BOLUM_KOLONU].astype(str)
+        self.tampon.append(self._tabloya_cevir(chunk))
+        self.tampon_boyu += len(chunk)
+        if self.tampon_boyu >= self.tampon_satir:
+            self.bosalt()
+
+    def bosalt(self):
+        if not self.tampon:
+            return
+        table = pa.concat_tables(self.tampon)
+        self.tampon, self.tampon_boyu = [], 0
+        pq.write_to_dataset(
+            table,
+            root_path=self.klasor,
+            partitioning=_bolumleme(),
+            basename_template=f"part-{self.calisma_id}-{self.dosya_no:05d}-{{i}}.parquet",
+            compression="zstd",
+            use_dictionary=True,
+            existing_data_behavior="overwrite_or_ignore",
+        )
+        self.dosya_no += 1
+
+    def kapat(self):
+        self.bosalt()
+
+
+# === Okuma: kolon projeksiyonu ve tarih bölümü budama ===
+def parquet_oku(kolonlar, tarih_baslangic=None, tarih_bitis=None, filtreler=None, klasor=PARQUET_KLASORU):
+    # filtreler: [("is_bot", "==", 0), ...] biçiminde pyarrow filtreleri
+    if not _pyarrow_yukle():
+        raise RuntimeError("Parquet okumak için pyarrow kurulu olmalı.")
+    # analiz.py kapsamı (tarih aralığı, filtreler) da eklenir; tarih bölümleri budanır
+    k = kapsam()
+    filtreler = list(filtreler or []) + k.get("filtreler", [])
+    for baslangic in (tarih_baslangic, k.get("baslangic")):
+        if baslangic:
+            filtreler.append((BOLUM_KOLONU, ">=", str(baslangic)))
+    for bitis in (tarih_bitis, k.get("bitis")):
+        if bitis:
+            filtreler.append((BOLUM_KOLONU, "<=", str(bitis)))
+
+    table = pq.read_table(
+        klasor,
+        columns=list(kolonlar),
+        filters=filtreler or None,
+        partitioning=_bolumleme(),
+    )
+    return table.to_pandas()
@@ -1,31 +1,17 @@
+import sys
 import pandas as pd
-from sqlalchemy import create_engine, MetaData, Table, select
-from dash import Dash, dcc, html, Output, Input
-import plotly.graph_objects as go
-import threading
-import requests
-
-# DB bağlantısı
-engine = create_engine("sqlite:///duzenli_data.db")
-metadata = MetaData()
-metadata.reflect(bind=engine)
-logs_table = Table("logs", metadata, autoload_with=engine)
+from veri_erisim import oku
+from sonuc_onbellek import bellekte
+
+BASLIK = "Sayfa Sonrası Ziyaret"
 
 def fetch_real_user_page_visits():
-    with engine.connect() as conn:
-        query = (
-            select(
-                logs_table.c.date,
-                logs_table.c.time,
-                logs_table.c["c-ip"].label("ip"),
-                logs_table.c["cs-uri-stem"].label("page"),
-                logs_table.c["is_bot"],
-                logs_table.c["sc-status"]
-            )
-            .where(logs_table.c.is_bot == 0)
-            .where(logs_table.c["sc-status"] == 200)
-        )
-        df = pd.read_sql(query, conn)
+    df = oku(
+        ["date", "time", "c-ip", "cs-uri-stem", "is_bot", "sc-status"],
+        filtreler=[("is_bot", "==", 0), ("sc-status", "==", 200)],
+        # idx_logs_gezinme bu sırayı verir, SQLite ayrıca sıralamaz
+        sirala=["date", "c-ip", "time"],
+    ).rename(columns={"c-ip": "ip", "cs-uri-stem": "page"})
 
     # Temizlik
     df['date'] = df['date'].astype(str).str.strip()
@@ -43,8 +29,8 @@ def son_iki_rakam_mi_vectorized(pages):
 def process_page_visits_vectorized(df):
     # Her grup için işlem yapmak yerine vektörize edelim
 
-    # Sort et
-    df_sorted = df.sort_values(['date', 'ip', 'time'])
+    # Satırlar sorgudan (date, ip, time) sırasıyla geliyor, tekrar sıralamaya gerek yok
+    df_sorted = df.copy()
 
     # Her kaydın bir sonraki kaydının sayfasını alalım
     df_sorted['next_page'] = df_sorted.groupby(['date', 'ip'])['page'].shift(-1)
@@ -100,27 +86,29 @@ def gunluk_toplam_ziyaret(df):
     }).reset_index()
     return toplam
 
-# Dash app oluştur
-app = Dash(__name__)
-
 # Veriyi çek ve işle (sadece 1 kere)
-raw_df = fetch_real_user_page_visits()
-processed_df = process_page_visits_vectorized(raw_df)
-toplam_ziyaret = gunluk_toplam_ziyaret(processed_df)
-
-app.layout = html.Div([
-    html.H2("Gün Bazlı Ana Sayfa ve Arama Sonrası Ziyaretler"),
-    dcc.Graph(id='gunluk-ziyaret-grafik'),
-    html.Button('Sayfayı Durdur', id='shutdown-btn', style={'margin': '20px'}),
-    html.Div(id='detay-grafikler'),
-    html.Div(id='shutdown-message', style={"color": "red", "fontWeight": "bold"})
-])
-
-@app.callback(
-    Output('gunluk-ziyaret-grafik', 'figure'),
-    Input('gunluk-ziyaret-grafik', 'clickData')
-)
-def goster_gunluk_grafik(clickData):
+def ziyaretleri_hesapla():
+    raw_df = fetch_real_user_page_visits()
+    processed_df = process_page_visits_vectorized(raw_df)
+    toplam_ziyaret = gunluk_toplam_ziyaret(processed_df)
+    return processed_df, toplam_ziyaret
+
+def veri():
+    return bellekte("sayfa_sonrasi_ziyaret", ziyaretleri_hesapla)
+
+# Dash sayfası
+def layout():
+    from dash import dcc, html
+
+    return html.Div([
+        html.H2("Gün Bazlı Ana Sayfa ve Arama Sonrası Ziyaretler"),
+        dcc.Graph(id='gunluk-ziyaret-grafik'),
+        html.Div(id='detay-grafikler'),
+    ])
+
+def gunluk_figur(toplam_ziyaret):
+    import plotly.graph_objects as go
+
     fig = go.Figure()
     if toplam_ziyaret["ana_sayfa_ziyaret"].sum() > 0:
         fig.add_trace(go.Bar(
@@ -147,94 +135,81 @@ def goster_gunluk_grafik(clickData):
     )
     return fig
 
-@app.callback(
-    Output('detay-grafikler', 'children'),
-    Input('gunluk-ziyaret-grafik', 'clickData')
-)
-def goster_detaylar(clickData):
-    if clickData is None:
-        return html.Div("Lütfen bir gün seçin")
-
-    secilen_gun = clickData['points'][0]['x'].strip()
-    filtered_df = processed_df[processed_df['date'] == secilen_gun]
-
-    if filtered_df.empty:
-        return html.Div(f"Seçilen gün için veri yok: {secilen_gun}")
+def detay_figurleri(filtered_df):
+    # (başlık, en çok gidilen sayfa, figür) listesi
+    import plotly.graph_objects as go
 
     ana_sayfa_df = filtered_df[filtered_df['slash_sonrasi_sayfalar'].str.strip() != '']
     arama_df = filtered_df[filtered_df['arama_sonrasi_sayfalar'].str.strip() != '']
 
-    ana_sayfa_freq = sayfa_frekans(ana_sayfa_df, 'slash_sonrasi_sayfalar')
-    arama_freq = sayfa_frekans(arama_df, 'arama_sonrasi_sayfalar')
-
-    children = []
-
-    if not ana_sayfa_freq.empty:
-        top_ana = ana_sayfa_freq.head(15)
-        ana_fig = go.Figure(go.Bar(
-            x=top_ana.index,
-            y=top_ana.values,
-            text=top_ana.values,
-            textposition='outside',
-            hoverinfo='x+y'
-        ))
-        en_cok_ana = ana_sayfa_freq.idxmax()
-        ana_fig.update_layout(
-            title="Ana Sayfa Sonrası",
-            xaxis_title="Sayfa",
-            yaxis_title="Ziyaret Sayısı",
-            yaxis=dict(tickformat='d')
-        )
-        children.append(html.H3("Ana Sayfa Sonrası"))
-        children.append(html.P("En Çok Gidilen Sayfa: " + en_cok_ana))
-        children.append(dcc.Graph(figure=ana_fig))
-
-    if not arama_freq.empty:
-        top_arama = arama_freq.head(15)
-        arama_fig = go.Figure(go.Bar(
-            x=top_arama.index,
-            y=top_arama.values,
-            text=top_arama.values,
+    detaylar = []
+    for baslik, freq in (
+        ("Ana Sayfa Sonrası", sayfa_frekans(ana_sayfa_df, 'slash_sonrasi_sayfalar')),
+        ("Arama Sonrası", sayfa_frekans(arama_df, 'arama_sonrasi_sayfalar')),
+    ):
+        if freq.empty:
+            continue
+        top = freq.head(15)
+        fig = go.Figure(go.Bar(
+            x=top.index,
+            y=top.values,
+            text=top.values,
             textposition='outside',
             hoverinfo='x+y'
         ))
-        en_cok_arama = arama_freq.idxmax()
-        arama_fig.update_layout(
-            title="Arama Sonrası",
+        fig.update_layout(
+            title=baslik,
             xaxis_title="Sayfa",
             yaxis_title="Ziyaret Sayısı",
             yaxis=dict(tickformat='d')
         )
-        children.append(html.H3("Arama Sonrası"))
-        children.append(html.P("En Çok Gidilen Sayfa: " + en_cok_arama))
-        children.append(dcc.Graph(figure=arama_fig))
-
-    if not children:
-        return html.Div("Seçilen gün için gösterilecek veri yok")
-
-    return html.Div(children)
-
-@app.callback(
-    Output('shutdown-message', 'children'),
-    Input('shutdown-btn', 'n_clicks'),
-    prevent_initial_call=True
-)
-def shutdown_app(n_clicks):
-    if n_clicks:
-        threading.Thread(target=lambda: requests.post("http://127.0.0.1:9020/shutdown")).start()
-        return "Uygulama durduruluyor..."
-
-@app.server.route('/shutdown', methods=['POST'])
-def shutdown():
-    import os
-    import signal
-    os.kill(os.getpid(), signal.SIGINT)
-    return 'Server kapatılıyor...'
+        detaylar.append((baslik, freq.idxmax(), fig))
+    return detaylar
+
+def figurler(sonuc):
+    # Statik rapor (toplu_rapor.py): günlük grafik ve tüm dönemin detayları
+    processed_df, toplam_ziyaret = sonuc
+    return [gunluk_figur(toplam_ziyaret)] + [fig for _, _, fig in detay_figurleri(processed_df)]
+
+def kaydet(app):
+    from dash import dcc, html, Output, Input
+
+    @app.callback(
+        Output('gunluk-ziyaret-grafik', 'figure'),
+        Input('gunluk-ziyaret-grafik', 'clickData')
+    )
+    def goster_gunluk_grafik(clickData):
+        _, toplam_ziyaret = veri()
+        return gunluk_figur(toplam_ziyaret)
+
+    @app.callback(
+        Output('detay-grafikler', 'children'),
+        Input('gunluk-ziyaret-grafik', 'clickData')
+    )
+    def goster_detaylar(clickData):
+        if clickData is None:
+            return html.Div("Lütfen bir gün seçin")
+
+        processed_df, _ = veri()
+        secilen_gun = clickData['points'][0]['x'].strip()
+        filtered_df = processed_df[processed_df['date'] == secilen_gun]
+
+        if filtered_df.empty:
+            return html.Div(f"Seçilen gün için veri yok: {secilen_gun}")
+
+        children = []
+        for baslik, en_cok, fig in detay_figurleri(filtered_df):
+            children.append(html.H3(baslik))
+            children.append(html.P("En Çok Gidilen Sayfa: " + en_cok))
+            children.append(dcc.Graph(figure=fig))
+
+        if not children:
+            return html.Div("Seçilen gün için gösterilecek veri yok")
+
+        return html.Div(children)
+
 
 # Otomatik açma
 if __name__ == "__main__":
-    import webbrowser
-    import threading
-
-    threading.Timer(1.0, lambda: webbrowser.open("http://127.0.0.1:9020")).start()
-    app.run(debug=False, port=9020)
+    from dash_sunucu import tek_sayfa_calistir
+    tek_sayfa_calistir(sys.modules[__name__], port=9020)
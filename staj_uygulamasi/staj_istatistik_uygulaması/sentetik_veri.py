@@ -0,0 +1,195 @@
+import os
+import argparse
+import sqlite3
+import numpy as np
+import pandas as pd
+from ip_konum import IP_KONUM_DOSYASI
+
+# === Sentetik data.db üretici ===
+# Ölçüm için IIS günlüklerine benzeyen, aynı tohumla her seferinde aynı çıkan
+# bir logs tablosu üretir. Satırlar zamana göre sıralı ve parça parça yazılır,
+# 10 milyon satırda da bellek kullanımı chunk boyutuyla sınırlıdır.
+KOLONLAR = [
+    "date", "time", "s-ip", "cs-method", "cs-uri-stem", "cs-uri-query", "s-port",
+    "cs-username", "c-ip", "cs(User-Agent)", "cs(Referer)", "sc-status",
+    "sc-substatus", "sc-win32-status", "time-taken",
+]
+HAZIR_BOYUTLAR = {"100k": 100_000, "1m": 1_000_000, "10m": 10_000_000}
+
+TARAYICI_SABLONLARI = [
+    # (şablon, ağırlık); {v} sürüm numarasıyla doldurulur
+    ("Mozilla/5.0+(Windows+NT+10.0;+Win64;+x64)+AppleWebKit/537.36+(KHTML,+like+Gecko)+Chrome/{v}.0.0.0+Safari/537.36", 30),
+    ("Mozilla/5.0+(Linux;+Android+{a})+AppleWebKit/537.36+(KHTML,+like+Gecko)+Chrome/{v}.0.0.0+Mobile+Safari/537.36", 22),
+    ("Mozilla/5.0+(iPhone;+CPU+iPhone+OS+{i}_0+like+Mac+OS+X)+AppleWebKit/605.1.15+(KHTML,+like+Gecko)+Version/{i}.0+Mobile/15E148+Safari/604.1", 14),
+    ("Mozilla/5.0+(Windows+NT+10.0;+Win64;+x64;+rv:{v}.0)+Gecko/20100101+Firefox/{v}.0", 6),
+    ("Mozilla/5.0+(Windows+NT+10.0;+Win64;+x64)+AppleWebKit/537.36+(KHTML,+like+Gecko)+Chrome/{v}.0.0.0+Safari/537.36+Edg/{v}.0.0.0", 6),
+    ("Mozilla/5.0+(Macintosh;+Intel+Mac+OS+X+10_15_7)+AppleWebKit/605.1.15+(KHTML,+like+Gecko)+Version/{i}.0+Safari/605.1.15", 4),
+    ("Mozilla/5.0+(Windows+NT+10.0;+Win64;+x64)+AppleWebKit/537.36+(KHTML,+like+Gecko)+Chrome/{v}.0.0.0+Safari/537.36+OPR/{o}.0.0.0", 2),
+    ("Mozilla/5.0+(Linux;+Android+{a};+SM-A536B)+AppleWebKit/537.36+(KHTML,+like+Gecko)+SamsungBrowser/{s}.0+Chrome/{v}.0.0.0+Mobile+Safari/537.36", 3),
+]
+BOT_UALARI = [
+    ("Mozilla/5.0+(compatible;+Googlebot/2.1;++http://www.google.com/bot.html)", 35),
+    ("Mozilla/5.0+(compatible;+bingbot/2.0;++http://www.bing.com/bingbot.htm)", 15),
+    ("Mozilla/5.0+(compatible;+YandexBot/3.0;++http://yandex.com/bots)", 8),
+    ("Mozilla/5.0+(compatible;+AhrefsBot/7.0;++http://ahrefs.com/robot/)", 12),
+    ("Mozilla/5.0+(compatible;+SemrushBot/7~bl;++http://www.semrush.com/bot.html)", 10),
+    ("Mozilla/5.0+(compatible;+DotBot/1.2;++https://opensites.com/dotbot)", 4),
+    ("facebookexternalhit/1.1+(+http://www.facebook.com/externalhit_uatext.php)", 6),
+    ("Mozilla/5.0+(compatible;+MJ12bot/v1.4.8;+http://mj12bot.com/)", 4),
+    ("python-requests/2.31.0", 3),
+    ("curl/8.4.0", 3),
+]
+BOLUMLER = ["haber", "spor", "ekonomi", "dunya", "teknoloji", "saglik", "yasam", "magazin", "urun", "kategori"]
+STATIK_SAYFALAR = ["/", "/arama", "/hakkinda", "/iletisim", "/giris", "/kayit", "/sepet", "/favicon.ico",
+                   "/robots.txt", "/sitemap.xml", "/css/site.css", "/js/app.js"]
+REFERERLER = [
+    ("-", 45), ("https://www.google.com/", 25), ("https://www.google.com.tr/", 8),
+    ("https://www.facebook.com/", 5), ("https://t.co/", 4), ("https://www.bing.com/", 3),
+    ("https://yandex.com.tr/", 2), ("https://www.instagram.com/", 2), ("SITE", 6),
+]
+DURUM_KODLARI = [(200, 78), (304, 8), (301, 3), (302, 2), (404, 6), (403, 1), (500, 1.5), (503, 0.5)]
+# Günün saatine göre trafik ağırlıkları (gece düşük, akşam yüksek)
+SAAT_AGIRLIKLARI = [2, 1, 1, 1, 1, 1, 2, 3, 5, 6, 6, 6, 7, 6, 6, 6, 6, 7, 8, 9, 9, 8, 6, 4]
+
+
+def _agirlikli(rng, items, n):
+    values, weights = zip(*items)
+    p = np.asarray(weights, dtype=float)
+    return np.asarray(values, dtype=object)[rng.choice(len(values), size=n, p=p / p.sum())]
+
+
+def _zipf_indeks(rng, havuz, n, a=1.2):
+    # Az sayıda çok sık görülen, çok sayıda seyrek görülen eleman
+    return (rng.zipf(a, size=n) - 1) % havuz
+
+
+class SentetikUretici:
+    def __init__(self, tohum=42, gun=30, baslangic="2025-07-01", ip_sayisi=50_000,
+                 sayfa_sayisi=20_000, bot_orani=0.25):
+        rng = np.random.default_rng(tohum)
+        self.rng = rng
+        self.gun = gun
+        self.baslangic = pd.Timestamp(baslangic)
+        self.bot_orani = bot_orani
+
+        # IP havuzu: konum dosyasındaki IP'ler (eşleşme olsun diye) + rastgele IPv4'ler
+        known = []
+        if os.path.exists(IP_KONUM_DOSYASI):
+            known = pd.read_csv(IP_KONUM_DOSYASI, usecols=["ip"], dtype=str)["ip"].tolist()
+        random_ips = [
+            f"{a}.{b}.{c}.{d}" for a, b, c, d in
+            rng.integers([1, 0, 0, 1], [224, 256, 256, 255], size=(max(0, ip_sayisi - len(known)), 4))
+        ]
+        self.ip_havuzu = np.asarray(rng.permutation(np.asarray(known + random_ips, dtype=object)), dtype=object)
+        self.bot_ip_havuzu = self.ip_havuzu[rng.choice(len(self.ip_havuzu), size=min(500, len(self.ip_havuzu)), replace=False)]
+
+        # Kullanıcı UA havuzu: şablon x sürüm kombinasyonları
+        ua_pool, ua_weights = [], []
+        for template, weight in TARAYICI_SABLONLARI:
+            for _ in range(40):
+                ua_pool.append(template.format(
+                    v=rng.integers(100, 131), a=rng.integers(9, 15), i=rng.integers(14, 18),
+                    o=rng.integers(95, 112), s=rng.integers(20, 26),
+                ))
+                ua_weights.append(weight / 40)
+        self.ua_havuzu = (np.asarray(ua_pool, dtype=object), np.asarray(ua_weights) / sum(ua_weights))
+
+        # Sayfa havuzu: /bolum/<id> biçiminde içerik sayfaları + sabit sayfalar
+        pages = [f"/{BOLUMLER[k % len(BOLUMLER)]}/{k}" for k in rng.permutation(sayfa_sayisi) + 10]
+        self.sayfa_havuzu = np.asarray(STATIK_SAYFALAR + pages, dtype=object)
+
+    def parca(self, baslangic_sn, bitis_sn, n):
+        # [baslangic_sn, bitis_sn) aralığında zamana göre sıralı n satır
+        rng = self.rng
+        seconds = np.sort(rng.integers(baslangic_sn, max(bitis_sn, baslangic_sn + 1), size=n))
+        timestamps = self.baslangic + pd.to_timedelta(seconds, unit="s")
+
+        is_bot = rng.random(n) < self.bot_orani
+        n_bot = int(is_bot.sum())
+        ua = np.empty(n, dtype=object)
+        ua[~is_bot] = self.ua_havuzu[0][rng.choice(len(self.ua_havuzu[0]), size=n - n_bot, p=self.ua_havuzu[1])]
+        ua[is_bot] = _agirlikli(rng, BOT_UALARI, n_bot)
+        ip = np.empty(n, dtype=object)
+        ip[~is_bot] = self.ip_havuzu[_zipf_indeks(rng, len(self.ip_havuzu), n - n_bot)]
+        ip[is_bot] = self.bot_ip_havuzu[rng.integers(0, len(self.bot_ip_havuzu), size=n_bot)]
+
+        pages = self.sayfa_havuzu[_zipf_indeks(rng, len(self.sayfa_havuzu), n, a=1.1)]
+        referer = _agirlikli(rng, REFERERLER, n)
+        internal = referer == "SITE"
+        referer[internal] = "https://www.ornek-site.com" + self.sayfa_havuzu[
+            _zipf_indeks(rng, len(self.sayfa_havuzu), int(internal.sum()), a=1.1)
+        ]
+        status = _agirlikli(rng, DURUM_KODLARI, n).astype(np.int64)
+
+        return pd.DataFrame({
+            "date": timestamps.strftime("%Y-%m-%d"),
+            "time": timestamps.strftime("%H:%M:%S"),
+            "s-ip": "10.0.0.5",
+            "cs-method": np.where(rng.random(n) < 0.95, "GET", "POST"),
+            "cs-uri-stem": pages,
+            "cs-uri-query": "-",
+            "s-port": np.where(rng.random(n) < 0.9, 443, 80),
+            "cs-username": "-",
+            "c-ip": ip,
+            "cs(User-Agent)": ua,
+            "cs(Referer)": referer,
+            "sc-status": status,
+            "sc-substatus": 0,
+            "sc-win32-status": 0,
+            "time-taken": rng.lognormal(4, 1, size=n).astype(np.int64),
+        }, columns=KOLONLAR)
+
+    def satir_dagilimi(self, satir, chunk_size):
+        # Satırlar günlere ve saatlere trafik ağırlıklarına göre dağıtılır;
+        # her parça kendi zaman aralığına düşer, böylece dosya baştan sona sıralı olur
+        hour_weights = np.tile(np.asarray(SAAT_AGIRLIKLARI, dtype=float), self.gun)
+        hour_weights *= 1 + 0.3 * np.sin(np.arange(len(hour_weights)) / 24 * 2 * np.pi / 7)  # haftalık dalga
+        per_hour = self.rng.multinomial(satir, hour_weights / hour_weights.sum())
+        start, pending = 0, 0
+        for hour, count in enumerate(per_hour):
+            pending += count
+            if pending >= chunk_size or hour == len(per_hour) - 1:
+                yield start * 3600, (hour + 1) * 3600, pending
+                start, pending = hour + 1, 0
+
+
+def uret(cikti, satir, tohum=42, gun=30, chunk_size=200_000):
+    if os.path.exists(cikti):
+        os.remove(cikti)
+    generator = SentetikUretici(tohum=tohum, gun=gun)
+    conn = sqlite3.connect(cikti)
+    try:
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        column_sql = ", ".join(f'"{col}"' for col in KOLONLAR)
+        conn.execute(f"CREATE TABLE logs ({column_sql})")
+        written = 0
+        for start, end, count in generator.satir_dagilimi(satir, chunk_size):
+            if count == 0:
+                continue
+            chunk = generator.parca(start, end, count)
+            chunk.to_sql("logs", conn, index=False, if_exists="append", chunksize=50_000)
+            written += count
+            print(f"{written}/{satir} satır yazıldı")
+        conn.commit()
+    finally:
+        conn.close()
+    return written
+
+
+def satir_sayisi_coz(deger):
+    # "100k", "1m", "10m" ya da doğrudan sayı
+    deger = str(deger).lower().replace("_", "")
+    return HAZIR_BOYUTLAR.get(deger) or int(deger)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ölçüm için sentetik IIS günlükleri içeren data.db üretir.")
+    parser.add_argument("--satir", default="100k", help="Satır sayısı: 100k, 1m, 10m veya bir sayı")
+    parser.add_argument("--cikti", default="data.db", help="Üretilecek dosya")
+    parser.add_argument("--tohum", type=int, default=42, help="Rastgele sayı tohumu (aynı tohum aynı veri)")
+    parser.add_argument("--gun", type=int, default=30, help="Kaç günlük trafik üretileceği")
+    args = parser.parse_args()
+
+    total = uret(args.cikti, satir_sayisi_coz(args.satir), tohum=args.tohum, gun=args.gun)
+    print(f"{args.cikti} oluşturuldu ({total} satır)")
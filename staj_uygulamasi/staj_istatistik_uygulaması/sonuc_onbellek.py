@@ -0,0 +1,215 @@
+import os
+import sys
+import json
+import pickle
+import sqlite3
+import hashlib
+import argparse
+import threading
+from contextlib import closing
+from veri_erisim import db_yolu, sifirla
+from veri_kapsami import kapsam
+
+# === Grafik sonuç önbelleği ===
+# Grafiklerin hesapladığı DataFrame/sözlük/figürler diske pickle olarak
+# yazılır. Anahtar; veritabanının parmak izi (dosya boyutu, değişiklik zamanı,
+# ingest_meta içeriği), analizin adı, parametreleri ve analizi yapan betiğin
+# kendisidir. Veri ve betik değişmediyse grafik tekrar açıldığında hesaplama
+# hiç yapılmaz. Klasör boyutu SONUC_ONBELLEK_MB ile sınırlıdır; aşılınca en
+# uzun süredir kullanılmayan sonuçlar silinir (LRU). 0 verilirse önbellek kapalıdır.
+ONBELLEK_KLASORU = "sonuc_onbellek"
+ONBELLEK_SINIRI_MB = 512
+ORTAM_DEGISKENI = "SONUC_ONBELLEK_MB"
+META_TABLOSU = "ingest_meta"
+UZANTI = ".pkl"
+
+
+def onbellek_siniri():
+    return int(float(os.environ.get(ORTAM_DEGISKENI, ONBELLEK_SINIRI_MB)) * 1024 * 1024)
+
+
+def onbellek_klasoru(yol=None):
+    # Önbellek veritabanının yanında tutulur
+    return os.path.join(os.path.dirname(db_yolu(yol)), ONBELLEK_KLASORU)
+
+
+def _meta_oku(path):
+    # Havuzdaki bir bağlantı os.replace ile değiştirilmiş eski dosyayı okuyor
+    # olabilir; meta her seferinde dosyanın kendisinden, yeni bir bağlantıyla okunur
+    with closing(sqlite3.connect(path)) as conn:
+        if not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (META_TABLOSU,)).fetchone():
+            return {}
+        return dict(conn.execute(f"SELECT anahtar, deger FROM {META_TABLOSU}").fetchall())
+
+
+def db_parmak_izi(yol=None):
+    path = db_yolu(yol)
+    # Okuma sırasında dosya değiştirildiyse meta ile stat aynı dosyaya ait olana kadar tekrar okunur
+    st = os.stat(path)
+    while True:
+        meta = _meta_oku(path)
+        son = os.stat(path)
+        if (son.st_ino, son.st_size, son.st_mtime_ns) == (st.st_ino, st.st_size, st.st_mtime_ns):
+            break
+        st = son
+    # Artımlı ingest WAL'a yazıp henüz dosyaya aktarmamış olabilir; ingest_meta bunu da yakalar
+    icerik = json.dumps([st.st_size, st.st_mtime_ns, sorted(meta.items())])
+    return hashlib.sha1(icerik.encode("utf-8")).hexdigest()
+
+
+def dosya_izi(path):
+    # Sonucu etkileyen yan dosyalar (ör. IP konum CSV'si) parametre olarak verilebilir
+    if not path or not os.path.exists(path):
+        return None
+    st = os.stat(path)
+    return [os.path.basename(path), st.st_size, st.st_mtime_ns]
+
+
+def _betik_izi(hesapla):
+    # Analizi yapan dosya değişince eski sonuçlar kullanılmaz
+    return dosya_izi(getattr(getattr(hesapla, "__code__", None), "co_filename", None))
+
+
+def _dosya_adi(ad, db_izi, anahtar):
+    return f"{ad}-{db_izi[:12]}-{anahtar[:16]}{UZANTI}"
+
+
+def _oku(path):
+    try:
+        with open(path, "rb") as f:
+            sonuc = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return None, False
+    # LRU sırası dosyanın değişiklik zamanıyla tutulur
+    os.utime(path)
+    return sonuc, True
+
+
+def _yaz(klasor, ad, db_izi, path, sonuc):
+    os.makedirs(klasor, exist_ok=True)
+    # Aynı analizin eski veritabanına ait sonuçları bir daha kullanılamaz
+    for name in os.listdir(klasor):
+        if name.startswith(f"{ad}-") and not name.startswith(f"{ad}-{db_izi[:12]}-"):
+            os.remove(os.path.join(klasor, name))
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(sonuc, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+    _sigdir(klasor, korunan=path)
+
+
+def _sigdir(klasor, korunan=None):
+    limit = onbellek_siniri()
+    files = []
+    for name in os.listdir(klasor):
+        if name.endswith(UZANTI):
+            # Aynı anda çalışan başka bir süreç (toplu_rapor.py) dosyayı silmiş olabilir
+            try:
+                st = os.stat(os.path.join(klasor, name))
+            except FileNotFoundError:
+                continue
+            files.append((st.st_mtime_ns, st.st_size, os.path.join(klasor, name)))
+    total = sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):
+        if total <= limit:
+            break
+        # Sınırdan büyük tek bir sonuç bile saklanmaz
+        if path == korunan and size <= limit:
+            continue
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+
+
+def onbellekli(ad, hesapla, parametreler=None, yol=None):
+    # hesapla() sonucunu önbellekten döndürür; yoksa hesaplayıp kaydeder
+    if onbellek_siniri() <= 0 or not os.path.exists(db_yolu(yol)):
+        return hesapla()
+    db_izi = db_parmak_izi(yol)
+    icerik = [ad, parametreler or {}, _betik_izi(hesapla)]
+    # analiz.py ile daraltılmış sonuçlar tüm verinin sonucuyla karışmaz
+    if kapsam():
+        icerik.append(kapsam())
+    anahtar = hashlib.sha1(json.dumps(icerik, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    klasor = onbellek_klasoru(yol)
+    path = os.path.join(klasor, _dosya_adi(ad, db_izi, anahtar))
+
+    if os.path.exists(path):
+        sonuc, bulundu = _oku(path)
+        if bulundu:
+            print(f"{ad}: sonuç önbellekten okundu")
+            return sonuc
+
+    sonuc = hesapla()
+    try:
+        _yaz(klasor, ad, db_izi, path, sonuc)
+    except (OSError, pickle.PicklingError, TypeError, AttributeError) as e:
+        # Önbellek yazılamazsa (disk dolu, pickle edilemeyen nesne) sonuç yine döner
+        print(f"{ad}: sonuç önbelleğe yazılamadı: {e}", file=sys.stderr)
+    return sonuc
+
+
+# Uzun ömürlü süreçlerde (Dash sunucusu) sonuçlar ayrıca bellekte tutulur;
+# veritabanının parmak izi değişince sonuç yeniden okunur/hesaplanır
+_bellek = {}
+_bellek_kilidi = threading.Lock()
+_kilitler = {}
+
+
+def bellekte(ad, hesapla, parametreler=None, yol=None):
+    db_izi = db_parmak_izi(yol) if os.path.exists(db_yolu(yol)) else None
+    anahtar = (ad, json.dumps([parametreler or {}, kapsam()], sort_keys=True, default=str), db_yolu(yol))
+    with _bellek_kilidi:
+        kilit = _kilitler.setdefault(anahtar, threading.Lock())
+    # Aynı sonucu isteyen iki istek hesaplamayı iki kez yapmaz
+    with kilit:
+        kayit = _bellek.get(anahtar)
+        if kayit is not None and kayit[0] == db_izi:
+            return kayit[1]
+        if kayit is not None:
+            # Veri yeniden ingest edildi: hesaplama eski dosyaya bağlı motor ve
+            # boyut önbelleğiyle yapılırsa eski sonuç yeni parmak iziyle diske yazılır
+            sifirla(yol)
+        sonuc = onbellekli(ad, hesapla, parametreler, yol)
+        _bellek[anahtar] = (db_izi, sonuc)
+        return sonuc
+
+
+def temizle(yol=None):
+    klasor = onbellek_klasoru(yol)
+    if not os.path.isdir(klasor):
+        return 0
+    names = [name for name in os.listdir(klasor) if name.endswith(UZANTI)]
+    for name in names:
+        os.remove(os.path.join(klasor, name))
+    return len(names)
+
+
+def durum(yol=None):
+    klasor = onbellek_klasoru(yol)
+    if not os.path.isdir(klasor):
+        return []
+    rows = []
+    for name in sorted(os.listdir(klasor)):
+        if name.endswith(UZANTI):
+            st = os.stat(os.path.join(klasor, name))
+            rows.append((name, st.st_size))
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Grafik sonuç önbelleğini listeler veya temizler")
+    parser.add_argument("--db", help="Veritabanı yolu (varsayılan: DUZENLI_DB veya duzenli_data.db)")
+    parser.add_argument("--temizle", action="store_true", help="Tüm kayıtlı sonuçları siler")
+    args = parser.parse_args()
+
+    if args.temizle:
+        print(f"{temizle(args.db)} sonuç silindi.")
+    else:
+        rows = durum(args.db)
+        for name, size in rows:
+            print(f"{size / 1024:10.1f} KB  {name}")
+        total = sum(size for _, size in rows)
+        print(f"Toplam {len(rows)} sonuç, {total / 1024 / 1024:.1f} MB (sınır {onbellek_siniri() / 1024 / 1024:.0f} MB)")
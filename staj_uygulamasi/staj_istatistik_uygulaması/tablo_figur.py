@@ -0,0 +1,23 @@
+# === Karşılaştırma tabloları için Plotly figürü ===
+# Statik rapor (toplu_rapor.py) Dash DataTable'ı çizemediği için karşılaştırma
+# tabloları (tarayıcı, IP konum) aynı renklendirmeyle Plotly tablosu olarak
+# yazılır: artış yeşil, azalış kırmızı. plotly sadece çağrılınca yüklenir.
+
+
+def karsilastirma_tablosu(df, artis_kolonu, baslik):
+    import plotly.graph_objects as go
+
+    artis = df[artis_kolonu].astype(str)
+    zemin = ["#f2dede" if v.startswith("-") else "#dff0d8" if v.startswith("+") else "white" for v in artis]
+    yazi = ["#a10000" if v.startswith("-") else "#006400" if v.startswith("+") else "black" for v in artis]
+    renkli = [col == artis_kolonu for col in df.columns]
+    fill = [zemin if r else ["white"] * len(df) for r in renkli]
+    font = [yazi if r else ["black"] * len(df) for r in renkli]
+
+    fig = go.Figure(go.Table(
+        header=dict(values=list(df.columns), fill_color="#f4f4f4", font=dict(family="Arial")),
+        cells=dict(values=[df[col] for col in df.columns], fill_color=fill,
+                   font=dict(family="Arial", color=font), align="center"),
+    ))
+    fig.update_layout(title=baslik, height=max(400, 30 * len(df) + 150))
+    return fig
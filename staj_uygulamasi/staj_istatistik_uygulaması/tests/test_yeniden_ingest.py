@@ -0,0 +1,81 @@
+import os
+import sys
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sonuc_onbellek
+import veri_erisim
+from boyut_tablolari import KODLU_TABLO, BoyutKodlayici, logs_gorunumu_olustur
+
+# === Çalışan süreç altında veritabanının yeniden oluşturulması ===
+# Yeniden ingest yeni dosyayı yazıp os.replace ile eskisinin yerine koyar.
+# Açık kalan süreç (Dash sunucusu) eski dosyaya bağlı motoru, yansıtılmış
+# tabloları ve boyut önbelleğini kullanmaya devam etmemeli.
+cagrilar = []
+
+
+def db_olustur(path, tarayicilar, surum):
+    engine = create_engine(f"sqlite:///{path}")
+    df = pd.DataFrame({"date": "2025-07-01", "browser": tarayicilar, "is_bot": 0})
+    with engine.begin() as conn:
+        BoyutKodlayici().kodla(conn, df).to_sql(KODLU_TABLO, conn, index=False)
+        logs_gorunumu_olustur(conn)
+        conn.execute(text("CREATE TABLE ingest_meta (anahtar TEXT PRIMARY KEY, deger TEXT)"))
+        conn.execute(text("INSERT INTO ingest_meta VALUES ('surum', :surum)"), {"surum": surum})
+    engine.dispose()
+
+
+def yeniden_ingest(klasor, tarayicilar, surum):
+    yeni = os.path.join(klasor, f"yeni_{surum}.db")
+    db_olustur(yeni, tarayicilar, surum)
+    os.replace(yeni, os.path.join(klasor, "canli.db"))
+
+
+def tarayici_sayimi():
+    cagrilar.append(1)
+    return veri_erisim.oku(["browser"], kodlu=True)["browser"].astype(str).value_counts().to_dict()
+
+
+@pytest.fixture
+def canli_db(tmp_path, monkeypatch):
+    monkeypatch.setenv(veri_erisim.ORTAM_DEGISKENI, str(tmp_path / "canli.db"))
+    monkeypatch.setenv(sonuc_onbellek.ORTAM_DEGISKENI, "64")
+    monkeypatch.delenv("VERI_KAPSAMI", raising=False)
+    veri_erisim.sifirla()
+    sonuc_onbellek._bellek.clear()
+    cagrilar.clear()
+    # İlk ingest: Chrome=1, Safari=2
+    yeniden_ingest(str(tmp_path), ["Chrome", "Chrome", "Safari"], "1")
+    yield str(tmp_path)
+    veri_erisim.sifirla()
+
+
+def test_okuma_yeni_dosyayi_gorur(canli_db):
+    assert veri_erisim.satir_sayisi() == 3
+    assert tarayici_sayimi() == {"Chrome": 2, "Safari": 1}
+
+    # Yeni dosyada aynı anahtarlar başka tarayıcılara karşılık gelir: Safari=1, Firefox=2
+    yeniden_ingest(canli_db, ["Safari", "Firefox", "Safari", "Safari"], "2")
+
+    assert veri_erisim.satir_sayisi() == 4
+    assert tarayici_sayimi() == {"Safari": 3, "Firefox": 1}
+
+
+def test_bellekte_eski_sonucu_diske_yazmaz(canli_db):
+    assert sonuc_onbellek.bellekte("tarayici", tarayici_sayimi) == {"Chrome": 2, "Safari": 1}
+    assert sonuc_onbellek.bellekte("tarayici", tarayici_sayimi) == {"Chrome": 2, "Safari": 1}
+    assert len(cagrilar) == 1
+
+    yeniden_ingest(canli_db, ["Safari", "Firefox", "Safari", "Safari"], "2")
+
+    beklenen = {"Safari": 3, "Firefox": 1}
+    assert sonuc_onbellek.bellekte("tarayici", tarayici_sayimi) == beklenen
+    assert len(cagrilar) == 2
+
+    # Sonraki bir süreç aynı sonucu diskten okur ve doğru değeri bulur
+    sonuc_onbellek._bellek.clear()
+    assert sonuc_onbellek.onbellekli("tarayici", tarayici_sayimi) == beklenen
+    assert len(cagrilar) == 2
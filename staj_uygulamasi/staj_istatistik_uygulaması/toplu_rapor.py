@@ -0,0 +1,208 @@
+import os
+import sys
+import html
+import json
+import time
+import argparse
+import datetime
+import traceback
+import multiprocessing
+import concurrent.futures
+from grafikler import GRAFIKLER, modul_adi, modul_yukle
+from veri_kapsami import kapsam_aciklamasi
+
+# === Ekransız toplu rapor ===
+# Gece çalışan iş için: tüm grafikler pencere ya da tarayıcı açmadan bir
+# klasöre yazılır ve index.html hepsini tek sayfada listeler. Matplotlib
+# grafikleri Agg backend ile PNG/SVG, Dash sayfaları ise figurler(sonuc)
+# ile üretilen Plotly figürleriyle statik HTML olur (plotly.js klasöre bir kez
+# yazılır, rapor internetsiz açılır).
+#
+# Grafikler bir işlem havuzunda aynı anda hesaplanır. Havuz forkserver ile
+# başlar; pandas/matplotlib/plotly bir kez yüklenir (isci_havuzu.ON_YUKLENECEKLER).
+#
+# Ortak bir DataFrame yüklenip işçilere verilmez: her işçi kendi sorgusunu
+# SQLite'a gönderir. Grafikler farklı kolon ve filtrelerle okur, sayımların
+# çoğu SQLite'ta (grupla, özet tabloları) yapılır; ortak bir temel tablo bütün
+# kolonlarıyla tüm log demektir (200 bin satırda ~230 MB) ve her işçiye
+# kopyalanması grafiklerin okuduklarının toplamından pahalıdır. Paylaşılan
+# şey diskteki okumadır: başlamadan önce dosya işletim sisteminin sayfa
+# önbelleğine alınır ve işçiler aynı sayfaları mmap ile okur. Sonuçlar
+# sonuc_onbellek'e yazıldığı için veri değişmediyse ikinci çalıştırma sadece
+# çizim kadar sürer.
+RAPOR_KLASORU = "raporlar"
+BICIMLER = ("png", "svg")
+PLOTLY_JS = "plotly.min.js"
+OZET_DOSYASI = "rapor.json"
+DPI = 120
+
+
+def _hazirla():
+    # İşçi süreci: ekran yok, grafiklerin kendi işlem havuzları platform varsayılanını kullanır
+    import matplotlib
+    matplotlib.use("Agg")
+    multiprocessing.set_start_method(None, force=True)
+
+
+def db_isit(yol=None):
+    # Çekirdekten dosyayı önceden okumasını ister; bellek bu süreçte tutulmaz
+    from veri_erisim import db_yolu
+
+    path = db_yolu(yol)
+    if not os.path.exists(path) or not hasattr(os, "posix_fadvise"):
+        return
+    for p in (path, f"{path}-wal"):
+        if os.path.exists(p):
+            fd = os.open(p, os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            finally:
+                os.close(fd)
+
+
+def html_yaz(path, baslik, figs):
+    parcalar = [fig.to_html(full_html=False, include_plotlyjs=False) for fig in figs]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(
+            "<!DOCTYPE html>\n<html><head><meta charset='utf-8'>"
+            f"<title>{html.escape(baslik)}</title>"
+            f"<script src='{PLOTLY_JS}'></script></head>"
+            "<body style='font-family: Arial'>"
+            f"<p><a href='index.html'>&larr; Rapor</a></p><h2>{html.escape(baslik)}</h2>\n"
+            + "\n".join(parcalar)
+            + "\n</body></html>\n"
+        )
+
+
+def grafik_uret(filename, klasor, bicimler, ayarlar=None):
+    # İşçide çalışır; hata olursa rapor diğer grafiklerle devam eder.
+    # ayarlar: grafik modülünde varsa değiştirilecek değişkenler (ör. {"interval_hours": 2})
+    ad = modul_adi(filename)
+    start = time.perf_counter()
+    kayit = {"dosya": filename, "ciktilar": [], "hesap": None, "sure": None, "hata": None}
+    try:
+        m = modul_yukle(filename)
+        for key, value in (ayarlar or {}).items():
+            if hasattr(m, key):
+                setattr(m, key, value)
+        sonuc = m.veri()
+        kayit["hesap"] = time.perf_counter() - start
+
+        if hasattr(m, "ciz"):
+            import matplotlib.pyplot as plt
+            try:
+                fig = m.ciz(sonuc)
+                for bicim in bicimler:
+                    name = f"{ad}.{bicim}"
+                    fig.savefig(os.path.join(klasor, name), dpi=DPI, bbox_inches="tight")
+                    kayit["ciktilar"].append(name)
+            finally:
+                plt.close("all")
+        else:
+            name = f"{ad}.html"
+            html_yaz(os.path.join(klasor, name), m.BASLIK, m.figurler(sonuc))
+            kayit["ciktilar"].append(name)
+    except Exception as e:
+        traceback.print_exc()
+        kayit["hata"] = f"{type(e).__name__}: {e}"
+    kayit["sure"] = time.perf_counter() - start
+    return kayit
+
+
+def index_yaz(klasor, kayitlar, etiketler, baslangic, toplam):
+    satirlar = []
+    for kayit in kayitlar:
+        label = html.escape(etiketler[kayit["dosya"]])
+        if kayit["hata"]:
+            icerik = f"<p style='color: #a10000'>Üretilemedi: {html.escape(kayit['hata'])}</p>"
+        else:
+            linkler = " ".join(f"<a href='{name}'>{name.rsplit('.', 1)[1].upper()}</a>" for name in kayit["ciktilar"])
+            resim = next((name for name in kayit["ciktilar"] if name.endswith((".png", ".svg"))), None)
+            icerik = f"<p>{linkler}</p>"
+            if resim:
+                icerik += f"<a href='{resim}'><img src='{resim}' style='max-width: 100%; max-height: 400px'></a>"
+        satirlar.append(
+            f"<div style='margin-bottom: 40px'><h3>{label}</h3>{icerik}"
+            f"<p style='color: #777'>{kayit['sure']:.1f} sn</p></div>"
+        )
+
+    with open(os.path.join(klasor, "index.html"), "w", encoding="utf-8") as f:
+        f.write(
+            "<!DOCTYPE html>\n<html><head><meta charset='utf-8'><title>Platin360 Raporu</title></head>"
+            "<body style='font-family: Arial; margin: 20px'>"
+            f"<h1>Platin360 Raporu</h1><p>{baslangic:%Y-%m-%d %H:%M} &middot; "
+            f"{len(kayitlar)} grafik &middot; {toplam:.1f} sn &middot; kapsam: {html.escape(kapsam_aciklamasi())}</p>\n"
+            + "\n".join(satirlar)
+            + "\n</body></html>\n"
+        )
+
+
+def rapor_uret(grafikler, klasor, bicimler=("png",), isci=None, ayarlar=None):
+    os.makedirs(klasor, exist_ok=True)
+    baslangic = datetime.datetime.now()
+    start = time.perf_counter()
+
+    # Dash sayfaları için plotly.js bir kez yazılır
+    if any(not hasattr(modul_yukle(filename), "ciz") for filename, _ in grafikler):
+        from plotly.offline import get_plotlyjs
+        with open(os.path.join(klasor, PLOTLY_JS), "w", encoding="utf-8") as f:
+            f.write(get_plotlyjs())
+
+    db_isit()
+
+    ctx = None
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        from isci_havuzu import ON_YUKLENECEKLER
+        ctx = multiprocessing.get_context("forkserver")
+        ctx.set_forkserver_preload(ON_YUKLENECEKLER)
+
+    isci = isci or min(len(grafikler), os.cpu_count() or 1)
+    kayitlar = {}
+    with concurrent.futures.ProcessPoolExecutor(max_workers=isci, mp_context=ctx, initializer=_hazirla) as executor:
+        futures = {
+            executor.submit(grafik_uret, filename, klasor, bicimler, ayarlar): filename
+            for filename, _ in grafikler
+        }
+        for future in concurrent.futures.as_completed(futures):
+            filename = futures[future]
+            try:
+                kayit = future.result()
+            except Exception as e:
+                # İşçi süreci çöktüyse (bellek yetmedi vb.)
+                kayit = {"dosya": filename, "ciktilar": [], "hesap": None, "sure": 0.0,
+                         "hata": f"{type(e).__name__}: {e}"}
+            kayitlar[filename] = kayit
+            durum = kayit["hata"] or ", ".join(kayit["ciktilar"])
+            print(f"{filename}: {kayit['sure']:.1f} sn -> {durum}")
+
+    toplam = time.perf_counter() - start
+    sirali = [kayitlar[filename] for filename, _ in grafikler]
+    index_yaz(klasor, sirali, dict(grafikler), baslangic, toplam)
+    with open(os.path.join(klasor, OZET_DOSYASI), "w", encoding="utf-8") as f:
+        json.dump({"baslangic": baslangic.isoformat(timespec="seconds"), "sure": toplam,
+                   "kapsam": kapsam_aciklamasi(), "grafikler": sirali},
+                  f, ensure_ascii=False, indent=2)
+    return sirali, toplam
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tüm grafikleri ekran açmadan bir klasöre yazar")
+    parser.add_argument("grafikler", nargs="*", help="Sadece bu dosyalar (varsayılan: tüm grafikler)")
+    parser.add_argument("--cikti", help=f"Çıktı klasörü (varsayılan: {RAPOR_KLASORU}/<bugünün tarihi>)")
+    parser.add_argument("--bicim", nargs="+", choices=BICIMLER, default=["png"],
+                        help="Matplotlib grafiklerinin dosya biçimleri")
+    parser.add_argument("--isci", type=int, help="Aynı anda çalışacak grafik sayısı (varsayılan: çekirdek sayısı)")
+    args = parser.parse_args()
+
+    # Göreli yollar (data/, veritabanı) grafiklerin klasörüne göre çözülür
+    klasor = os.path.abspath(args.cikti) if args.cikti else None
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    klasor = klasor or os.path.abspath(os.path.join(RAPOR_KLASORU, f"{datetime.date.today():%Y-%m-%d}"))
+    os.environ["MPLBACKEND"] = "Agg"
+
+    secilen = [(f, label) for f, label in GRAFIKLER if not args.grafikler or f in args.grafikler]
+    kayitlar, toplam = rapor_uret(secilen, klasor, args.bicim, args.isci)
+
+    hatalar = [kayit for kayit in kayitlar if kayit["hata"]]
+    print(f"\nRapor: {os.path.join(klasor, 'index.html')} ({toplam:.1f} sn, {len(hatalar)} hata)")
+    sys.exit(1 if hatalar else 0)
@@ -1,22 +1,16 @@
+import sys
 import pandas as pd
-from sqlalchemy import create_engine, MetaData, Table, select
-from dash import Dash, dcc, html, Output, Input
-import plotly.graph_objects as go
-import flask, threading, webbrowser, requests
+from veri_erisim import oku
+from sonuc_onbellek import bellekte
 
-# DB bağlantısı
-engine = create_engine("sqlite:///data.db")
-metadata = MetaData()
-metadata.reflect(bind=engine)
-logs = Table("logs", metadata, autoload_with=engine)
+BASLIK = "Trafik Yoğunluğu"
 
 # === Veriyi işle ===
 def get_processed_data():
-    stmt = select(
-        logs.c["date"], logs.c["time"], logs.c["c-ip"], logs.c["cs-uri-stem"], logs.c["sc-status"], logs.c["is_bot"]
-    ).where(logs.c["sc-status"] == 200).where(logs.c["is_bot"] == 0)
-
-    df = pd.read_sql(stmt, con=engine)
+    df = oku(
+        ["date", "time", "c-ip", "cs-uri-stem", "sc-status", "is_bot"],
+        filtreler=[("sc-status", "==", 200), ("is_bot", "==", 0)],
+    )
     df.columns = ["date", "time", "ip", "page", "status", "is_bot"]
 
     def son_iki_rakam_mi(s):
@@ -53,8 +47,6 @@ def get_processed_data():
 
     return pd.DataFrame(rows)
 
-df = get_processed_data()
-
 def sayfa_frekans(df, kolon_adi):
     all_pages = df[kolon_adi].dropna().astype(str).str.split(',')
     flat_list = [p.strip() for sublist in all_pages for p in sublist if p.strip() not in ['/', '/arama']]
@@ -74,24 +66,27 @@ def gunluk_toplam_ziyaret(df):
 
     return df.groupby("date")[["ana_sayfa_ziyaret", "arama_ziyaret"]].sum().reset_index()
 
-toplam_ziyaret = gunluk_toplam_ziyaret(df)
+def ziyaretleri_hesapla():
+    df = get_processed_data()
+    toplam_ziyaret = gunluk_toplam_ziyaret(df)
+    return df, toplam_ziyaret
+
+def veri():
+    return bellekte("trafik_yogunluk", ziyaretleri_hesapla)
+
+# === Dash sayfası ===
+def layout():
+    from dash import dcc, html
 
-# === Dash Uygulaması ===
-server = flask.Flask(__name__)
-app = Dash(__name__, server=server)
+    return html.Div([
+        html.H2("📊 Günlük Ziyaretler (Ana Sayfa / Arama Sonrası)", style={"textAlign": "center"}),
+        dcc.Graph(id='trafik-ziyaret-grafik'),
+        html.Div(id='trafik-detaylar'),
+    ])
 
-app.layout = html.Div([
-    html.H2("📊 Günlük Ziyaretler (Ana Sayfa / Arama Sonrası)", style={"textAlign": "center"}),
-    dcc.Graph(id='gunluk-ziyaret-grafik'),
-    html.Div(id='detay-grafikler'),
-    html.Button("Sayfayı Durdur", id="stop-btn", n_clicks=0, style={"margin": "20px", "backgroundColor": "crimson", "color": "white"})
-])
+def gunluk_figur(toplam_ziyaret):
+    import plotly.graph_objects as go
 
-@app.callback(
-    Output('gunluk-ziyaret-grafik', 'figure'),
-    Input('gunluk-ziyaret-grafik', 'clickData')
-)
-def goster_gunluk_grafik(clickData):
     fig = go.Figure()
     fig.add_trace(go.Bar(
         x=toplam_ziyaret['date'],
@@ -116,16 +111,9 @@ def goster_gunluk_grafik(clickData):
     )
     return fig
 
-@app.callback(
-    Output('detay-grafikler', 'children'),
-    Input('gunluk-ziyaret-grafik', 'clickData')
-)
-def goster_detaylar(clickData):
-    if clickData is None:
-        return html.Div("Bir tarih seçin")
-
-    secilen = clickData['points'][0]['x']
-    df_gun = df[df['date'] == secilen]
+def detay_figurleri(df_gun):
+    # (başlık, figür) listesi; boş kalan taraf için figür üretilmez
+    import plotly.graph_objects as go
 
     ana_df = df_gun[df_gun['slash_sonrasi_sayfalar'].notna()]
     arama_df = df_gun[df_gun['arama_sonrasi_sayfalar'].notna()]
@@ -133,7 +121,7 @@ def goster_detaylar(clickData):
     ana_freq = sayfa_frekans(ana_df, 'slash_sonrasi_sayfalar')
     arama_freq = sayfa_frekans(arama_df, 'arama_sonrasi_sayfalar')
 
-    children = []
+    figs = []
 
     if not ana_freq.empty:
         fig = go.Figure(go.Bar(
@@ -143,8 +131,7 @@ def goster_detaylar(clickData):
             textposition='outside'
         ))
         fig.update_layout(title="Ana Sayfa Sonrası En Çok Gidilen Sayfalar", xaxis_title="Sayfa", yaxis_title="Ziyaret")
-        children.append(html.H4("Ana Sayfa Sonrası"))
-        children.append(dcc.Graph(figure=fig))
+        figs.append(("Ana Sayfa Sonrası", fig))
 
     if not arama_freq.empty:
         fig = go.Figure(go.Bar(
@@ -154,31 +141,47 @@ def goster_detaylar(clickData):
             textposition='outside'
         ))
         fig.update_layout(title="Arama Sonrası En Çok Gidilen Sayfalar", xaxis_title="Sayfa", yaxis_title="Ziyaret")
-        children.append(html.H4("Arama Sonrası"))
-        children.append(dcc.Graph(figure=fig))
-
-    return html.Div(children)
-
-@app.callback(
-    Output('stop-btn', 'disabled'),
-    Input('stop-btn', 'n_clicks')
-)
-@app.callback(
-    Output('stop-btn', 'children'),
-    Input('stop-btn', 'n_clicks'),
-    prevent_initial_call=True
-)
-def durdur(n):
-    if n > 0:
-        threading.Thread(target=lambda: requests.post("http://127.0.0.1:9020/shutdown")).start()
-        return "Kapatılıyor..."
-    return "Sayfayı Durdur"
-
-
-# === Otomatik aç ===
-def open_browser():
-    webbrowser.open_new("http://127.0.0.1:9020")
+        figs.append(("Arama Sonrası", fig))
+
+    return figs
+
+def figurler(sonuc):
+    # Statik rapor (toplu_rapor.py): günlük grafik ve tüm dönemin detayları
+    df, toplam_ziyaret = sonuc
+    return [gunluk_figur(toplam_ziyaret)] + [fig for _, fig in detay_figurleri(df)]
+
+def kaydet(app):
+    from dash import dcc, html, Output, Input
+
+    @app.callback(
+        Output('trafik-ziyaret-grafik', 'figure'),
+        Input('trafik-ziyaret-grafik', 'clickData')
+    )
+    def goster_gunluk_grafik(clickData):
+        _, toplam_ziyaret = veri()
+        return gunluk_figur(toplam_ziyaret)
+
+    @app.callback(
+        Output('trafik-detaylar', 'children'),
+        Input('trafik-ziyaret-grafik', 'clickData')
+    )
+    def goster_detaylar(clickData):
+        if clickData is None:
+            return html.Div("Bir tarih seçin")
+
+        df, _ = veri()
+        secilen = clickData['points'][0]['x']
+        df_gun = df[df['date'] == secilen]
+
+        children = []
+        for baslik, fig in detay_figurleri(df_gun):
+            children.append(html.H4(baslik))
+            children.append(dcc.Graph(figure=fig))
+
+        return html.Div(children)
+
 
+# === Tek başına çalıştırma ===
 if __name__ == '__main__':
-    threading.Timer(1.0, open_browser).start()
-    app.run(debug=False, port=9020)
+    from dash_sunucu import tek_sayfa_calistir
+    tek_sayfa_calistir(sys.modules[__name__], port=9020)
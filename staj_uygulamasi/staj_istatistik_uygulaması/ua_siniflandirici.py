@@ -0,0 +1,330 @@
+import re
+import sys
+import time
+import argparse
+import random
+
+# === Hızlı UA sınıflandırıcı ===
+# user_agents.parse her metin için yüzlerce regex dener. Trafiğin çoğu birkaç
+# kalıptan oluştuğu (Windows/Mac/Linux Chrome-Edge-Opera-Firefox, Android
+# Chrome, iPhone/iPad Safari, bilinen botlar) için bu kalıplar baştan sona
+# (fullmatch) tutan derlenmiş regex'lerle doğrudan sınıflandırılır. Kalıba
+# birebir uymayan her metin None döner ve user_agents ile çözümlenir.
+#
+# Sonuçlar data_siralama.parse_user_agent ile aynı olmalıdır:
+#   python ua_siniflandirici.py --dogrula
+UA_KOLONLARI = ["browser", "browser_version", "os", "os_version", "device", "is_mobile", "is_pc", "is_bot"]
+
+# ua-parser'ın Windows NT sürümü -> Windows sürümü eşlemesi; listede olmayanlar user_agents'a gider
+WINDOWS_SURUMLERI = {"10.0": "10", "6.3": "8.1", "6.2": "8", "6.1": "7", "6.0": "Vista", "5.1": "XP"}
+
+# Sürümler tek grup olarak alınır; ua-parser sayıları int'e çevirdiği için
+# baştaki sıfırlı parçalar ("07") kalıba uymaz, user_agents'a bırakılır
+_N = r"(?:0|[1-9]\d*)"
+_S3 = rf"({_N}\.{_N}\.{_N})\.\d+"  # Chrome/120.0.6099.144 -> 120.0.6099 (ua-parser ilk üç parçayı alır)
+_CHROMIUM = r"AppleWebKit/537\.36 \(KHTML, like Gecko\) Chrome/" + _S3
+_ACIK_ADI = {None: "Chrome", "Edg": "Edge", "OPR": "Opera"}
+
+KALIPLAR = {
+    "windows_chromium": re.compile(
+        r"Mozilla/5\.0 \(Windows NT (\d+\.\d+)(?:; Win64; x64|; WOW64)?\) " + _CHROMIUM
+        + r" Safari/537\.36(?: (Edg|OPR)/" + _S3 + r")?"
+    ),
+    "windows_firefox": re.compile(
+        r"Mozilla/5\.0 \(Windows NT (\d+\.\d+)(?:; Win64; x64|; WOW64)?; rv:\d+\.\d+\) "
+        rf"Gecko/20100101 Firefox/({_N}\.{_N})"
+    ),
+    "mac_chromium": re.compile(
+        rf"Mozilla/5\.0 \(Macintosh; Intel Mac OS X ({_N}_{_N}(?:_{_N})?)\) " + _CHROMIUM
+        + r" Safari/537\.36(?: (Edg|OPR)/" + _S3 + r")?"
+    ),
+    "mac_safari": re.compile(
+        rf"Mozilla/5\.0 \(Macintosh; Intel Mac OS X ({_N}_{_N}(?:_{_N})?)\) AppleWebKit/605\.1\.15 "
+        rf"\(KHTML, like Gecko\) Version/({_N}\.{_N}(?:\.{_N})?) Safari/605\.1\.15"
+    ),
+    "linux_chrome": re.compile(
+        r"Mozilla/5\.0 \(X11; Linux x86_64\) " + _CHROMIUM + r" Safari/537\.36"
+    ),
+    "android_chrome": re.compile(
+        rf"Mozilla/5\.0 \(Linux; Android ({_N}(?:\.{_N}){{0,2}})(?:; (K|SM-[AGS]\d{{3}}[A-Z]?))?\) "
+        + _CHROMIUM + r" Mobile Safari/537\.36"
+    ),
+    "ios_safari": re.compile(
+        rf"Mozilla/5\.0 \((iPhone; CPU iPhone|iPad; CPU) OS ({_N}_{_N}(?:_{_N})?) like Mac OS X\) "
+        r"AppleWebKit/605\.1\.15 \(KHTML, like Gecko\) "
+        rf"(?:Version/({_N}\.{_N}(?:\.{_N})?)|CriOS/" + _S3 + r") Mobile/15E148 Safari/604\.1"
+    ),
+    # IIS'te "; +http://" "++http://" olarak yazılır, "+"lar boşluğa çevrilince
+    # "+" kaybolur ve iki boşluk kalır; iki biçim de kabul edilir
+    "bot": re.compile(
+        r"Mozilla/5\.0 \(compatible; (?:Googlebot|bingbot|YandexBot|AhrefsBot|DotBot)/"
+        rf"({_N}\.{_N});\s+\+?https?://[\w./-]+\)"
+    ),
+}
+
+
+def _windows_chromium(m):
+    nt, chrome, ek, ek_version = m.groups()
+    os_version = WINDOWS_SURUMLERI.get(nt)
+    if os_version is None:
+        return None
+    return (_ACIK_ADI[ek], ek_version or chrome, "Windows", os_version, "Unknown", False, True, False)
+
+
+def _windows_firefox(m):
+    nt, version = m.groups()
+    os_version = WINDOWS_SURUMLERI.get(nt)
+    if os_version is None:
+        return None
+    return ("Firefox", version, "Windows", os_version, "Unknown", False, True, False)
+
+
+def _mac_chromium(m):
+    mac, chrome, ek, ek_version = m.groups()
+    return (_ACIK_ADI[ek], ek_version or chrome, "Mac OS X", mac.replace("_", "."), "Mac", False, True, False)
+
+
+def _mac_safari(m):
+    mac, version = m.groups()
+    return ("Safari", version, "Mac OS X", mac.replace("_", "."), "Mac", False, True, False)
+
+
+def _linux_chrome(m):
+    return ("Chrome", m.group(1), "Linux", "", "Unknown", False, True, False)
+
+
+def _android_chrome(m):
+    android, model, chrome = m.groups()
+    if model is None:
+        device = "Generic Smartphone"
+    elif model == "K":
+        # Kısaltılmış UA'daki "K" sadece "Android 10" gibi tek sayılı sürümle cihaz adı olur
+        if "." in android:
+            return None
+        device = "K"
+    else:
+        # Sadece doğrulanan telefon serileri (A/G/S); tabletlerde (SM-T) marka eklenmez
+        device = "Samsung " + model
+    return ("Chrome", chrome, "Android", android, device, True, False, False)
+
+
+def _ios_safari(m):
+    cihaz, ios, safari, crios = m.groups()
+    iphone = cihaz.startswith("iPh")
+    # CriOS metninde "chrome" geçmediği için detect_browser Safari der
+    return ("Safari", safari or crios, "iOS", ios.replace("_", "."), "iPhone" if iphone else "iPad", iphone, False, False)
+
+
+def _bot(m):
+    return ("Other Browser", m.group(1), "Other", "", "Spider", False, False, True)
+
+
+def _kaliplar(*names):
+    builders = {
+        "windows_chromium": _windows_chromium, "windows_firefox": _windows_firefox,
+        "mac_chromium": _mac_chromium, "mac_safari": _mac_safari, "linux_chrome": _linux_chrome,
+        "android_chrome": _android_chrome, "ios_safari": _ios_safari, "bot": _bot,
+    }
+    return [(KALIPLAR[name].fullmatch, builders[name]) for name in names]
+
+
+# "Mozilla/5.0 (" sonrasındaki üç karaktere göre sadece ilgili kalıplar denenir
+_ON_EK = "Mozilla/5.0 ("
+_DAGITIM = {
+    "Win": _kaliplar("windows_chromium", "windows_firefox"),
+    "Mac": _kaliplar("mac_chromium", "mac_safari"),
+    "X11": _kaliplar("linux_chrome"),
+    "Lin": _kaliplar("android_chrome"),
+    "iPh": _kaliplar("ios_safari"),
+    "iPa": _kaliplar("ios_safari"),
+    "com": _kaliplar("bot"),
+}
+
+
+def siniflandir(ua_clean):
+    # "+" işaretleri boşluğa çevrilmiş UA metni için UA_KOLONLARI sırasında
+    # bir tuple, emin olunamazsa None döner
+    if not ua_clean.startswith(_ON_EK):
+        return None
+    for fullmatch, build in _DAGITIM.get(ua_clean[13:16], ()):
+        m = fullmatch(ua_clean)
+        if m is not None:
+            return build(m)
+    return None
+
+
+def toplu_siniflandir(ua_list):
+    # Ham (IIS'teki gibi "+"lı) UA'lar: {ua: sonuç sözlüğü} ve sınıflandırılamayanlar
+    found = {}
+    missing = []
+    for ua in ua_list:
+        result = siniflandir(ua.replace("+", " "))
+        if result is None:
+            missing.append(ua)
+        else:
+            found[ua] = dict(zip(UA_KOLONLARI, result))
+    return found, missing
+
+
+# === Doğrulama kümesi ===
+# Her kalıp için farklı sürüm/OS/cihaz kombinasyonları ile kalıba uymaması
+# (user_agents'a düşmesi) gereken örnekler
+_DUSMESI_GEREKENLER = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 Brave/120",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 YaBrowser/24.1.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 6.4; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) Gecko/20100101 Firefox/115.0 Waterfox/G6.0",
+    "Mozilla/5.0 (Linux; Android 13; Pixel 7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Mobile Safari/537.36",
+    "Mozilla/5.0 (Linux; Android 13; SM-X700) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Linux; Android 12; wv) AppleWebKit/537.36 (KHTML, like Gecko) Version/4.0 Chrome/120.0.0.0 Mobile Safari/537.36",
+    "Mozilla/5.0 (Linux; Android 13; SM-A536B) AppleWebKit/537.36 (KHTML, like Gecko) SamsungBrowser/23.0 Chrome/115.0.0.0 Mobile Safari/537.36",
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Mobile/15E148 Safari/604.1 [FBAN/FBIOS]",
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) FxiOS/120.0 Mobile/15E148 Safari/605.1.15",
+    "Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:121.0) Gecko/20100101 Firefox/121.0",
+    "Mozilla/5.0 (X11; CrOS x86_64 14541.0.0) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html) Chrome/120.0.0.0",
+    "Mozilla/5.0 (Linux; Android 6.0.1; Nexus 5X Build/MMB29P) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Mobile Safari/537.36 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)",
+    "Mozilla/5.0 (compatible; MSIE 10.0; Windows NT 6.1; Trident/6.0)",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; Trident/7.0; rv:11.0) like Gecko",
+    "Mozilla/5.0 (compatible; SemrushBot/7~bl; +http://www.semrush.com/bot.html)",
+    "facebookexternalhit/1.1 (+http://www.facebook.com/externalhit_uatext.php)",
+    "python-requests/2.31.0",
+    "curl/8.4.0",
+    "-",
+    "",
+]
+
+
+# Günlüklerde görüldüğü gibi (IIS biçiminde) tarayıcı botları
+_IIS_BOTLARI = [
+    "Mozilla/5.0+(compatible;+Googlebot/2.1;++http://www.google.com/bot.html)",
+    "Mozilla/5.0+(compatible;+bingbot/2.0;++http://www.bing.com/bingbot.htm)",
+    "Mozilla/5.0+(compatible;+YandexBot/3.0;++http://yandex.com/bots)",
+    "Mozilla/5.0+(compatible;+AhrefsBot/7.0;++http://ahrefs.com/robot/)",
+    "Mozilla/5.0+(compatible;+DotBot/1.2;++https://opensiteexplorer.org/dotbot;+help@moz.com)",
+]
+
+
+def dogrulama_kumesi(tohum=42, ornek=300):
+    rng = random.Random(tohum)
+
+    def chrome():
+        return f"{rng.randint(1, 130)}.{rng.choice([0, 0, 1])}.{rng.randint(0, 7000)}.{rng.randint(0, 250)}"
+
+    def ios():
+        parts = [str(rng.randint(7, 18)), str(rng.randint(0, 6))]
+        if rng.random() < 0.4:
+            parts.append(str(rng.randint(0, 3)))
+        return "_".join(parts)
+
+    def android():
+        parts = [str(rng.randint(4, 15))]
+        if rng.random() < 0.5:
+            parts.append(str(rng.randint(0, 4)))
+            if rng.random() < 0.5:
+                parts.append(str(rng.randint(0, 2)))
+        return ".".join(parts)
+
+    nts = list(WINDOWS_SURUMLERI) + ["6.4", "5.0", "11.0"]
+    plats = ["; Win64; x64", "; WOW64", ""]
+    models = ["", "; K", "; SM-A536B", "; SM-G991B", "; SM-S918B", "; SM-A146P", "; SM-T870", "; SM-G960F"]
+    uas = []
+    for _ in range(ornek):
+        nt, plat, cv = rng.choice(nts), rng.choice(plats), chrome()
+        ek = rng.choice(["", f" Edg/{chrome()}", f" OPR/{chrome()}"])
+        mac = rng.choice(["10_15_7", "10_14_6", "11_0", "13_5_2", "10_9"])
+        fv = f"{rng.randint(3, 130)}.{rng.randint(0, 2)}"
+        sv = rng.choice(["17.0", "16.6", "15.4.1", "14.1.2", "13.0"])
+        uas += [
+            f"Mozilla/5.0 (Windows NT {nt}{plat}) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/{cv} Safari/537.36{ek}",
+            f"Mozilla/5.0 (Windows NT {nt}{plat}; rv:{fv}) Gecko/20100101 Firefox/{fv}",
+            f"Mozilla/5.0 (Macintosh; Intel Mac OS X {mac}) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/{cv} Safari/537.36{ek}",
+            f"Mozilla/5.0 (Macintosh; Intel Mac OS X {mac}) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/{sv} Safari/605.1.15",
+            f"Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/{cv} Safari/537.36",
+            f"Mozilla/5.0 (Linux; Android {android()}{rng.choice(models)}) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/{cv} Mobile Safari/537.36",
+            f"Mozilla/5.0 (iPhone; CPU iPhone OS {ios()} like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/{sv} Mobile/15E148 Safari/604.1",
+            f"Mozilla/5.0 (iPad; CPU OS {ios()} like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/{sv} Mobile/15E148 Safari/604.1",
+            f"Mozilla/5.0 (iPhone; CPU iPhone OS {ios()} like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) CriOS/{cv} Mobile/15E148 Safari/604.1",
+            f"Mozilla/5.0 (compatible; {rng.choice(['Googlebot', 'bingbot', 'YandexBot', 'AhrefsBot', 'DotBot'])}/"
+            f"{rng.randint(1, 9)}.{rng.randint(0, 9)}; +http://www.example.com/bot.html)",
+        ]
+    uas += _DUSMESI_GEREKENLER + _IIS_BOTLARI
+    # IIS günlüklerindeki biçim: boşluklar "+"
+    return list(dict.fromkeys(ua.replace(" ", "+") for ua in uas))
+
+
+def kalip_adi(ua):
+    # Hızlı yolda UA'yı sınıflandıran kalıp; hiçbiri tutmazsa None
+    ua_clean = ua.replace("+", " ")
+    return next((name for name, kalip in KALIPLAR.items() if kalip.fullmatch(ua_clean)), None)
+
+
+def dogrula(uas):
+    # Hızlı yolun her sonucu user_agents ile karşılaştırılır. Uyum tek başına
+    # yetmez: kümede hiçbir UA'yı sınıflandırmayan kalıp ölü koddur, hata sayılır.
+    from data_siralama import parse_user_agent
+
+    found, missing = toplu_siniflandir(uas)
+    hatalar = []
+    for ua, result in found.items():
+        expected = parse_user_agent(ua)
+        if result != expected:
+            hatalar.append((ua, result, expected))
+    kapsam = dict.fromkeys(KALIPLAR, 0)
+    for ua in found:
+        kapsam[kalip_adi(ua)] += 1
+    bos_kaliplar = [name for name, sayi in kapsam.items() if sayi == 0]
+
+    print(f"{len(uas)} UA: {len(found)} hızlı yoldan, {len(missing)} user_agents ile çözülür.")
+    for name, sayi in kapsam.items():
+        print(f"  {name:<20}{sayi}")
+    for ua, result, expected in hatalar[:20]:
+        print(f"UYUMSUZ: {ua}\n  hızlı:       {result}\n  user_agents: {expected}")
+    if bos_kaliplar:
+        print(f"Hiçbir UA'yı sınıflandırmayan kalıplar: {', '.join(bos_kaliplar)}")
+    ok = not hatalar and not bos_kaliplar
+    if ok:
+        print("Doğrulama başarılı.")
+    elif hatalar:
+        print(f"{len(hatalar)} uyumsuz sonuç!")
+    return ok
+
+
+def hiz_olc(uas, tekrar=20):
+    from data_siralama import parse_user_agent
+
+    clean = [ua.replace("+", " ") for ua in uas if siniflandir(ua.replace("+", " ")) is not None]
+    start = time.perf_counter()
+    for _ in range(tekrar):
+        for ua in clean:
+            siniflandir(ua)
+    fast = len(clean) * tekrar / (time.perf_counter() - start)
+
+    sample = uas[:500]
+    start = time.perf_counter()
+    for ua in sample:
+        parse_user_agent(ua)
+    slow = len(sample) / (time.perf_counter() - start)
+    print(f"Hızlı yol: {fast:,.0f} UA/sn, user_agents: {slow:,.0f} UA/sn (x{fast / slow:.0f})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hızlı UA sınıflandırıcıyı user_agents ile karşılaştırır.")
+    parser.add_argument("--dogrula", action="store_true", help="Doğrulama kümesinde sonuçları karşılaştır")
+    parser.add_argument("--db", default=None, help="Ayrıca bu veritabanının logs tablosundaki UA'ları kullan")
+    parser.add_argument("--tohum", type=int, default=42)
+    parser.add_argument("--hiz", action="store_true", help="Saniyedeki UA sayısını ölç")
+    args = parser.parse_args()
+
+    uas = dogrulama_kumesi(args.tohum)
+    if args.db:
+        import sqlite3
+        with sqlite3.connect(args.db) as conn:
+            uas += [row[0] for row in conn.execute('SELECT DISTINCT "cs(User-Agent)" FROM logs') if row[0]]
+
+    ok = True
+    if args.dogrula or not args.hiz:
+        ok = dogrula(uas)
+    if args.hiz:
+        hiz_olc(uas)
+    sys.exit(0 if ok else 1)
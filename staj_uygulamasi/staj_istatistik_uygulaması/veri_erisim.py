@@ -0,0 +1,362 @@
+import os
+import numpy as np
+import pandas as pd
+import psutil
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import create_engine, event, inspect, MetaData, Table, select, func, literal_column, column
+from sqlalchemy import table as table_clause
+from boyut_tablolari import (
+    KODLU_TABLO, GORUNUM, BOYUT_KOLONLARI, kaynak_kolon, kategorik_coz, dosya_kimligi, boyut_onbellegini_temizle,
+)
+import ozet_tablolar
+from veri_kapsami import kapsam
+
+# === Ortak veri erişim katmanı ===
+# Grafikler veritabanına bu modül üzerinden erişir. Motor (engine) ilk
+# kullanımda oluşturulur ve veritabanı dosyası değişmedikçe yol başına bir kez
+# tutulur; bütün şema yerine sadece kullanılan tablo yansıtılır ve önbellekte kalır.
+# Veritabanı yolu fonksiyonlara verilen `yol` ile, verilmezse DUZENLI_DB
+# ortam değişkeniyle değiştirilebilir. Okuma ayarları da burada yapılır.
+VARSAYILAN_DB = "duzenli_data.db"
+ORTAM_DEGISKENI = "DUZENLI_DB"
+OKUMA_CHUNK = 50_000
+
+# ButceliOkuyucu için varsayılan bellek bütçesi; VERI_BELLEK_MB ile değiştirilebilir
+BELLEK_BUTCESI_MB = 256
+BUTCE_ORTAM_DEGISKENI = "VERI_BELLEK_MB"
+ILK_PARTI = 10_000
+
+# Grafikler sadece okur: geniş sayfa önbelleği ve bellek eşlemeli okuma
+OKUMA_PRAGMALARI = {
+    "cache_size": -65536,  # 64 MB
+    "mmap_size": 268_435_456,  # 256 MB
+    "temp_store": "MEMORY",
+}
+
+# Filtreler parquet_oku ile aynı biçimde verilir: [("is_bot", "==", 0), ...]
+OPERATORLER = {
+    "==": lambda kolon, deger: kolon == deger,
+    "!=": lambda kolon, deger: kolon != deger,
+    ">": lambda kolon, deger: kolon > deger,
+    ">=": lambda kolon, deger: kolon >= deger,
+    "<": lambda kolon, deger: kolon < deger,
+    "<=": lambda kolon, deger: kolon <= deger,
+    "in": lambda kolon, deger: kolon.in_(list(deger)),
+    "not in": lambda kolon, deger: kolon.not_in(list(deger)),
+}
+
+_motorlar = {}
+_tablolar = {}
+
+
+def db_yolu(yol=None):
+    return os.path.abspath(yol or os.environ.get(ORTAM_DEGISKENI) or VARSAYILAN_DB)
+
+
+def _okuma_ayarlari(dbapi_conn, _):
+    cursor = dbapi_conn.cursor()
+    for pragma, deger in OKUMA_PRAGMALARI.items():
+        cursor.execute(f"PRAGMA {pragma}={deger}")
+    cursor.close()
+
+
+def motor(yol=None):
+    # Motor, dosyanın kimliğiyle (inode, mtime) birlikte tutulur. Veritabanı
+    # yeniden oluşturulup os.replace ile yerine konduysa eski motorun havuzdaki
+    # bağlantıları silinen dosyayı okumaya devam eder; kimlik değişince motor
+    # kapatılır, o dosyanın yansıtılmış tabloları ve boyut önbelleği atılır.
+    path = db_yolu(yol)
+    kimlik = dosya_kimligi(path)
+    kayit = _motorlar.get(path)
+    if kayit is not None and kayit[1] != kimlik:
+        sifirla(path)
+        kayit = None
+    if kayit is None:
+        engine = create_engine(f"sqlite:///{path}")
+        event.listen(engine, "connect", _okuma_ayarlari)
+        kayit = _motorlar[path] = (engine, kimlik)
+    return kayit[0]
+
+
+def sifirla(yol=None):
+    # Motorları kapatır, yansıtılmış tabloları ve boyut önbelleğini atar.
+    # yol verilmezse tüm veritabanları için.
+    path = db_yolu(yol) if yol else None
+    for p in [p for p in _motorlar if path is None or p == path]:
+        kayit = _motorlar.pop(p, None)  # Dash iş parçacıkları aynı anda sıfırlayabilir
+        if kayit is not None:
+            kayit[0].dispose()
+    for key in [k for k in _tablolar if path is None or k[0] == path]:
+        _tablolar.pop(key, None)
+    boyut_onbellegini_temizle(path)
+
+
+def _fork_sonrasi():
+    # ProcessPoolExecutor işçileri ebeveynin açık SQLite bağlantılarını
+    # kullanmamalı; havuz kapatılmadan boşaltılır, işçi kendi bağlantısını açar
+    for engine, _ in _motorlar.values():
+        engine.dispose(close=False)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_fork_sonrasi)
+
+
+def tablo(kodlu=False, yol=None):
+    # kodlu=True ise (varsa) logs_kodlu döner: boyut kolonları anahtar olarak
+    # okunur ve kategorik_coz ile Categorical'a çevrilir. Aksi halde logs görünümü.
+    engine = motor(yol)
+    key = (db_yolu(yol), kodlu)
+    if key not in _tablolar:
+        name = KODLU_TABLO if kodlu and inspect(engine).has_table(KODLU_TABLO) else GORUNUM
+        _tablolar[key] = Table(name, MetaData(), autoload_with=engine)
+    return _tablolar[key]
+
+
+def _filtre_kolonu(table, kolon, aralik):
+    # rowid aralığı okunurken kolonun önüne tekli + konur: SQLite bu kolon için
+    # indeks seçemez, plan hep birincil anahtar (rowid) aralığı üzerinden kalır
+    if aralik is None:
+        return table.c[kolon]
+    return literal_column(f'+"{kolon}"', type_=table.c[kolon].type)
+
+
+def kosullar(table, filtreler=None, tarih_baslangic=None, tarih_bitis=None, aralik=None):
+    # Filtreler ve tarih aralığı WHERE koşuluna çevrilir; date indeksli olduğu
+    # için tarih aralığı dışındaki satırlar hiç okunmaz. analiz.py kapsamı
+    # (veri_kapsami) her sorguya ayrıca eklenir.
+    k = kapsam()
+    filtreler = list(filtreler or []) + k.get("filtreler", [])
+    for baslangic in (tarih_baslangic, k.get("baslangic")):
+        if baslangic:
+            filtreler.append(("date", ">=", str(baslangic)))
+    for bitis in (tarih_bitis, k.get("bitis")):
+        if bitis:
+            filtreler.append(("date", "<=", str(bitis)))
+
+    sonuc = []
+    if aralik is not None:
+        sonuc.append(literal_column("rowid").between(*aralik))
+    for kolon, op, deger in filtreler:
+        if kolon in table.c:
+            sonuc.append(OPERATORLER[op](_filtre_kolonu(table, kolon, aralik), deger))
+            continue
+        # logs_kodlu'da boyut kolonu: uyan anahtarlar boyut tablosundan seçilir
+        boyut_adi, key = BOYUT_KOLONLARI[kolon]
+        boyut = table_clause(boyut_adi, column("id"), column("deger"))
+        eslesen = select(boyut.c.id).where(OPERATORLER[op](boyut.c.deger, deger))
+        sonuc.append(_filtre_kolonu(table, key, aralik).in_(eslesen))
+    return sonuc
+
+
+def rowid_siniri(yol=None):
+    # Fiziksel tablonun en küçük ve en büyük rowid'i; tablo boşsa (None, None).
+    # Kapsam varsa sınırlar ona göre daraltılır: satırlar tarih sırasıyla yazıldığı
+    # için bir haftalık kapsam, tarih indeksinden bulunan bir haftalık rowid aralığıdır.
+    table = tablo(kodlu=True, yol=yol)
+    rowid = literal_column("rowid")
+    stmt = select(func.min(rowid), func.max(rowid)).select_from(table).where(*kosullar(table))
+    with motor(yol).connect() as conn:
+        return tuple(conn.execute(stmt).one())
+
+
+def rowid_araliklari(chunksize=OKUMA_CHUNK, parca=None, yol=None):
+    # Fiziksel tablonun rowid'lerini chunksize genişliğinde ayrık [a, b]
+    # aralıklarına böler. LIMIT/OFFSET atlanan satırları her seferinde yeniden
+    # taradığı için toplam iş karesel büyür; rowid aralığı ise doğrudan aranır.
+    # Paralel işçilere verilen aralıklar çakışmaz. parca verilirse tablo o
+    # kadar eşit aralığa bölünür.
+    lo, hi = rowid_siniri(yol)
+    if lo is None:
+        return []
+    if parca:
+        chunksize = -(-(hi - lo + 1) // parca)
+    return [(a, min(a + chunksize - 1, hi)) for a in range(lo, hi + 1, chunksize)]
+
+
+def sorgu(kolonlar, filtreler=None, tarih_baslangic=None, tarih_bitis=None, sirala=None, kodlu=False,
+          aralik=None, yol=None):
+    # aralik=(a, b) verilirse sadece o rowid aralığı okunur. Görünümün rowid'i
+    # olmadığı için fiziksel tablo kullanılır; boyut kolonları Categorical döner.
+    if aralik is not None:
+        kodlu = True
+    table = tablo(kodlu, yol)
+    stmt = select(*[kaynak_kolon(table, kolon) for kolon in kolonlar])
+    stmt = stmt.where(*kosullar(table, filtreler, tarih_baslangic, tarih_bitis, aralik))
+    if sirala:
+        stmt = stmt.order_by(*[table.c[kolon] for kolon in sirala])
+    return stmt
+
+
+def oku(kolonlar, filtreler=None, tarih_baslangic=None, tarih_bitis=None, sirala=None, kodlu=False,
+        aralik=None, yol=None):
+    # Sadece istenen kolonları tek DataFrame olarak okur
+    stmt = sorgu(kolonlar, filtreler, tarih_baslangic, tarih_bitis, sirala, kodlu, aralik, yol)
+    with motor(yol).connect() as conn:
+        return kategorik_coz(pd.read_sql(stmt, con=conn), conn)
+
+
+def akis(kolonlar, filtreler=None, tarih_baslangic=None, tarih_bitis=None, sirala=None, kodlu=False,
+         chunksize=OKUMA_CHUNK, yol=None):
+    # oku() ile aynı, ama sonuç chunk chunk üretilir; bellekte tek chunk tutulur
+    stmt = sorgu(kolonlar, filtreler, tarih_baslangic, tarih_bitis, sirala, kodlu, yol=yol)
+    with motor(yol).connect() as conn:
+        for chunk in pd.read_sql(stmt, con=conn, chunksize=chunksize):
+            yield kategorik_coz(chunk, conn)
+
+
+def bot_ua_maskesi(ua):
+    # User-Agent'ında "bot" geçen satırlar. kodlu=True ile okunan UA kolonu
+    # Categorical olduğundan arama her farklı UA için bir kez yapılır ve
+    # anahtarlar üzerinden satırlara yayılır; boş UA bot sayılmaz.
+    if isinstance(ua.dtype, pd.CategoricalDtype):
+        bot = np.asarray(ua.cat.categories.str.contains("bot", case=False), dtype=bool)
+        bot = np.append(bot, False)  # kod -1 (NULL) son elemana düşer
+        return pd.Series(bot[ua.cat.codes.to_numpy()], index=ua.index)
+    return ua.str.contains("bot", case=False, na=False)
+
+
+# === Bellek bütçeli okuma ===
+# Boş RAM'e göre hesaplanan chunksize büyük makinelerde "hepsini tek seferde
+# oku" demektir. ButceliOkuyucu açık bir bütçeyle çalışır: ilk parti küçük
+# okunur, DataFrame'in gerçek bellek kullanımı ölçülür ve sonraki partilerin
+# rowid genişliği bütçeye sığacak şekilde ayarlanır. Ölçümlerin en büyüğü
+# kullanıldığı için filtrenin seyrek geçtiği bölgeler tahmini şişirmez.
+class ButceliOkuyucu:
+    def __init__(self, kolonlar, filtreler=None, tarih_baslangic=None, tarih_bitis=None, butce_mb=None, yol=None):
+        self.kolonlar = kolonlar
+        self.filtreler = filtreler
+        self.tarih_baslangic = tarih_baslangic
+        self.tarih_bitis = tarih_bitis
+        self.yol = yol
+        if butce_mb is None:
+            butce_mb = float(os.environ.get(BUTCE_ORTAM_DEGISKENI) or BELLEK_BUTCESI_MB)
+        self.butce = int(butce_mb * 1024 * 1024)
+        self.rowid_basi_bayt = 0.0
+        self.parti_sayisi = 0
+        self.satir_sayisi = 0
+        self.tepe_parti = 0
+        self.tepe_rss = 0
+
+    def _oku(self, aralik):
+        chunk = oku(self.kolonlar, self.filtreler, self.tarih_baslangic, self.tarih_bitis, aralik=aralik, yol=self.yol)
+        size = int(chunk.memory_usage(deep=True).sum())
+        self.rowid_basi_bayt = max(self.rowid_basi_bayt, size / (aralik[1] - aralik[0] + 1))
+        self.parti_sayisi += 1
+        self.satir_sayisi += len(chunk)
+        self.tepe_parti = max(self.tepe_parti, size)
+        self.tepe_rss = max(self.tepe_rss, psutil.Process().memory_info().rss)
+        return chunk
+
+    def _genislik(self, onceki, butce):
+        if self.rowid_basi_bayt <= 0:
+            return onceki * 4
+        # Tek adımda en fazla 4 kat büyür; ilk ölçüm ne kadar iyimser olursa olsun aşım sınırlı kalır
+        return max(1, min(int(butce / self.rowid_basi_bayt), onceki * 4))
+
+    def __iter__(self):
+        lo, hi = rowid_siniri(self.yol)
+        if lo is None:
+            return
+        start, span = lo, ILK_PARTI
+        while start <= hi:
+            end = min(start + span - 1, hi)
+            yield self._oku((start, end))
+            start = end + 1
+            span = self._genislik(span, self.butce)
+
+    def araliklar(self, isci=1):
+        # Paralel işçiler için: ilk parti okunup ölçülür, aynı anda okunan
+        # isci parti birlikte bütçeye sığacak genişlikte ayrık aralıklar döner
+        lo, hi = rowid_siniri(self.yol)
+        if lo is None:
+            return []
+        self._oku((lo, min(lo + ILK_PARTI - 1, hi)))
+        if self.rowid_basi_bayt > 0:
+            span = max(1, int(self.butce / max(1, isci) / self.rowid_basi_bayt))
+        else:
+            span = ILK_PARTI * 4
+        return [(a, min(a + span - 1, hi)) for a in range(lo, hi + 1, span)]
+
+    def rapor(self):
+        mb = 1024 * 1024
+        return (
+            f"{self.satir_sayisi:,} satır {self.parti_sayisi} partide okundu; "
+            f"en büyük parti {self.tepe_parti / mb:.1f} MB (bütçe {self.butce / mb:.0f} MB), "
+            f"tepe RSS {self.tepe_rss / mb:.1f} MB"
+        )
+
+
+def satir_sayisi(filtreler=None, tarih_baslangic=None, tarih_bitis=None, yol=None):
+    table = tablo(yol=yol)
+    stmt = select(func.count()).select_from(table).where(*kosullar(table, filtreler, tarih_baslangic, tarih_bitis))
+    with motor(yol).connect() as conn:
+        return conn.execute(stmt).scalar()
+
+
+def _grupla(kolonlar, filtreler, tarih_baslangic, tarih_bitis, aralik, yol):
+    table = tablo(kodlu=True, yol=yol)
+    secilen = [kaynak_kolon(table, kolon) for kolon in kolonlar]
+    stmt = (
+        select(*secilen, func.count().label("adet"))
+        .where(*kosullar(table, filtreler, tarih_baslangic, tarih_bitis, aralik))
+        .group_by(*secilen)
+    )
+    with motor(yol).connect() as conn:
+        df = kategorik_coz(pd.read_sql(stmt, con=conn), conn)
+    # Sonuç küçük; parçalar birleştirilirken Categorical yerine düz değerler kullanılır
+    for kolon in kolonlar:
+        if isinstance(df[kolon].dtype, pd.CategoricalDtype):
+            df[kolon] = df[kolon].astype(object)
+    return df
+
+
+def grupla(kolonlar, filtreler=None, tarih_baslangic=None, tarih_bitis=None, isci=1, yol=None):
+    # SELECT kolonlar, COUNT(*) ... GROUP BY kolonlar: sayım SQLite'ta yapılır,
+    # dışarıya sadece farklı değer kombinasyonları kadar satır ("adet" ile) çıkar.
+    # Boyut kolonları anahtar üzerinden gruplanır, metne sonra çevrilir.
+    # isci > 1 ise tablo ayrık rowid aralıklarına bölünüp iş parçacıklarında
+    # sayılır (sqlite3 sorgu sürerken GIL'i bırakır) ve sonuçlar toplanır.
+    if isci <= 1:
+        return _grupla(kolonlar, filtreler, tarih_baslangic, tarih_bitis, None, yol)
+    araliklar = rowid_araliklari(parca=isci, yol=yol)
+    with ThreadPoolExecutor(max_workers=isci) as executor:
+        parts = list(executor.map(
+            lambda aralik: _grupla(kolonlar, filtreler, tarih_baslangic, tarih_bitis, aralik, yol), araliklar
+        ))
+    if not parts:
+        return _grupla(kolonlar, filtreler, tarih_baslangic, tarih_bitis, None, yol)
+    df = pd.concat(parts, ignore_index=True)
+    return df.groupby(kolonlar, dropna=False, sort=False, as_index=False)["adet"].sum()
+
+
+# === Özet (rollup) tabloları ===
+def ozet_var(ad, yol=None):
+    return ozet_tablolar.ozet_var_mi(motor(yol), ad)
+
+
+def _ozet_filtrele(df, filtreler):
+    for kolon, op, deger in filtreler:
+        if op == "in":
+            df = df[df[kolon].isin(list(deger))]
+        elif op == "not in":
+            df = df[~df[kolon].isin(list(deger))]
+        else:
+            df = df[OPERATORLER[op](df[kolon], deger)]
+    return df
+
+
+def ozet(ad, is_bot=None, tarih_baslangic=None, tarih_bitis=None, yol=None):
+    # Özet tablosu yoksa None döner; çağıran ham satırlara geri düşer. Kapsamın
+    # filtrelediği bir kolon özet tablosunda yoksa (ör. ozet_tarayici'da
+    # sc-status) özet kullanılamaz, yine None döner.
+    if not ozet_var(ad, yol):
+        return None
+    k = kapsam()
+    kolonlar = ozet_tablolar.ANAHTAR_ON_KOLONLAR + ozet_tablolar.OZETLER[ad]
+    if any(kolon not in kolonlar for kolon, _, _ in k.get("filtreler", [])):
+        return None
+    tarih_baslangic = max(filter(None, [tarih_baslangic, k.get("baslangic")]), default=None)
+    tarih_bitis = min(filter(None, [tarih_bitis, k.get("bitis")]), default=None)
+    df = ozet_tablolar.ozet_oku(motor(yol), ad, is_bot, tarih_baslangic, tarih_bitis)
+    return _ozet_filtrele(df, k.get("filtreler", []))
@@ -0,0 +1,49 @@
+import os
+import json
+
+# === Veri kapsamı ===
+# analiz.py'nin tarih aralığı ve filtre seçenekleri (--baslangic, --bitis,
+# --botsuz, --durum) grafiklere buradan ulaşır; grafiklerin kodu değişmez.
+# veri_erisim kapsamı her sorgunun WHERE koşuluna, parquet_depo okuma
+# filtrelerine, sonuc_onbellek de önbellek anahtarına ekler. Kapsam DUZENLI_DB
+# gibi ortam değişkeninde (JSON) tutulur; böylece grafiklerin açtığı işçi
+# süreçleri ve toplu_rapor.py işçileri de aynı kapsamı görür.
+# Filtreler veri_erisim ile aynı biçimdedir: [("is_bot", "==", 0), ...]
+ORTAM_DEGISKENI = "VERI_KAPSAMI"
+
+
+def kapsam():
+    # {"baslangic": "2025-07-01", "bitis": "2025-07-07", "filtreler": [...]}; kapsam yoksa {}
+    deger = os.environ.get(ORTAM_DEGISKENI)
+    if not deger:
+        return {}
+    sonuc = json.loads(deger)
+    sonuc["filtreler"] = [tuple(f) for f in sonuc.get("filtreler", [])]
+    return sonuc
+
+
+def kapsam_ayarla(baslangic=None, bitis=None, filtreler=None):
+    sonuc = {}
+    if baslangic:
+        sonuc["baslangic"] = str(baslangic)
+    if bitis:
+        sonuc["bitis"] = str(bitis)
+    if filtreler:
+        sonuc["filtreler"] = [list(f) for f in filtreler]
+    if sonuc:
+        os.environ[ORTAM_DEGISKENI] = json.dumps(sonuc, ensure_ascii=False)
+    else:
+        os.environ.pop(ORTAM_DEGISKENI, None)
+    return kapsam()
+
+
+def kapsam_aciklamasi(k=None):
+    k = kapsam() if k is None else k
+    parcalar = []
+    if k.get("baslangic") or k.get("bitis"):
+        parcalar.append(f"{k.get('baslangic') or '...'} / {k.get('bitis') or '...'}")
+    for kolon, op, deger in k.get("filtreler", []):
+        if isinstance(deger, (list, tuple)):
+            deger = ", ".join(str(d) for d in deger)
+        parcalar.append(f"{kolon} {op} {deger}")
+    return "; ".join(parcalar) or "tüm veri"